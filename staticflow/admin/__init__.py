@@ -1,3 +1,4 @@
+import asyncio
 from pathlib import Path
 from aiohttp import web
 import aiohttp_jinja2
@@ -6,7 +7,8 @@ from ..core.config import Config
 from ..core.engine import Engine
 import json
 import re
-import shutil
+from .builds import BuildQueue
+from ..utils.files import get_link_mode, sync_tree
 from ..utils.logging import get_logger
 import uuid
 
@@ -20,6 +22,8 @@ class AdminPanel:
         self.config = config
         self.engine = engine
         self.output_dir = Path(self.config.get('output_dir'))
+        # Builds run one at a time off the event loop
+        self.builds = BuildQueue(self._build)
         self.app = web.Application()
         self.setup_routes()
         self.setup_templates()
@@ -83,6 +87,10 @@ class AdminPanel:
         self.app.router.add_post('/api/deploy/config', self.api_deploy_config_handler)
         self.app.router.add_post('/api/deploy/start', self.api_deploy_start_handler)
         self.app.router.add_post('/api/upload', self.api_upload_handler)
+        self.app.router.add_get('/api/builds', self.api_builds_handler)
+        self.app.router.add_get(
+            '/api/builds/{build_id}', self.api_build_handler
+        )
         
         # Статические файлы админки
         static_path = Path(__file__).parent / 'static'
@@ -155,10 +163,27 @@ class AdminPanel:
         site = engine.site
         base_url = self.config.get('base_url', '')
 
-        for file in content_path.rglob('*.*'):
-            if file.suffix in ['.md', '.html']:
+        index = engine.get_content_index()
+        if (index is not None and site.source_dir
+                and Path(site.source_dir).resolve() == content_path.resolve()):
+            # Список берется из индекса контента, перечитываются только
+            # измененные файлы
+            index.update(site)
+            for entry in index.all():
+                rel_path = entry['path'].replace('\\', '/')
+                files.append({
+                    'path': rel_path,
+                    'modified': entry['mtime_ns'] / 1e9,
+                    'size': entry['size'],
+                    'url': self._format_file_url(
+                        entry['url'], rel_path, base_url
+                    )
+                })
+        else:
+            for file in content_path.rglob('*.*'):
+                if file.suffix not in ['.md', '.html']:
+                    continue
                 rel_path = str(file.relative_to(content_path)).replace('\\', '/')
-                print(f"DEBUG: rel_path={rel_path!r} for file={file}")
                 if not rel_path:
                     continue
 
@@ -167,24 +192,16 @@ class AdminPanel:
                     page = engine.load_page_from_file(file)
                     if page:
                         content_type = site.determine_content_type(page)
-
                         file_url = site.router.get_url(content_type, page.metadata)
-
-                        if file_url and not file_url.startswith('http'):
-                            if not file_url.startswith('/'):
-                                file_url = '/' + file_url
-                            file_url = f"{base_url.rstrip('/')}{file_url}"
                 except Exception as e:
                     logger.error(f"Error generating URL for {rel_path}: {e}")
 
-                if not file_url:
-                    file_url = f"{base_url.rstrip('/')}/" + re.sub(r'\.md$', '.html', rel_path)
-
+                stat_result = file.stat()
                 files.append({
                     'path': rel_path,
-                    'modified': file.stat().st_mtime,
-                    'size': file.stat().st_size,
-                    'url': file_url
+                    'modified': stat_result.st_mtime,
+                    'size': stat_result.st_size,
+                    'url': self._format_file_url(file_url, rel_path, base_url)
                 })
 
         static_dir = self.config.get("static_dir", "static")
@@ -194,6 +211,17 @@ class AdminPanel:
             'static_dir': static_dir,
         }
 
+    def _format_file_url(self, file_url: str, rel_path: str,
+                         base_url: str) -> str:
+        """Get the public URL of a content file for the admin listing."""
+        if file_url and not file_url.startswith('http'):
+            if not file_url.startswith('/'):
+                file_url = '/' + file_url
+            file_url = f"{base_url.rstrip('/')}{file_url}"
+        if not file_url:
+            file_url = f"{base_url.rstrip('/')}/" + re.sub(r'\.md$', '.html', rel_path)
+        return file_url
+
     @aiohttp_jinja2.template('deploy.html')
     async def deploy_handler(self, request):
         """Handle deployment page."""
@@ -312,11 +340,12 @@ class AdminPanel:
             with open(content_path, 'w', encoding='utf-8') as f:
                 f.write(frontmatter + content)
 
-            self.rebuild_site()
+            build = self.builds.request([content_path])
 
             return web.json_response({
                 'success': True,
-                'path': path
+                'path': path,
+                'build_id': build.id
             })
 
         except json.JSONDecodeError as e:
@@ -428,7 +457,7 @@ class AdminPanel:
                 self._update_config_for_github_pages(repo_url)
 
                 logger.info("Rebuilding site before deployment")
-                rebuild_success = self.rebuild_site()
+                rebuild_success = await self.wait_for_build()
                 if not rebuild_success:
                     logger.error("Failed to build site")
                     return web.json_response({
@@ -456,7 +485,7 @@ class AdminPanel:
                 logger.info("Восстанавливаем оригинальные настройки конфигурации")
                 self.config.set("base_url", original_base_url)
                 self.config.set("static_dir", original_static_dir)
-                rebuild_success = self.rebuild_site()
+                rebuild_success = await self.wait_for_build()
                 if not rebuild_success:
                     logger.warning("Не удалось пересобрать сайт после восстановления настроек")
                 logger.info(f"Конфигурация восстановлена: base_url={original_base_url}, static_dir={original_static_dir}")
@@ -528,18 +557,60 @@ class AdminPanel:
 
         dest_static_path = self.output_dir / 'admin' / 'static'
 
-        dest_static_path.parent.mkdir(parents=True, exist_ok=True)
+        if dest_static_path.is_symlink() or dest_static_path.is_file():
+            dest_static_path.unlink()
+
+        # Копируются только измененные файлы, с учетом static_link_mode
+        updated, removed = sync_tree(
+            source_static_path,
+            dest_static_path,
+            get_link_mode(self.config.get('static_link_mode', 'copy'))
+        )
+        logger.debug(
+            "Статика админки: обновлено %d, удалено %d", updated, removed
+        )
 
-        if dest_static_path.exists():
-            shutil.rmtree(dest_static_path)
-        shutil.copytree(source_static_path, dest_static_path)
+    async def api_builds_handler(self, request):
+        """Handle build queue status API requests."""
+        return web.json_response({
+            'success': True,
+            **self.builds.status()
+        })
+
+    async def api_build_handler(self, request):
+        """Handle single build status API requests."""
+        try:
+            build_id = int(request.match_info['build_id'])
+        except ValueError:
+            build_id = None
+        build = self.builds.get(build_id) if build_id is not None else None
+        if build is None:
+            return web.json_response({
+                'success': False,
+                'error': f"Unknown build: {request.match_info['build_id']}"
+            }, status=404)
+        return web.json_response({
+            'success': True,
+            'build': build.to_dict()
+        })
+
+    async def wait_for_build(self):
+        """Queue a build and wait for it without blocking the event loop."""
+        build = self.builds.request()
+        await asyncio.wrap_future(build.future)
+        return build.status == "succeeded"
+
+    def _build(self, paths=None):
+        self.copy_static_to_output()
+        if paths is None:
+            self.engine.build()
+        else:
+            self.engine.rebuild_paths(paths)
 
     def rebuild_site(self):
         """Rebuild the site using the engine."""
         try:
-            self.copy_static_to_output()
-
-            self.engine.build()
+            self._build()
             return True
         except Exception as e:
             logger.error(f"Error rebuilding site: {e}")
@@ -0,0 +1,159 @@
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from ..utils.logging import get_logger
+
+logger = get_logger("admin.builds")
+
+# Finished builds whose status can still be looked up
+HISTORY_SIZE = 50
+
+
+@dataclass
+class Build:
+    """A requested site build and its progress.
+
+    ``paths`` lists the changed files to rebuild, None means the whole
+    site.
+    """
+    id: int
+    paths: Optional[List[Path]] = None
+    status: str = "queued"
+    requests: int = 1
+    requested_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
+    future: Future = field(default_factory=Future, repr=False)
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("succeeded", "failed")
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Describe the build for the status API."""
+        duration = None
+        if self.started_at is not None and self.finished_at is not None:
+            duration = self.finished_at - self.started_at
+        return {
+            "id": self.id,
+            "status": self.status,
+            "paths": (None if self.paths is None
+                      else [str(path) for path in self.paths]),
+            "requests": self.requests,
+            "requested_at": self.requested_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "duration": duration,
+            "error": self.error,
+        }
+
+
+class BuildQueue:
+    """Runs site builds one at a time on a background thread.
+
+    At most one build runs and one waits. Requests made while a build
+    is running are merged into the waiting one, so any number of saves
+    during a build lead to exactly one follow-up build, which sees all
+    of them. Callers get the ``Build`` that will include their change
+    and can poll it by id or wait on ``Build.future``.
+
+    ``build`` is called with the changed paths of all merged requests,
+    or with None when any of them asked for a full build.
+    """
+
+    def __init__(self, build: Callable[[Optional[List[Path]]], Any]):
+        self.build = build
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._next_id = 1
+        self._running: Optional[Build] = None
+        self._pending: Optional[Build] = None
+        self._history: "OrderedDict[int, Build]" = OrderedDict()
+
+    def request(self, paths: Optional[Iterable[Path]] = None) -> Build:
+        """Ask for a build of the given changed files, or of the site.
+
+        Returns the build that will include the change.
+        """
+        paths = None if paths is None else [Path(path) for path in paths]
+        with self._lock:
+            pending = self._pending
+            if pending is not None:
+                pending.requests += 1
+                if paths is None:
+                    pending.paths = None
+                elif pending.paths is not None:
+                    pending.paths.extend(
+                        path for path in paths if path not in pending.paths
+                    )
+                return pending
+            build = Build(self._next_id, paths)
+            self._next_id += 1
+            self._remember(build)
+            if self._running is None:
+                self._start(build)
+            else:
+                self._pending = build
+            return build
+
+    def get(self, build_id: int) -> Optional[Build]:
+        """Get a recent build by id."""
+        with self._lock:
+            return self._history.get(build_id)
+
+    def status(self) -> Dict[str, Any]:
+        """Describe the running, waiting and last finished builds."""
+        with self._lock:
+            finished = [build for build in self._history.values()
+                        if build.done]
+            return {
+                "running": self._running and self._running.to_dict(),
+                "pending": self._pending and self._pending.to_dict(),
+                "last": finished[-1].to_dict() if finished else None,
+            }
+
+    def shutdown(self) -> None:
+        """Wait for the running and waiting builds and stop the thread."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def _remember(self, build: Build) -> None:
+        self._history[build.id] = build
+        while len(self._history) > HISTORY_SIZE:
+            self._history.popitem(last=False)
+
+    def _start(self, build: Build) -> None:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="staticflow-admin-build"
+            )
+        self._running = build
+        self._executor.submit(self._run, build)
+
+    def _run(self, build: Build) -> None:
+        build.status = "running"
+        build.started_at = time.time()
+        logger.info("Build %d started", build.id)
+        try:
+            self.build(build.paths)
+            build.status = "succeeded"
+        except Exception as e:
+            logger.error("Build %d failed: %s", build.id, e, exc_info=True)
+            build.status = "failed"
+            build.error = str(e)
+        build.finished_at = time.time()
+        logger.info("Build %d %s in %.2fs", build.id, build.status,
+                    build.finished_at - build.started_at)
+
+        with self._lock:
+            self._running = None
+            if self._pending is not None:
+                self._start(self._pending)
+                self._pending = None
+        build.future.set_result(build)
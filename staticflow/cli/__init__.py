@@ -4,6 +4,8 @@ from .create import create
 from .serve import serve
 from .deploy import deploy
 from .build import build
+from .deps import deps
+from .benchmark import benchmark
 
 console = Console()
 
@@ -19,6 +21,8 @@ cli.add_command(create)
 cli.add_command(serve)
 cli.add_command(deploy)
 cli.add_command(build)
+cli.add_command(deps)
+cli.add_command(benchmark)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,109 @@
+import click
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from rich.console import Console
+from rich.table import Table
+from ..core.benchmark import (
+    SiteBenchmark,
+    SiteSpec,
+    compare_results,
+    load_results,
+    save_results,
+)
+
+console = Console()
+
+
+def print_results(results: Dict[str, Any],
+                  baseline: Optional[Dict[str, Any]] = None) -> None:
+    """Print benchmark metrics, next to the baseline if there is one."""
+    table = Table(title=f"Benchmark: {results['pages']} pages")
+    table.add_column("Metric", justify="left")
+    table.add_column("Value", justify="right")
+    if baseline:
+        table.add_column("Baseline", justify="right")
+    for metric, value in results["metrics"].items():
+        row = [metric, f"{value:.4f}"]
+        if baseline:
+            expected = baseline["metrics"].get(metric)
+            row.append("-" if expected is None else f"{expected:.4f}")
+        table.add_row(*row)
+    console.print(table)
+
+
+def print_regressions(regressions: List[Dict[str, Any]]) -> None:
+    """Print the metrics that got worse than the baseline."""
+    table = Table(title="Regressions")
+    for column in ("Metric", "Baseline", "Current", "Change"):
+        table.add_column(column, justify="left" if column == "Metric"
+                         else "right")
+    for regression in regressions:
+        table.add_row(
+            regression["metric"],
+            f"{regression['baseline']:.4f}",
+            f"{regression['current']:.4f}",
+            f"{regression['change']:+.0%}"
+        )
+    console.print(table)
+
+
+@click.command()
+@click.option('--pages', type=int, default=100,
+              help='Number of pages of the synthetic site')
+@click.option('--code-blocks', type=int, default=2,
+              help='Code blocks per page')
+@click.option('--images', type=int, default=1,
+              help='Number of images in the static directory')
+@click.option('--languages', type=int, default=1,
+              help='Number of languages pages are split across')
+@click.option('--category-depth', type=int, default=2,
+              help='Maximum depth of nested categories')
+@click.option('--repeat', type=int, default=3,
+              help='Runs of each benchmark, the fastest is kept')
+@click.option('--site-dir', default=None,
+              help='Where to generate the site (a temporary directory '
+                   'by default)')
+@click.option('--output', '-o', default='benchmark-results.json',
+              help='JSON file the results are written to')
+@click.option('--baseline', default=None,
+              help='Results file to compare against')
+@click.option('--tolerance', type=float, default=0.2,
+              help='Allowed slowdown against the baseline (0.2 = 20%)')
+def benchmark(pages: int, code_blocks: int, images: int, languages: int,
+              category_depth: int, repeat: int, site_dir: Optional[str],
+              output: str, baseline: Optional[str], tolerance: float):
+    """Measure build throughput on a synthetic site"""
+    spec = SiteSpec(
+        pages=pages,
+        code_blocks=code_blocks,
+        images=images,
+        languages=languages,
+        category_depth=category_depth
+    )
+    baseline_results = load_results(Path(baseline)) if baseline else None
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        root = Path(site_dir) if site_dir else Path(tmp_dir)
+        results = SiteBenchmark(root, spec, repeat=repeat).run()
+
+    save_results(results, Path(output))
+    print_results(results, baseline_results)
+    console.print(f"Results written to [bold]{output}[/bold]")
+
+    if baseline_results is None:
+        return
+    try:
+        regressions = compare_results(results, baseline_results, tolerance)
+    except ValueError as e:
+        console.print(f"[red]Error:[/red] {e}")
+        sys.exit(2)
+    if regressions:
+        print_regressions(regressions)
+        console.print(
+            f"[red]{len(regressions)} metric(s) regressed by more than "
+            f"{tolerance:.0%}[/red]"
+        )
+        sys.exit(1)
+    console.print("[green]No regressions against the baseline[/green]")
@@ -1,9 +1,12 @@
 import click
 import traceback
 from pathlib import Path
+from typing import Any, Dict, List, Optional
 from rich.console import Console
+from rich.table import Table
 from ..core.config import Config
 from ..core.builder import Builder
+from ..core.profiler import BuildProfiler
 from ..utils.logging import get_logger
 
 # Получаем логгер для этого модуля
@@ -12,10 +15,94 @@ logger = get_logger("cli.build")
 console = Console()
 
 
+def _format_kb(value: Optional[int]) -> str:
+    return "-" if value is None else f"{value / 1024:.1f} MB"
+
+
+def print_profile(summary: Dict[str, Any]) -> None:
+    """Print the phases and the slowest pages and plugins of a build."""
+    phases = Table(title="Build phases")
+    for column in ("Phase", "Wall ms", "CPU ms", "Peak RSS"):
+        phases.add_column(column, justify="left" if column == "Phase"
+                          else "right")
+    for phase in summary["phases"]:
+        phases.add_row(
+            phase["name"],
+            f"{phase['wall_ms']:.1f}",
+            f"{phase['cpu_ms']:.1f}",
+            _format_kb(phase["peak_rss_kb"])
+        )
+    console.print(phases)
+
+    for key, title in (("steps", "Page steps"),
+                       ("pages", "Slowest pages"),
+                       ("plugins", "Slowest plugin hooks")):
+        if not summary[key]:
+            continue
+        table = Table(title=title)
+        for column in ("Name", "Calls", "Wall ms", "CPU ms"):
+            table.add_column(column, justify="left" if column == "Name"
+                             else "right")
+        for total in summary[key]:
+            table.add_row(
+                total["name"],
+                str(total["calls"]),
+                f"{total['wall_ms']:.1f}",
+                f"{total['cpu_ms']:.1f}"
+            )
+        console.print(table)
+
+
+def _format_bytes(value: int) -> str:
+    if value < 1024:
+        return f"{value} B"
+    if value < 1024 * 1024:
+        return f"{value / 1024:.1f} KB"
+    return f"{value / 1024 / 1024:.1f} MB"
+
+
+def print_hook_stats(rows: List[Dict[str, Any]]) -> None:
+    """Print the cost of every plugin hook of a build."""
+    if not rows:
+        return
+    table = Table(title="Plugin hooks")
+    for column in ("Plugin", "Hook", "Calls", "Total ms", "Avg ms",
+                   "p95 ms", "In", "Out"):
+        table.add_column(column, justify="left"
+                         if column in ("Plugin", "Hook") else "right")
+    for row in rows:
+        table.add_row(
+            row["plugin"],
+            row["hook"],
+            str(row["calls"]) + (f" ({row['errors']} failed)"
+                                 if row["errors"] else ""),
+            f"{row['total_ms']:.1f}",
+            f"{row['avg_ms']:.2f}",
+            f"{row['p95_ms']:.2f}",
+            _format_bytes(row["bytes_in"]),
+            _format_bytes(row["bytes_out"])
+        )
+    console.print(table)
+
+
 @click.command()
 @click.option('--config', '-c', default='config.toml',
               help='Path to config file')
-def build(config: str):
+@click.option('--workers', '-j', type=int, default=None,
+              help='Number of parallel page render workers')
+@click.option('--streaming', is_flag=True, default=False,
+              help='Keep only page metadata in memory (for very large sites)')
+@click.option('--profile', is_flag=True, default=False,
+              help='Time every build phase, page and plugin')
+@click.option('--profile-output', default='build-profile.json',
+              help='Chrome trace file written with --profile')
+@click.option('--profile-top', type=int, default=10,
+              help='Number of slowest pages and plugins to show')
+@click.option('--plugin-stats', is_flag=True, default=False,
+              help='Show the time and data volume of every plugin hook')
+def build(config: str, workers: Optional[int], streaming: bool,
+          profile: bool, profile_output: str, profile_top: int,
+          plugin_stats: bool):
     """Build the static site"""
     try:
         config_path = Path(config)
@@ -27,9 +114,25 @@ def build(config: str):
             console.print(f"[red]Error:[/red] {error_message}")
             return
 
-        builder = Builder(config=Config(config_path))
+        site_config = Config(config_path)
+        if workers is not None:
+            site_config.set('workers', workers)
+        if streaming:
+            site_config.set('streaming', True)
+
+        builder = Builder(config=site_config)
+        if profile:
+            builder.engine.profiler = BuildProfiler()
         builder.build()
 
+        if profile:
+            profiler = builder.engine.profiler
+            print_profile(profiler.summary(profile_top))
+            profiler.write_trace(Path(profile_output), profile_top)
+            console.print(f"Profile written to [bold]{profile_output}[/bold]")
+        if plugin_stats or profile:
+            print_hook_stats(builder.engine.hook_stats.summary())
+
     except Exception as e:
         error_message = f"Error building site: {str(e)}"
         full_traceback = traceback.format_exc()
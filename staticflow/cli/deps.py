@@ -0,0 +1,60 @@
+import click
+from pathlib import Path
+from rich.console import Console
+from ..core.config import Config
+from ..core.engine import Engine
+from ..utils.logging import get_logger
+
+logger = get_logger("cli.deps")
+
+console = Console()
+
+
+@click.command()
+@click.argument('path')
+@click.option('--config', '-c', default='config.toml',
+              help='Path to config file')
+def deps(path: str, config: str):
+    """Show which pages depend on a template, content or config file"""
+    config_path = Path(config)
+    if not config_path.exists():
+        error_message = (
+            f"Config file not found: {config}. Check your directory."
+        )
+        logger.error(error_message)
+        console.print(f"[red]Error:[/red] {error_message}")
+        return
+
+    site_config = Config(config_path)
+    engine = Engine(site_config)
+    engine.initialize(
+        Path(site_config.get('source_dir', 'content')),
+        Path(site_config.get('output_dir', 'output')),
+        Path(site_config.get('template_dir', 'templates'))
+    )
+
+    graph = engine.get_dependency_graph()
+    if not graph.get_all_pages():
+        console.print(
+            "[yellow]No dependency data yet, run 'staticflow build' "
+            "first[/yellow]"
+        )
+        return
+
+    file_path = Path(path)
+    source_rel = engine._relative_to(file_path, engine.site.source_dir)
+    if source_rel is not None and str(source_rel) in graph.pages:
+        dependencies = graph.get_dependencies(str(source_rel))
+        console.print(f"[bold]{source_rel}[/bold] depends on:")
+        for template in dependencies["templates"]:
+            console.print(f"  template: {template}")
+        for data in dependencies["data"]:
+            console.print(f"  data: {data}")
+
+    dependents = engine.get_dependents(file_path)
+    console.print(
+        f"[bold]{len(dependents)}[/bold] page(s) re-render when "
+        f"[bold]{path}[/bold] changes:"
+    )
+    for source in dependents:
+        console.print(f"  {source}")
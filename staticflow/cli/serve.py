@@ -18,7 +18,12 @@ console = Console()
               help='Host to run server on')
 @click.option('--config', '-c', default='config.toml', 
               help='Path to config file')
-def serve(port: int, host: str, config: str):
+@click.option('--no-watch', is_flag=True,
+              help='Do not rebuild when files change')
+@click.option('--lazy', is_flag=True,
+              help='Render pages when first requested instead of '
+                   'serving a full build')
+def serve(port: int, host: str, config: str, no_watch: bool, lazy: bool):
     """Start development server with live preview"""
     try:
         config_path = Path(config)
@@ -32,7 +37,9 @@ def serve(port: int, host: str, config: str):
             config=Config(config_path),
             host=host,
             port=port,
-            dev_mode=True
+            dev_mode=True,
+            watch=not no_watch,
+            lazy=lazy
         )
  
         server.run()
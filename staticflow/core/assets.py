@@ -0,0 +1,278 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from .manifest import BuildManifest, hash_data
+from .output_digests import hash_file
+from .scanner import IGNORE_FILE, ContentFile, ContentScanner
+from ..plugins.core.dispatch import DispatchTable, HookHandler
+from ..utils.files import break_link, materialize
+from ..utils.logging import get_logger
+
+
+logger = get_logger("core.assets")
+
+
+def wants_asset(plugin, suffix: str) -> bool:
+    """Check whether a plugin handles assets with this extension.
+
+    Plugins list the extensions they handle in ``asset_extensions``;
+    a plugin that does not declare any is given every asset.
+    """
+    extensions = getattr(plugin, "asset_extensions", None)
+    if extensions is None:
+        return True
+    return suffix in extensions
+
+
+class AssetPipeline:
+    """Copies static files to the output directory through asset plugins.
+
+    Each file is fingerprinted by its size, mtime and content digest in
+    an asset manifest; files whose fingerprint and plugins did not change
+    since the last build are skipped without running any hook. The rest
+    are dispatched only to the plugins whose ``asset_extensions`` match,
+    in the order of the engine's dispatch table, and copied, minified or
+    transformed on a pool of threads. Files that no plugin rewrites are
+    placed according to ``link_mode``: copied, hard linked or reflinked.
+    """
+
+    def __init__(
+        self,
+        engine,
+        static_dir: Path,
+        output_dir: Path,
+        manifest: BuildManifest,
+        workers: int = 4,
+        link_mode: str = "copy",
+        dispatch: Optional[DispatchTable] = None
+    ):
+        self.engine = engine
+        self.static_dir = Path(static_dir)
+        self.output_dir = Path(output_dir)
+        self.manifest = manifest
+        self.workers = max(1, workers)
+        self.link_mode = link_mode
+        self.dispatch = dispatch or DispatchTable(engine.plugins)
+        self._plugins: Dict[
+            str, Tuple[List[HookHandler], List[HookHandler], str]
+        ] = {}
+
+    def get_plugins(
+        self, suffix: str
+    ) -> Tuple[List[HookHandler], List[HookHandler], str]:
+        """Get the pre and post asset hook handlers for an extension.
+
+        Also returns a hash of their plugins' configuration, so that
+        assets are processed again when one of their plugins changes.
+        """
+        suffix = suffix.lower()
+        if suffix not in self._plugins:
+            pre = [
+                handler for handler in self.dispatch.get("on_pre_asset")
+                if wants_asset(handler.plugin, suffix)
+            ]
+            post = [
+                handler for handler in self.dispatch.get("on_post_asset")
+                if wants_asset(handler.plugin, suffix)
+            ]
+            plugins = []
+            for handler in pre + post:
+                if handler.plugin not in plugins:
+                    plugins.append(handler.plugin)
+            self._plugins[suffix] = (
+                pre,
+                post,
+                hash_data([
+                    (plugin.__class__.__name__,
+                     getattr(plugin, "config", None))
+                    for plugin in plugins
+                ]),
+            )
+        return self._plugins[suffix]
+
+    def _get_scanner(self) -> ContentScanner:
+        return ContentScanner(
+            self.static_dir,
+            extensions=None,
+            exclude=[IGNORE_FILE],
+            project_root=self.static_dir
+        )
+
+    def scan(self) -> List[ContentFile]:
+        """Find every static file, honouring ``.staticflowignore``."""
+        return list(self._get_scanner().scan())
+
+    def get_output_path(self, asset: ContentFile) -> Path:
+        """Get the output path of a static file."""
+        return self.output_dir / "static" / asset.rel_path
+
+    def _make_entry(self, asset: ContentFile, digest: str) -> Dict[str, Any]:
+        return {
+            "mtime_ns": asset.mtime_ns,
+            "size": asset.size,
+            "digest": digest,
+            "plugins": self.get_plugins(asset.path.suffix)[2],
+            "output_path": str(self.get_output_path(asset)),
+        }
+
+    def is_fresh(self, asset: ContentFile) -> bool:
+        """Check whether an asset's output is up to date.
+
+        A file whose mtime changed but whose bytes did not is only
+        hashed, not processed again.
+        """
+        recorded = self.manifest.get(asset.rel_path)
+        if not recorded:
+            return False
+        output_path = self.get_output_path(asset)
+        if (recorded.get("output_path") != str(output_path)
+                or recorded.get("plugins")
+                != self.get_plugins(asset.path.suffix)[2]
+                or not output_path.exists()):
+            return False
+        if (recorded.get("mtime_ns") == asset.mtime_ns
+                and recorded.get("size") == asset.size):
+            return True
+        try:
+            digest = hash_file(asset.path)
+        except OSError:
+            return False
+        if digest != recorded.get("digest"):
+            return False
+        self.manifest.update(asset.rel_path, self._make_entry(asset, digest))
+        return True
+
+    def process(self, asset: ContentFile) -> Optional[Dict[str, Any]]:
+        """Run the asset hooks and write one static file.
+
+        Returns its manifest entry, or None if it could not be processed.
+        """
+        file_path = asset.path
+        output_path = self.get_output_path(asset)
+        pre_handlers, post_handlers, _ = self.get_plugins(file_path.suffix)
+        logger.debug("Processing static file: %s -> %s",
+                     file_path, output_path)
+        try:
+            digest = hash_file(file_path)
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            context = {
+                "file_path": str(file_path),
+                "output_path": str(output_path),
+                "relative_path": asset.rel_path
+            }
+
+            for handler in pre_handlers:
+                logger.debug("Running on_pre_asset hook for plugin %s "
+                             "on file %s", handler.name, file_path)
+                context = self.engine.call_hook(handler, context)
+
+            digests = self.engine.site.output_digests
+            if "content" in context:
+                if digests is not None:
+                    digests.write_text(output_path, context["content"])
+                else:
+                    break_link(output_path)
+                    with open(output_path, 'w', encoding='utf-8') as f:
+                        f.write(context["content"])
+            elif digests is not None:
+                digests.copy_file(file_path, output_path, self.link_mode)
+            else:
+                materialize(file_path, output_path, self.link_mode)
+
+            for handler in post_handlers:
+                logger.debug("Running on_post_asset hook for plugin %s "
+                             "on file %s", handler.name, file_path)
+                context = self.engine.call_hook(handler, context)
+        except Exception as e:
+            logger.error("Error processing static file %s: %s",
+                         file_path, e, exc_info=True)
+            return None
+        return self._make_entry(asset, digest)
+
+    def update(self, rel_paths: Iterable[str]) -> List[str]:
+        """Bring only the given static files up to date.
+
+        Used after a few files changed, without scanning the static
+        directory. Files that no longer exist have their output deleted.
+        Returns the paths whose output was written or removed.
+        """
+        scanner = self._get_scanner()
+        changed = []
+        for rel_path in rel_paths:
+            path = self.static_dir / rel_path
+            if path.is_file():
+                if not scanner.accepts(rel_path):
+                    continue
+                asset = ContentFile(path, rel_path, path.stat())
+                if self.is_fresh(asset):
+                    continue
+                entry = self.process(asset)
+                if entry is None:
+                    self.manifest.remove(rel_path)
+                else:
+                    self.manifest.update(rel_path, entry)
+                    changed.append(rel_path)
+                continue
+            # Deleted file or directory
+            for source in self.manifest.sources():
+                if source == rel_path or source.startswith(rel_path + "/"):
+                    entry = self.manifest.remove(source)
+                    self.engine._remove_output(entry.get("output_path"))
+                    changed.append(source)
+        self.manifest.save()
+        return changed
+
+    def run(self, incremental: bool = True) -> Dict[str, int]:
+        """Bring the static output in line with the static directory.
+
+        Returns the number of processed, unchanged, failed and removed
+        files.
+        """
+        if not incremental:
+            self.manifest.clear()
+        assets = self.scan()
+        stale = [asset for asset in assets if not self.is_fresh(asset)]
+
+        if self.workers > 1 and len(stale) > 1:
+            with ThreadPoolExecutor(
+                max_workers=self.workers,
+                thread_name_prefix="staticflow-assets"
+            ) as executor:
+                entries = list(executor.map(self.process, stale))
+        else:
+            entries = [self.process(asset) for asset in stale]
+
+        failed = 0
+        for asset, entry in zip(stale, entries):
+            if entry is None:
+                failed += 1
+                self.manifest.remove(asset.rel_path)
+            else:
+                self.manifest.update(asset.rel_path, entry)
+
+        seen = {asset.rel_path for asset in assets}
+        removed = 0
+        for rel_path in self.manifest.sources():
+            if rel_path not in seen:
+                entry = self.manifest.remove(rel_path)
+                logger.debug("Static file removed, deleting output: %s",
+                             rel_path)
+                self.engine._remove_output(entry.get("output_path"))
+                removed += 1
+        self.manifest.save()
+
+        stats = {
+            "processed": len(stale) - failed,
+            "unchanged": len(assets) - len(stale),
+            "failed": failed,
+            "removed": removed,
+        }
+        logger.info(
+            "Static files: %d processed, %d unchanged, %d failed, "
+            "%d removed",
+            stats["processed"],
+            stats["unchanged"],
+            stats["failed"],
+            stats["removed"]
+        )
+        return stats
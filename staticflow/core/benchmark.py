@@ -0,0 +1,555 @@
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+import json
+import os
+import platform
+import random
+import shutil
+import struct
+import time
+import zlib
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from .config import Config
+from .engine import Engine
+from .profiler import BuildProfiler, get_peak_rss
+from ..utils.logging import get_logger
+
+
+logger = get_logger("core.benchmark")
+
+RESULTS_VERSION = 1
+
+# Language codes used for synthetic translations, the first is the default
+LANGUAGES = ("en", "ru", "de", "fr", "es", "it", "ja", "zh")
+
+CODE_SAMPLES = {
+    "python": (
+        "def fibonacci(n: int) -> int:\n"
+        "    a, b = 0, 1\n"
+        "    for _ in range(n):\n"
+        "        a, b = b, a + b\n"
+        "    return a\n"
+    ),
+    "javascript": (
+        "export function debounce(fn, wait) {\n"
+        "  let timer = null;\n"
+        "  return (...args) => {\n"
+        "    clearTimeout(timer);\n"
+        "    timer = setTimeout(() => fn(...args), wait);\n"
+        "  };\n"
+        "}\n"
+    ),
+    "css": (
+        ".card {\n"
+        "  display: flex;\n"
+        "  padding: 1rem 2rem;\n"
+        "  border-radius: 4px;\n"
+        "}\n"
+    ),
+    "bash": (
+        "for file in content/*.md; do\n"
+        "  echo \"Building $file\"\n"
+        "done\n"
+    ),
+}
+
+WORDS = (
+    "static site generator build page template plugin content markdown "
+    "output cache render index category language asset deploy server "
+    "router sitemap feed theme layout section author release"
+).split()
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="{{ page.language }}">
+<head>
+    <meta charset="utf-8">
+    <title>{{ page.title }} | {{ site_name }}</title>
+    <meta name="description" content="{{ page.metadata.description }}">
+    <link rel="stylesheet" href="/static/css/style.css">
+    {{ page_head_content }}
+</head>
+<body>
+    <header><a href="/">{{ site_name }}</a></header>
+    <main>
+        <h1>{{ page.title }}</h1>
+        {{ page_content }}
+    </main>
+    <footer>
+        <!-- generated by the StaticFlow benchmark -->
+        <p>{{ site_name }}</p>
+    </footer>
+    <script src="/static/js/main.js"></script>
+</body>
+</html>
+"""
+
+STYLE_SHEET = """/* Synthetic benchmark styles */
+body {
+    margin: 0;
+    font-family: sans-serif;
+    line-height: 1.6;
+}
+
+main {
+    max-width: 960px;
+    margin: 0 auto;
+}
+"""
+
+SCRIPT = """// Synthetic benchmark script
+document.addEventListener("DOMContentLoaded", function () {
+    var links = document.querySelectorAll("a");
+    for (var i = 0; i < links.length; i++) {
+        links[i].setAttribute("rel", "noopener");
+    }
+});
+"""
+
+
+@dataclass
+class SiteSpec:
+    """Shape of a synthetic site."""
+
+    pages: int = 100
+    code_blocks: int = 2
+    images: int = 1
+    languages: int = 1
+    category_depth: int = 2
+    paragraphs: int = 5
+    seed: int = 42
+    plugins: List[str] = field(default_factory=lambda: [
+        "syntax_highlight", "minifier", "seo", "sitemap"
+    ])
+
+
+def make_png(width: int, height: int, color: tuple) -> bytes:
+    """Encode a solid colour RGB image as PNG."""
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        body = kind + data
+        return (struct.pack(">I", len(data)) + body
+                + struct.pack(">I", zlib.crc32(body) & 0xffffffff))
+
+    row = b"\x00" + bytes(color) * width
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+        + chunk(b"IDAT", zlib.compress(row * height))
+        + chunk(b"IEND", b"")
+    )
+
+
+def _sentence(rng: random.Random, words: int = 12) -> str:
+    text = " ".join(rng.choice(WORDS) for _ in range(words))
+    return text[0].upper() + text[1:] + "."
+
+
+def _page_markdown(rng: random.Random, spec: SiteSpec, index: int,
+                   language: str, category: str) -> str:
+    date = datetime(2024, 1, 1) + timedelta(days=index % 365)
+    tags = sorted(set(rng.sample(WORDS, 3)))
+    lines = [
+        "---",
+        f"title: Page {index} {rng.choice(WORDS)}",
+        f"date: {date:%Y-%m-%d}",
+        f"description: {_sentence(rng, 8)}",
+        f"language: {language}",
+        f"tags: [{', '.join(tags)}]",
+    ]
+    if category:
+        lines.append(f"category: {category}")
+    lines += ["---", "", f"# Page {index}", ""]
+
+    languages = list(CODE_SAMPLES)
+    for paragraph in range(spec.paragraphs):
+        lines += [
+            " ".join(_sentence(rng) for _ in range(4)),
+            "",
+        ]
+        if paragraph == 0:
+            lines += [
+                "| Name | Value |",
+                "| --- | --- |",
+                *(f"| {rng.choice(WORDS)} | {rng.randint(1, 999)} |"
+                  for _ in range(3)),
+                "",
+                *(f"- {_sentence(rng, 5)}" for _ in range(3)),
+                "",
+            ]
+        if paragraph == 1:
+            lines += [f"## Section {index}.{paragraph}", ""]
+
+    for block in range(spec.code_blocks):
+        language_name = languages[(index + block) % len(languages)]
+        lines += [
+            f"```{language_name}",
+            CODE_SAMPLES[language_name].rstrip("\n"),
+            "```",
+            "",
+        ]
+
+    for image in range(min(spec.images, 3)):
+        number = (index + image) % max(spec.images, 1)
+        lines += [
+            f"![Image {number}](/static/images/image-{number}.png)",
+            "",
+        ]
+    return "\n".join(lines)
+
+
+def _category(rng: random.Random, depth: int) -> List[str]:
+    return [f"{rng.choice(WORDS)}-{level}" for level in range(depth)]
+
+
+def generate_site(root: Path, spec: SiteSpec) -> Path:
+    """Write a synthetic StaticFlow project and return its config path.
+
+    Pages are spread over ``spec.languages`` translations and nested in
+    categories up to ``spec.category_depth`` levels deep, each with the
+    requested number of code blocks and image references. The same
+    spec and seed always produce the same files.
+    """
+    root = Path(root)
+    rng = random.Random(spec.seed)
+    languages = list(LANGUAGES[:max(1, min(spec.languages,
+                                              len(LANGUAGES)))])
+    for name in ("content", "templates", "static"):
+        path = root / name
+        if path.exists():
+            shutil.rmtree(path)
+        path.mkdir(parents=True)
+
+    (root / "templates" / "page.html").write_text(
+        PAGE_TEMPLATE, encoding="utf-8"
+    )
+    (root / "static" / "css").mkdir()
+    (root / "static" / "css" / "style.css").write_text(
+        STYLE_SHEET, encoding="utf-8"
+    )
+    (root / "static" / "js").mkdir()
+    (root / "static" / "js" / "main.js").write_text(
+        SCRIPT, encoding="utf-8"
+    )
+    (root / "static" / "images").mkdir()
+    for number in range(spec.images):
+        color = (rng.randrange(256), rng.randrange(256), rng.randrange(256))
+        (root / "static" / "images" / f"image-{number}.png").write_bytes(
+            make_png(64, 48, color)
+        )
+
+    for index in range(spec.pages):
+        language = languages[index % len(languages)]
+        category = _category(rng, rng.randint(0, spec.category_depth))
+        directory = root / "content"
+        if language != languages[0]:
+            directory /= language
+        directory = directory.joinpath(*category)
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / f"page-{index}.md").write_text(
+            _page_markdown(rng, spec, index, language, "/".join(category)),
+            encoding="utf-8"
+        )
+
+    config_path = root / "config.toml"
+    plugins = ", ".join(f'"{name}"' for name in spec.plugins)
+    codes = ", ".join(f'"{code}"' for code in languages)
+    config_path.write_text(
+        'site_name = "Benchmark"\n'
+        'base_url = "http://localhost:8000"\n'
+        'description = "Synthetic StaticFlow benchmark site"\n'
+        f'default_language = "{languages[0]}"\n'
+        f'languages = [{codes}]\n'
+        'source_dir = "content"\n'
+        'output_dir = "output"\n'
+        'static_dir = "static"\n'
+        'template_dir = "templates"\n'
+        'cache_dir = ".cache"\n'
+        'workers = 1\n'
+        '\n'
+        '[PLUGINS]\n'
+        f'enabled = [{plugins}]\n',
+        encoding="utf-8"
+    )
+    return config_path
+
+
+@contextmanager
+def _working_directory(path: Path) -> Iterator[None]:
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def _best_of(repeat: int, func: Callable[[], Any]) -> float:
+    """Run ``func`` ``repeat`` times and return the fastest run."""
+    best = float("inf")
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+class SiteBenchmark:
+    """Measures the build throughput of a synthetic site.
+
+    ``run_build`` times a cold build, with empty caches and output,
+    followed by a warm incremental build with nothing changed.
+    ``run_stages`` times the markdown parser, syntax highlighting,
+    minification, SEO, sitemap and router on the generated pages in
+    isolation, so that a slowdown can be pinned to one stage. Timings
+    are the fastest of ``repeat`` runs.
+    """
+
+    def __init__(self, root: Path, spec: Optional[SiteSpec] = None,
+                 repeat: int = 3):
+        self.root = Path(root)
+        self.spec = spec or SiteSpec()
+        self.repeat = max(1, repeat)
+        self.config_path: Optional[Path] = None
+
+    def generate(self) -> Path:
+        """Write the synthetic site."""
+        self.config_path = generate_site(self.root, self.spec)
+        return self.config_path
+
+    def create_engine(self) -> Engine:
+        """Create an engine with the plugins enabled in the spec."""
+        from ..plugins import initialize_plugins
+
+        if self.config_path is None:
+            self.generate()
+        engine = Engine(Config(self.config_path))
+        engine.initialize(
+            self.root / "content",
+            self.root / "output",
+            self.root / "templates"
+        )
+        initialize_plugins(engine)
+        return engine
+
+    def _reset_output(self) -> None:
+        for name in ("output", ".cache"):
+            shutil.rmtree(self.root / name, ignore_errors=True)
+
+    def run_build(self) -> Dict[str, Any]:
+        """Time full builds of the site."""
+        with _working_directory(self.root):
+            cold = float("inf")
+            phases: Dict[str, float] = {}
+            for _ in range(self.repeat):
+                self._reset_output()
+                engine = self.create_engine()
+                profiler = BuildProfiler()
+                engine.profiler = profiler
+                start = time.perf_counter()
+                engine.build()
+                elapsed = time.perf_counter() - start
+                if elapsed < cold:
+                    cold = elapsed
+                    phases = {
+                        phase["name"]: phase["wall_ms"] / 1e3
+                        for phase in profiler.summary()["phases"]
+                    }
+            engine.profiler = None
+            warm = _best_of(self.repeat, engine.build)
+            pages = len(engine.site.get_all_pages())
+        return {
+            "pages": pages,
+            "cold_seconds": cold,
+            "warm_seconds": warm,
+            "pages_per_sec": pages / cold if cold else 0.0,
+            "phases": phases,
+        }
+
+    def run_stages(self) -> Dict[str, float]:
+        """Time the individual build stages on the generated pages."""
+        from ..plugins.builtin.minifier import MinifierPlugin
+        from ..plugins.builtin.seo import SEOPlugin
+        from ..plugins.builtin.sitemap import SitemapPlugin
+        from ..plugins.syntax_highlight import SyntaxHighlightPlugin
+
+        with _working_directory(self.root):
+            engine = self.create_engine()
+            engine.site.load_pages()
+            pages = engine.site.get_all_pages()
+            sources = [page.content for page in pages]
+            html: List[str] = []
+
+            def markdown() -> None:
+                html[:] = [engine.markdown.convert(source)
+                           for source in sources]
+
+            stages = {"markdown": _best_of(self.repeat, markdown)}
+
+            highlighter = SyntaxHighlightPlugin()
+            stages["syntax_highlight"] = _best_of(
+                self.repeat,
+                lambda: [highlighter.process_content(text) for text in html]
+            )
+
+            site_name = engine.config.get("site_name")
+            contexts = [
+                {
+                    "content": engine.site.get_template(page.template).render(
+                        page=page,
+                        page_content=text,
+                        page_head_content="",
+                        site_name=site_name
+                    ),
+                    "url": page.url,
+                    "title": page.title,
+                    "page": page,
+                }
+                for page, text in zip(pages, html)
+            ]
+
+            minifier = MinifierPlugin()
+            minifier.config = {"enabled": True}
+            stages["minify"] = _best_of(
+                self.repeat,
+                lambda: [minifier.on_post_page(dict(context))
+                         for context in contexts]
+            )
+
+            seo = SEOPlugin()
+            seo.config = {
+                "site_name": site_name,
+                "site_description": engine.config.get("description"),
+                "default_image": "/static/images/image-0.png",
+            }
+            stages["seo"] = _best_of(
+                self.repeat,
+                lambda: [seo.on_post_page(dict(context))
+                         for context in contexts]
+            )
+
+            sitemap = SitemapPlugin()
+            sitemap.config = {
+                "base_url": engine.config.get("base_url"),
+                "output_path": self.root / "output",
+            }
+            stages["sitemap"] = _best_of(
+                self.repeat, lambda: sitemap._create_sitemap(pages)
+            )
+
+            router = engine.site.router
+            output_dir = self.root / "output"
+            metadata = [
+                {**page.metadata, "slug": page.source_path.stem,
+                 "source_path": str(page.source_path)}
+                for page in pages
+            ]
+
+            def route() -> None:
+                router.clear_cache()
+                for item in metadata:
+                    router.get_url("page", dict(item))
+                    router.get_output_path(output_dir, "page", dict(item))
+
+            stages["router"] = _best_of(self.repeat, route)
+        return stages
+
+    def run(self) -> Dict[str, Any]:
+        """Generate the site, run every benchmark and collect the results."""
+        from .. import __version__
+
+        self.generate()
+        build = self.run_build()
+        stages = self.run_stages()
+        metrics = {
+            "build.cold_seconds": build["cold_seconds"],
+            "build.warm_seconds": build["warm_seconds"],
+            "build.pages_per_sec": build["pages_per_sec"],
+        }
+        metrics.update({
+            f"phase.{name.replace(' ', '_')}_seconds": seconds
+            for name, seconds in build["phases"].items()
+        })
+        metrics.update({
+            f"stage.{name}_seconds": seconds
+            for name, seconds in stages.items()
+        })
+        # Process-wide, so only comparable between fresh interpreters
+        peak_rss = get_peak_rss()
+        if peak_rss is not None:
+            metrics["peak_rss_kb"] = peak_rss
+        return {
+            "version": RESULTS_VERSION,
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "staticflow": __version__,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "spec": asdict(self.spec),
+            "pages": build["pages"],
+            "metrics": metrics,
+        }
+
+
+def save_results(results: Dict[str, Any], path: Path) -> None:
+    """Write benchmark results as JSON."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+    logger.info("Benchmark results written to %s", path)
+
+
+def load_results(path: Path) -> Dict[str, Any]:
+    """Read benchmark results written by ``save_results``."""
+    with open(path, "r", encoding="utf-8") as f:
+        results = json.load(f)
+    if results.get("version") != RESULTS_VERSION:
+        raise ValueError(
+            f"Unsupported benchmark results version in {path}: "
+            f"{results.get('version')}"
+        )
+    return results
+
+
+def higher_is_better(metric: str) -> bool:
+    """Check whether a larger value of a metric is an improvement."""
+    return metric.endswith("_per_sec")
+
+
+def compare_results(
+    current: Dict[str, Any],
+    baseline: Dict[str, Any],
+    tolerance: float = 0.2,
+    min_seconds: float = 0.01
+) -> List[Dict[str, Any]]:
+    """Find the metrics that got worse than the baseline.
+
+    A metric regresses when it is more than ``tolerance`` (a fraction)
+    slower, smaller or larger than its baseline value. Timings below
+    ``min_seconds`` in both runs are too noisy to compare and skipped,
+    as are metrics missing from either run. Results of different site
+    specs are not comparable and raise ValueError.
+    """
+    if current.get("spec") != baseline.get("spec"):
+        raise ValueError("Benchmark results were taken on different sites")
+
+    regressions = []
+    current_metrics = current.get("metrics", {})
+    for metric, expected in sorted(baseline.get("metrics", {}).items()):
+        actual = current_metrics.get(metric)
+        if actual is None or not expected:
+            continue
+        if (metric.endswith("_seconds")
+                and max(actual, expected) < min_seconds):
+            continue
+        change = (actual - expected) / expected
+        if higher_is_better(metric):
+            change = -change
+        if change > tolerance:
+            regressions.append({
+                "metric": metric,
+                "baseline": expected,
+                "current": actual,
+                "change": change,
+            })
+    return regressions
@@ -1,107 +1,346 @@
-import hashlib
-import pickle
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Dict, Optional
-from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, Optional, Tuple
+from datetime import timedelta
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS namespaces (
+    name TEXT PRIMARY KEY,
+    generation INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entries (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    generation INTEGER NOT NULL,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    expires REAL,
+    accessed REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+"""
 
 
 class Cache:
-    """Cache system for StaticFlow."""
+    """Cache system for StaticFlow.
+
+    Every entry lives in one SQLite database (``cache.db``) inside
+    ``cache_dir``. Writes are buffered and committed in a single
+    transaction per batch, entries may expire after a TTL, and the store
+    can be bounded by ``max_size`` bytes, evicting least recently used
+    entries first. Clearing a namespace only bumps its generation, so it
+    is O(1); rows of old generations are purged during eviction. The
+    database runs in WAL mode, so several build workers (threads or
+    processes) can share one cache directory.
+    """
+
+    DB_NAME = "cache.db"
 
-    def __init__(self, cache_dir: Path):
-        self.cache_dir = cache_dir
+    def __init__(self, cache_dir: Path, max_size: Optional[int] = None,
+                 batch_size: int = 500):
+        self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
-        self._memory_cache: Dict[str, Any] = {}
-        self._save_metadata()
+        self.db_path = self.cache_dir / self.DB_NAME
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_pid: Optional[int] = None
+        self._batch_depth = 0
+        # (namespace, key) -> row to write, or None to delete
+        self._pending: Dict[Tuple[str, str], Optional[Tuple]] = {}
+        self._touched: Dict[Tuple[str, str], float] = {}
+        self._connect()
 
-    def _get_cache_key(self, key: str, namespace: str = 'default') -> str:
-        """Generate a cache key."""
-        return hashlib.sha256(f"{namespace}:{key}".encode()).hexdigest()
+    def _connect(self) -> sqlite3.Connection:
+        """Get the connection of this process, opening it if needed."""
+        if self._conn is None or self._conn_pid != os.getpid():
+            conn = sqlite3.connect(
+                str(self.db_path),
+                timeout=30,
+                isolation_level=None,
+                check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+            self._conn_pid = os.getpid()
+            self._pending.clear()
+            self._touched.clear()
+        return self._conn
 
-    def _get_cache_path(self, cache_key: str) -> Path:
-        """Get cache file path."""
-        return self.cache_dir / f"{cache_key}.cache"
+    def _generation(self, conn: sqlite3.Connection, namespace: str) -> int:
+        """Get the current generation of a namespace, creating it."""
+        conn.execute(
+            "INSERT OR IGNORE INTO namespaces (name, generation) "
+            "VALUES (?, 0)",
+            (namespace,)
+        )
+        row = conn.execute(
+            "SELECT generation FROM namespaces WHERE name = ?",
+            (namespace,)
+        ).fetchone()
+        return row[0]
 
     def get(self, key: str, namespace: str = 'default') -> Optional[Any]:
         """Get a value from cache."""
-        cache_key = self._get_cache_key(key, namespace)
-
-        if cache_key in self._memory_cache:
-            metadata = self._metadata.get(cache_key, {})
-            if metadata.get('expires'):
-                expires = datetime.fromisoformat(metadata['expires'])
-                if expires <= datetime.now():
-                    self.delete(key, namespace)
-                    return None
-            return self._memory_cache[cache_key]
-
-        cache_path = self._get_cache_path(cache_key)
-        if cache_path.exists():
-            metadata = self._metadata.get(cache_key, {})
-            if metadata.get('expires'):
-                expires = datetime.fromisoformat(metadata['expires'])
-                if expires <= datetime.now():
-                    self.delete(key, namespace)
+        with self._lock:
+            now = time.time()
+            ident = (namespace, key)
+            if ident in self._pending:
+                row = self._pending[ident]
+                if row is None or (row[4] is not None and row[4] <= now):
+                    self.misses += 1
                     return None
+                self.hits += 1
+                return pickle.loads(row[1])
+
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT e.value, e.expires FROM entries e "
+                "JOIN namespaces n ON n.name = e.namespace "
+                "AND n.generation = e.generation "
+                "WHERE e.namespace = ? AND e.key = ?",
+                ident
+            ).fetchone()
+            if row is None or (row[1] is not None and row[1] <= now):
+                self.misses += 1
+                return None
 
             try:
-                with cache_path.open('rb') as f:
-                    value = pickle.load(f)
-                    self._memory_cache[cache_key] = value
-                    return value
-            except (pickle.PickleError, EOFError):
+                value = pickle.loads(row[0])
+            except (pickle.PickleError, EOFError, AttributeError):
                 self.delete(key, namespace)
+                self.misses += 1
                 return None
 
-        return None
+            self.hits += 1
+            self._touched[ident] = now
+            if len(self._touched) >= self.batch_size:
+                self._flush_touched(conn)
+            return value
 
-    def set(self, key: str, value: Any, 
+    def set(self, key: str, value: Any,
             namespace: str = 'default',
             expires: Optional[timedelta] = None) -> None:
         """Set a value in cache."""
-        cache_key = self._get_cache_key(key, namespace)
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        now = time.time()
+        expires_at = now + expires.total_seconds() if expires else None
+        with self._lock:
+            self._pending[(namespace, key)] = (
+                key, data, len(data), now, expires_at
+            )
+            self._maybe_flush()
 
-        self._memory_cache[cache_key] = value
+    def delete(self, key: str, namespace: str = 'default') -> None:
+        """Delete a value from cache."""
+        with self._lock:
+            self._pending[(namespace, key)] = None
+            self._maybe_flush()
 
-        cache_path = self._get_cache_path(cache_key)
-        with cache_path.open('wb') as f:
-            pickle.dump(value, f)
+    def clear(self, namespace: Optional[str] = None) -> None:
+        """Clear cache, or only one namespace in O(1)."""
+        with self._lock:
+            conn = self._connect()
+            if namespace:
+                self._pending = {
+                    ident: row for ident, row in self._pending.items()
+                    if ident[0] != namespace
+                }
+                conn.execute(
+                    "INSERT OR IGNORE INTO namespaces (name, generation) "
+                    "VALUES (?, 0)",
+                    (namespace,)
+                )
+                conn.execute(
+                    "UPDATE namespaces SET generation = generation + 1 "
+                    "WHERE name = ?",
+                    (namespace,)
+                )
+            else:
+                self._pending.clear()
+                self._touched.clear()
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    conn.execute("DELETE FROM entries")
+                    conn.execute("DELETE FROM namespaces")
+                    conn.execute("COMMIT")
+                except Exception:
+                    conn.execute("ROLLBACK")
+                    raise
 
-        self._metadata[cache_key] = {
-            'key': key,
-            'namespace': namespace,
-            'created': datetime.now().isoformat(),
-            'expires': (datetime.now() + expires).isoformat() if expires else None
-        }
-        self._save_metadata()
+    @contextmanager
+    def batch(self) -> Iterator["Cache"]:
+        """Buffer writes and commit them in one transaction on exit."""
+        with self._lock:
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    self.flush()
 
-    def delete(self, key: str, namespace: str = 'default') -> None:
-        """Delete a value from cache."""
-        cache_key = self._get_cache_key(key, namespace)
+    def _maybe_flush(self) -> None:
+        """Flush right away outside of a batch or when the buffer is full."""
+        if self._batch_depth == 0 or len(self._pending) >= self.batch_size:
+            self.flush()
 
-        self._memory_cache.pop(cache_key, None)
+    def flush(self) -> None:
+        """Write buffered changes and enforce the size limit."""
+        with self._lock:
+            if not self._pending and not self._touched:
+                return
+            conn = self._connect()
+            pending, self._pending = self._pending, {}
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                generations: Dict[str, int] = {}
+                writes = []
+                deletes = []
+                for (namespace, key), row in pending.items():
+                    if row is None:
+                        deletes.append((namespace, key))
+                        continue
+                    if namespace not in generations:
+                        generations[namespace] = self._generation(
+                            conn, namespace
+                        )
+                    _, data, size, created, expires_at = row
+                    writes.append((
+                        namespace, key, generations[namespace], data, size,
+                        created, expires_at, created
+                    ))
+                if writes:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO entries (namespace, key, "
+                        "generation, value, size, created, expires, "
+                        "accessed) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        writes
+                    )
+                if deletes:
+                    conn.executemany(
+                        "DELETE FROM entries WHERE namespace = ? AND key = ?",
+                        deletes
+                    )
+                self._write_touched(conn)
+                if self.max_size is not None:
+                    self._evict(conn)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
 
-        cache_path = self._get_cache_path(cache_key)
-        if cache_path.exists():
-            cache_path.unlink()
+    def _flush_touched(self, conn: sqlite3.Connection) -> None:
+        """Persist access times used for LRU eviction."""
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._write_touched(conn)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
 
-        self._metadata.pop(cache_key, None)
-        self._save_metadata()
+    def _write_touched(self, conn: sqlite3.Connection) -> None:
+        """Write access times inside the current transaction."""
+        if self._touched:
+            conn.executemany(
+                "UPDATE entries SET accessed = ? "
+                "WHERE namespace = ? AND key = ?",
+                [
+                    (accessed, namespace, key)
+                    for (namespace, key), accessed in self._touched.items()
+                ]
+            )
+            self._touched.clear()
 
-    def clear(self, namespace: Optional[str] = None) -> None:
-        """Clear cache."""
-        if namespace:
-            keys_to_delete = []
-            for cache_key, metadata in self._metadata.items():
-                if metadata['namespace'] == namespace:
-                    keys_to_delete.append((metadata['key'], namespace))
-
-            for key, ns in keys_to_delete:
-                self.delete(key, ns)
-        else:
-            # Clear all cache
-            self._memory_cache.clear()
-            for cache_file in self.cache_dir.glob('*.cache'):
-                cache_file.unlink()
-            self._metadata.clear()
-            self._save_metadata()
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """Drop expired and cleared entries, then the least recently used."""
+        conn.execute(
+            "DELETE FROM entries WHERE expires IS NOT NULL AND expires <= ?",
+            (time.time(),)
+        )
+        conn.execute(
+            "DELETE FROM entries WHERE NOT EXISTS ("
+            "SELECT 1 FROM namespaces n WHERE n.name = entries.namespace "
+            "AND n.generation = entries.generation)"
+        )
+        total = conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()[0]
+        excess = total - self.max_size
+        if excess <= 0:
+            return
+
+        victims = []
+        for rowid, size in conn.execute(
+            "SELECT rowid, size FROM entries ORDER BY accessed"
+        ):
+            victims.append((rowid,))
+            excess -= size
+            if excess <= 0:
+                break
+        conn.executemany("DELETE FROM entries WHERE rowid = ?", victims)
+
+    def cleanup(self) -> None:
+        """Purge expired and cleared entries and enforce the size limit."""
+        with self._lock:
+            self.flush()
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if self.max_size is None:
+                    conn.execute(
+                        "DELETE FROM entries WHERE expires IS NOT NULL "
+                        "AND expires <= ?",
+                        (time.time(),)
+                    )
+                    conn.execute(
+                        "DELETE FROM entries WHERE NOT EXISTS ("
+                        "SELECT 1 FROM namespaces n "
+                        "WHERE n.name = entries.namespace "
+                        "AND n.generation = entries.generation)"
+                    )
+                else:
+                    self._evict(conn)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        with self._lock:
+            self.flush()
+            entries, size = self._connect().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+        return {
+            'entries': entries,
+            'total_size': size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'cache_dir': str(self.cache_dir)
+        }
+
+    def close(self) -> None:
+        """Flush pending writes and close the database."""
+        with self._lock:
+            if self._conn is not None and self._conn_pid == os.getpid():
+                self.flush()
+                self._conn.close()
+            self._conn = None
+            self._conn_pid = None
@@ -14,6 +14,7 @@ class Config:
             "language_config": {},
             "environment": "development"
         }
+        self._config_path: Optional[Path] = None
         if config_path:
             self.load(config_path)
 
@@ -36,6 +37,7 @@ class Config:
                     f"Invalid configuration format in {config_path}. "
                     "Configuration must be a dictionary."
                 )
+        self._config_path = config_path
 
     def get(self, key: str, default: Any = None) -> Any:
         """Get configuration value."""
@@ -99,4 +101,4 @@ class Config:
     @property
     def config_path(self) -> Optional[Path]:
         """Get the path to the configuration file."""
-        return self.config.get("_config_path")
+        return self.config.get("_config_path", self._config_path)
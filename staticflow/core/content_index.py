@@ -0,0 +1,303 @@
+from datetime import date, datetime, timezone
+from pathlib import Path
+import hashlib
+import json
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from .manifest import hash_data
+from .page import Page
+from ..utils.logging import get_logger
+
+
+logger = get_logger("core.content_index")
+
+# Bumped when the tables change; older databases are rebuilt
+SCHEMA_VERSION = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    hash TEXT NOT NULL,
+    title TEXT,
+    date TEXT,
+    timestamp REAL,
+    language TEXT,
+    content_type TEXT,
+    category TEXT,
+    output_path TEXT,
+    url TEXT,
+    metadata TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS info (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tags (
+    path TEXT NOT NULL,
+    tag TEXT NOT NULL,
+    PRIMARY KEY (path, tag)
+);
+CREATE INDEX IF NOT EXISTS pages_timestamp ON pages (timestamp);
+CREATE INDEX IF NOT EXISTS pages_category ON pages (category);
+CREATE INDEX IF NOT EXISTS pages_type ON pages (content_type);
+CREATE INDEX IF NOT EXISTS tags_tag ON tags (tag);
+"""
+
+_COLUMNS = (
+    "path, mtime_ns, size, hash, title, date, timestamp, language, "
+    "content_type, category, output_path, url, metadata"
+)
+
+
+def _format_date(value: Any) -> Optional[str]:
+    """Convert a front matter date to a sortable ISO string."""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, str) and value:
+        return value
+    return None
+
+
+def _date_timestamp(value: Any) -> Optional[float]:
+    """Convert a front matter date to a POSIX timestamp for sorting.
+
+    Dates are taken at midnight and naive datetimes as UTC. Strings must
+    be ISO dates; other values give None.
+    """
+    if isinstance(value, str) and value:
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.timestamp()
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day,
+                        tzinfo=timezone.utc).timestamp()
+    return None
+
+
+class ContentIndex:
+    """Persistent SQLite index of the content tree.
+
+    One row per content file holds its stat signature, a hash of its
+    bytes, its front matter and the derived language, content type,
+    output path and URL. ``update`` only re-reads files whose mtime or
+    size changed, so listings such as the latest posts, a category or a
+    tag are index lookups instead of scans of every page.
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(
+            str(self.db_path), timeout=30, check_same_thread=False
+        )
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != SCHEMA_VERSION:
+            self._conn.executescript(
+                "DROP TABLE IF EXISTS pages; DROP TABLE IF EXISTS tags; "
+                "DROP TABLE IF EXISTS info;"
+            )
+        self._conn.executescript(_SCHEMA)
+        self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def update(self, site, pages: Optional[Iterable[Page]] = None
+               ) -> Tuple[int, int]:
+        """Bring the index in line with the site's content directory.
+
+        ``pages`` are already loaded pages whose metadata can be reused.
+        Returns the number of updated and removed entries.
+        """
+        if not site.source_dir:
+            raise ValueError("Source directory not set")
+        loaded = {str(page.source_path): page for page in pages or []}
+        # Output paths and URLs depend on the config; rebuild on change
+        config_hash = hash_data(site.config.config)
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM info WHERE key = 'config_hash'"
+            ).fetchone()
+            if row is None or row[0] != config_hash:
+                self.clear()
+                with self._conn:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO info (key, value) "
+                        "VALUES ('config_hash', ?)",
+                        (config_hash,)
+                    )
+            known = {
+                row["path"]: (row["mtime_ns"], row["size"])
+                for row in self._conn.execute(
+                    "SELECT path, mtime_ns, size FROM pages"
+                )
+            }
+            seen = set()
+            rows = []
+            for content_file in site.scan_content():
+                file_path = content_file.path
+                rel_path = str(file_path.relative_to(site.source_dir))
+                seen.add(rel_path)
+                signature = (content_file.mtime_ns, content_file.size)
+                if known.get(rel_path) == signature:
+                    continue
+                try:
+                    page = loaded.get(rel_path) or site.create_page(
+                        file_path, False, content_file.stat
+                    )
+                    rows.append(
+                        self._make_row(site, page, file_path, signature)
+                    )
+                except Exception as e:
+                    logger.error("Cannot index %s: %s", file_path, e)
+
+            removed = [(path,) for path in known if path not in seen]
+            with self._conn:
+                self._conn.executemany(
+                    f"INSERT OR REPLACE INTO pages ({_COLUMNS}) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [row for row, _ in rows]
+                )
+                self._conn.executemany(
+                    "DELETE FROM tags WHERE path = ?",
+                    [(row[0],) for row, _ in rows] + removed
+                )
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO tags (path, tag) VALUES (?, ?)",
+                    [(row[0], tag) for row, tags in rows for tag in tags]
+                )
+                self._conn.executemany(
+                    "DELETE FROM pages WHERE path = ?", removed
+                )
+        if rows or removed:
+            logger.debug("Content index: %d updated, %d removed",
+                         len(rows), len(removed))
+        return len(rows), len(removed)
+
+    def _make_row(self, site, page: Page, file_path: Path,
+                  signature: Tuple[int, int]) -> Tuple[tuple, List[str]]:
+        """Build the index row and tags of a page."""
+        content_type = site.determine_content_type(page)
+        url = site.router.get_url(content_type, dict(page.metadata))
+        with open(file_path, "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        date_value = page.metadata.get("date")
+        row = (
+            str(page.source_path),
+            signature[0],
+            signature[1],
+            digest,
+            page.title,
+            _format_date(date_value),
+            _date_timestamp(date_value),
+            page.language,
+            content_type,
+            page.category,
+            str(page.output_path) if page.output_path else None,
+            url,
+            json.dumps(page.metadata, default=str),
+        )
+        return row, [str(tag) for tag in page.tags]
+
+    def _query(self, sql: str, params: tuple = ()) -> List[Dict[str, Any]]:
+        """Run a query returning entries as dicts."""
+        with self._lock:
+            entries = [dict(row) for row in self._conn.execute(sql, params)]
+            tags: Dict[str, List[str]] = {}
+            paths = [entry["path"] for entry in entries]
+            for i in range(0, len(paths), 500):
+                chunk = paths[i:i + 500]
+                placeholders = ", ".join("?" * len(chunk))
+                for path, tag in self._conn.execute(
+                    f"SELECT path, tag FROM tags WHERE path IN "
+                    f"({placeholders}) ORDER BY tag",
+                    chunk
+                ):
+                    tags.setdefault(path, []).append(tag)
+        for entry in entries:
+            entry["metadata"] = json.loads(entry["metadata"])
+            entry["tags"] = tags.get(entry["path"], [])
+        return entries
+
+    def get(self, path: str) -> Optional[Dict[str, Any]]:
+        """Get the entry of a content file by its relative path."""
+        entries = self._query("SELECT * FROM pages WHERE path = ?", (path,))
+        return entries[0] if entries else None
+
+    def all(self) -> List[Dict[str, Any]]:
+        """Get every entry ordered by path."""
+        return self._query("SELECT * FROM pages ORDER BY path")
+
+    def latest(self, limit: int = 10,
+               content_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Get the most recent dated entries, newest first.
+
+        Entries whose date is not an ISO date or datetime are left out.
+        """
+        return self._latest(limit, 0, content_type)
+
+    def iter_latest(self, content_type: Optional[str] = None,
+                    batch_size: int = 100) -> Iterator[Dict[str, Any]]:
+        """Iterate over the dated entries, newest first, in batches.
+
+        Lets callers skip entries and stop once they have enough.
+        """
+        offset = 0
+        while True:
+            entries = self._latest(batch_size, offset, content_type)
+            yield from entries
+            if len(entries) < batch_size:
+                return
+            offset += batch_size
+
+    def _latest(self, limit: int, offset: int,
+                content_type: Optional[str]) -> List[Dict[str, Any]]:
+        if content_type:
+            return self._query(
+                "SELECT * FROM pages WHERE timestamp IS NOT NULL "
+                "AND content_type = ? ORDER BY timestamp DESC, path "
+                "LIMIT ? OFFSET ?",
+                (content_type, limit, offset)
+            )
+        return self._query(
+            "SELECT * FROM pages WHERE timestamp IS NOT NULL "
+            "ORDER BY timestamp DESC, path LIMIT ? OFFSET ?",
+            (limit, offset)
+        )
+
+    def by_category(self, category: str) -> List[Dict[str, Any]]:
+        """Get the entries of a category."""
+        return self._query(
+            "SELECT * FROM pages WHERE category = ? ORDER BY path",
+            (category,)
+        )
+
+    def by_tag(self, tag: str) -> List[Dict[str, Any]]:
+        """Get the entries with a tag."""
+        return self._query(
+            "SELECT pages.* FROM pages JOIN tags ON tags.path = pages.path "
+            "WHERE tags.tag = ? ORDER BY pages.path",
+            (tag,)
+        )
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM tags")
+            self._conn.execute("DELETE FROM pages")
+            self._conn.execute("DELETE FROM info")
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self._conn.close()
+
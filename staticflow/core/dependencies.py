@@ -0,0 +1,177 @@
+from pathlib import Path
+import hashlib
+from typing import Any, Dict, List, Optional, Set, Tuple
+import jinja2
+from jinja2 import meta
+from ..utils.logging import get_logger
+
+
+logger = get_logger("core.dependencies")
+
+# Marker for templates referenced by a dynamic expression; a page that uses
+# one depends on every template in the template directory.
+ALL_TEMPLATES = "*"
+
+# Context variables that expose site-wide data to templates.
+SITE_VARIABLES = {"site"}
+
+
+class DependencyGraph:
+    """Dependencies between pages, templates and site-wide data.
+
+    For every rendered page the graph records the templates it touched
+    (its own template plus everything reached through extends, include,
+    import and from-import) and the site-wide data its templates read.
+    The records are persisted in the build manifest so incremental builds
+    and the dev server can re-render only the pages affected by a change.
+    """
+
+    def __init__(self, template_dir: Optional[Path] = None):
+        self.template_dir: Optional[Path] = None
+        self.pages: Dict[str, Dict[str, List[str]]] = {}
+        self._env: Optional[jinja2.Environment] = None
+        self._closures: Dict[str, Tuple[Set[str], Set[str]]] = {}
+        self._file_hashes: Dict[str, str] = {}
+        self.set_template_dir(template_dir)
+
+    def set_template_dir(self, template_dir: Optional[Path]) -> None:
+        """Set the template directory and forget cached template data."""
+        self.template_dir = Path(template_dir) if template_dir else None
+        self._env = None
+        if self.template_dir:
+            self._env = jinja2.Environment(
+                loader=jinja2.FileSystemLoader(str(self.template_dir))
+            )
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget parsed templates and file hashes (call once per build)."""
+        self._closures.clear()
+        self._file_hashes.clear()
+
+    @classmethod
+    def from_manifest(cls, manifest,
+                      template_dir: Optional[Path] = None
+                      ) -> "DependencyGraph":
+        """Rebuild the page records stored in a build manifest."""
+        graph = cls(template_dir)
+        for source in manifest.sources():
+            entry = manifest.get(source) or {}
+            graph.record(source, {
+                "templates": entry.get("templates", []),
+                "data": entry.get("data", []),
+            })
+        return graph
+
+    def _parse(self, name: str) -> Tuple[Set[str], Set[str]]:
+        """Get the templates directly referenced by and variables of one template."""
+        if not self._env:
+            return set(), set()
+        try:
+            source, _, _ = self._env.loader.get_source(self._env, name)
+            ast = self._env.parse(source)
+        except jinja2.TemplateNotFound:
+            return set(), set()
+        except jinja2.TemplateSyntaxError as e:
+            logger.warning("Cannot parse template %s: %s", name, e)
+            return {ALL_TEMPLATES}, set()
+
+        referenced = set()
+        for ref in meta.find_referenced_templates(ast):
+            referenced.add(ref if ref is not None else ALL_TEMPLATES)
+        return referenced, set(meta.find_undeclared_variables(ast))
+
+    def get_template_closure(self, name: str) -> Tuple[Set[str], Set[str]]:
+        """Get every template reachable from a template and their variables."""
+        if name in self._closures:
+            return self._closures[name]
+
+        templates: Set[str] = set()
+        variables: Set[str] = set()
+        pending = [name]
+        while pending:
+            current = pending.pop()
+            if current in templates:
+                continue
+            templates.add(current)
+            if current == ALL_TEMPLATES:
+                continue
+            referenced, used = self._parse(current)
+            variables |= used
+            pending.extend(referenced - templates)
+
+        self._closures[name] = (templates, variables)
+        return templates, variables
+
+    def get_page_dependencies(self, template_name: str) -> Dict[str, List[str]]:
+        """Get the templates and site data a page rendered with a template uses."""
+        templates, variables = self.get_template_closure(template_name)
+        return {
+            "templates": sorted(templates),
+            "data": sorted(variables & SITE_VARIABLES),
+        }
+
+    def _hash_file(self, name: str) -> str:
+        """Hash one template file, caching the result for this build."""
+        if name not in self._file_hashes:
+            path = self.template_dir / name if self.template_dir else None
+            if path and path.is_file():
+                digest = hashlib.sha256(path.read_bytes()).hexdigest()
+            else:
+                digest = ""
+            self._file_hashes[name] = digest
+        return self._file_hashes[name]
+
+    def hash_templates(self, names: List[str]) -> str:
+        """Hash the given templates, or all of them for a dynamic reference."""
+        if ALL_TEMPLATES in names and self.template_dir:
+            names = sorted(
+                str(path.relative_to(self.template_dir)).replace("\\", "/")
+                for path in self.template_dir.rglob("*")
+                if path.is_file()
+            )
+        digest = hashlib.sha256()
+        for name in names:
+            digest.update(name.encode("utf-8"))
+            digest.update(self._hash_file(name).encode("utf-8"))
+        return digest.hexdigest()
+
+    def record(self, source: str, dependencies: Dict[str, Any]) -> None:
+        """Record the dependencies of a rendered page."""
+        self.pages[source] = {
+            "templates": list(dependencies.get("templates", [])),
+            "data": list(dependencies.get("data", [])),
+        }
+
+    def forget(self, source: str) -> None:
+        """Forget a page."""
+        self.pages.pop(source, None)
+
+    def get_dependencies(self, source: str) -> Dict[str, List[str]]:
+        """Get the recorded dependencies of a page."""
+        return self.pages.get(source, {"templates": [], "data": []})
+
+    def get_template_dependents(self, template_name: str) -> List[str]:
+        """Get the pages that use a template, directly or indirectly."""
+        return sorted(
+            source for source, deps in self.pages.items()
+            if template_name in deps["templates"]
+            or ALL_TEMPLATES in deps["templates"]
+        )
+
+    def get_data_dependents(self, data: str = "site") -> List[str]:
+        """Get the pages whose templates read a piece of site-wide data."""
+        return sorted(
+            source for source, deps in self.pages.items()
+            if data in deps["data"]
+        )
+
+    def get_source_dependents(self, source: str) -> List[str]:
+        """Get the pages to re-render when a content file changes."""
+        dependents = set(self.get_data_dependents("site"))
+        dependents.add(source)
+        return sorted(dependents)
+
+    def get_all_pages(self) -> List[str]:
+        """Get every recorded page."""
+        return sorted(self.pages)
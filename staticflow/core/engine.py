@@ -1,11 +1,32 @@
+from contextlib import contextmanager, nullcontext
 from pathlib import Path
+import os
 import shutil
+import threading
 import markdown
-from typing import List, Optional, Dict, Any
+from typing import Iterable, Iterator, List, Optional, Dict, Any, Tuple
 from .config import Config
 from .site import Site
 from .page import Page
+from .manifest import BuildManifest, hash_data
+from .dependencies import DependencyGraph
+from .render_cache import RenderCache
+from .scanner import ContentScanner
+from .assets import AssetPipeline
+from .content_index import ContentIndex
+from .output_digests import OutputDigests
+from .parallel import get_worker_count, render_pages_parallel
+from .profiler import BuildProfiler
+from .writer import create_writer
 from ..plugins.base import Plugin
+from ..plugins.core.dispatch import (
+    DispatchTable,
+    HookHandler,
+    get_plugin_name,
+)
+from ..plugins.core.stats import HookStats
+from ..utils.files import get_link_mode
+from ..parsers.cache import DEFAULT_MAX_SIZE
 from ..parsers.extensions.video import makeExtension as makeVideoExtension
 from ..parsers.extensions.audio import makeExtension as makeAudioExtension
 from ..utils.logging import get_logger
@@ -13,6 +34,12 @@ from ..utils.logging import get_logger
 
 logger = get_logger("core.engine")
 
+# Config keys that change how a build runs but not what it produces.
+BUILD_MODE_KEYS = {
+    "incremental", "workers", "render_backend", "streaming", "write_workers",
+    "write_if_changed", "asset_workers"
+}
+
 
 class Engine:
     """Main engine for static site generation."""
@@ -29,25 +56,54 @@ class Engine:
             )
         self.site = Site(self.config)
         self._cache = {}
+        self.manifest: Optional[BuildManifest] = None
+        self.asset_manifest: Optional[BuildManifest] = None
+        self.dependencies = DependencyGraph()
+        self._build_hashes: Dict[str, str] = {}
+        self._site_hash = ""
+        # Serializes builds and partial rebuilds started from other threads
+        self._build_lock = threading.RLock()
+        # Served URL -> page source, built on the first lookup
+        self._url_index: Optional[Dict[str, str]] = None
+        # Page source -> (build entry, HTML) of pages rendered on demand
+        self._rendered: Dict[str, Tuple[Dict[str, Any], str]] = {}
 
         fenced_code_config = {
             'lang_prefix': 'language-',
         }
 
+        markdown_extensions = [
+            'meta',
+            'fenced_code',
+            'tables',
+            'attr_list',
+            makeVideoExtension(),
+            makeAudioExtension(),
+        ]
+        markdown_extension_configs = {
+            'fenced_code': fenced_code_config
+        }
         self.markdown = markdown.Markdown(
-            extensions=[
-                'meta',
-                'fenced_code',
-                'tables',
-                'attr_list',
-                makeVideoExtension(),
-                makeAudioExtension(),
-            ],
-            extension_configs={
-                'fenced_code': fenced_code_config
-            }
+            extensions=markdown_extensions,
+            extension_configs=markdown_extension_configs
         )
+        self._markdown_options = {
+            'extensions': [
+                ext if isinstance(ext, str)
+                else f"{ext.__class__.__module__}.{ext.__class__.__name__}"
+                for ext in markdown_extensions
+            ],
+            'extension_configs': markdown_extension_configs,
+        }
+        self.render_cache: Optional[RenderCache] = None
+        self.content_index: Optional[ContentIndex] = None
+        self.output_digests: Optional[OutputDigests] = None
+        # Set to a BuildProfiler to time the next builds
+        self.profiler: Optional[BuildProfiler] = None
+        # Cost of every plugin hook during the last build
+        self.hook_stats = HookStats()
         self.plugins: List[Plugin] = []
+        self._dispatch: Optional[DispatchTable] = None
         logger.info("Engine initialized")
 
     def add_plugin(self, plugin: Plugin,
@@ -58,11 +114,14 @@ class Engine:
             plugin.config = config
         plugin.initialize()
         self.plugins.append(plugin)
-        logger.info(
-            "Plugin added: %s",
-            plugin.metadata.name if hasattr(plugin, 'metadata')
-            else plugin.__class__.__name__
-        )
+        self._dispatch = None
+        logger.info("Plugin added: %s", get_plugin_name(plugin))
+
+    def get_dispatch_table(self) -> DispatchTable:
+        """Get the plugin hook handlers, built once per build."""
+        if self._dispatch is None:
+            self._dispatch = DispatchTable(self.plugins)
+        return self._dispatch
 
     def get_plugin(self, name: str) -> Optional[Plugin]:
         """Get a plugin by its name."""
@@ -93,9 +152,21 @@ class Engine:
             templates_dir
         )
 
-    def build(self) -> None:
-        """Build the site."""
+    def build(self, incremental: Optional[bool] = None) -> None:
+        """Build the site.
+
+        With incremental builds (the default, see the ``incremental``
+        config key) only pages whose content, templates, plugins or
+        config changed since the last build are rendered again. With
+        ``profiler`` set, every phase, page and plugin hook is timed.
+        """
+        with self._build_lock:
+            self._build(incremental)
+
+    def _build(self, incremental: Optional[bool]) -> None:
         logger.info("Starting site build")
+        if incremental is None:
+            incremental = self.config.get("incremental", True)
 
         if self.site.output_dir:
             self.site.output_dir.mkdir(parents=True, exist_ok=True)
@@ -103,73 +174,675 @@ class Engine:
                 "Output directory created/verified: %s", 
                 self.site.output_dir
             )
+        output_digests = self.get_output_digests()
+        if output_digests is not None:
+            # Parallel workers of the last build may have added entries
+            output_digests.load()
+            output_digests.reset_stats()
+        self.hook_stats.reset()
+        # Plugins may have been enabled or disabled since the last build
+        self._dispatch = DispatchTable(self.plugins)
 
-        for plugin in self.plugins:
-            if hasattr(plugin, 'pre_build'):
-                plugin_name = (
-                    plugin.metadata.name if hasattr(plugin, 'metadata')
-                    else plugin.__class__.__name__
-                )
-                logger.debug(
-                    "Running pre_build hook for plugin: %s", 
-                    plugin_name
-                )
-                plugin.pre_build(self.site)
+        with self._profile("pre_build hooks"):
+            self._run_site_hooks("pre_build")
+        self._load_site(incremental)
+        logger.info("Processing pages")
+        with self._profile("render"):
+            self._process_pages()
+        with self._profile("stale outputs"):
+            self._remove_stale_outputs()
+        with self._profile("content index"):
+            self._update_content_index()
+
+        with self._profile("post_build hooks"):
+            self._run_site_hooks("post_build")
+
+        with self._profile("admin static"):
+            try:
+                from ..admin import AdminPanel
+                logger.debug("Copying admin static files")
+                admin = AdminPanel(self.config, self)
+                admin.copy_static_to_output()
+            except Exception as e:
+                logger.error("Error copying admin static files: %s", e)
+
+        logger.debug("Copying static files")
+        with self._profile("static copy"):
+            self._copy_static_files(incremental)
+        with self._profile("save caches"):
+            self.manifest.save()
+            if self.render_cache is not None:
+                self.render_cache.flush()
+            if output_digests is not None:
+                output_digests.save()
+        if output_digests is not None:
+            stats = output_digests.get_stats()
+            logger.info(
+                "Outputs: %d written, %d unchanged",
+                stats["files_written"],
+                stats["files_skipped"]
+            )
+        logger.info("Site build completed")
+
+    def _run_site_hooks(self, hook: str) -> None:
+        for handler in self.get_dispatch_table().get(hook):
+            logger.debug("Running %s hook for plugin: %s", hook, handler.name)
+            self.call_hook(handler, self.site)
 
+    def _load_site(self, incremental: bool) -> None:
+        """Load every page's metadata and hash the build inputs."""
         logger.info("Clearing site and loading pages")
         self.site.clear()
-        self.site.load_pages()
-        logger.info("Processing pages")
-        self._process_pages()
+        with self._profile("scan"):
+            content_files = list(self.site.scan_content())
+        with self._profile("load", pages=len(content_files)):
+            self.site.load_pages(
+                load_content=not self.is_streaming(),
+                content_files=content_files
+            )
+        with self._profile("manifest"):
+            self._prepare_manifest(incremental)
+        self._url_index = None
+        self._rendered.clear()
 
-        for plugin in self.plugins:
-            if hasattr(plugin, 'post_build'):
-                plugin_name = (
-                    plugin.metadata.name if hasattr(plugin, 'metadata')
-                    else plugin.__class__.__name__
-                )
-                logger.debug(
-                    "Running post_build hook for plugin: %s", 
-                    plugin_name
-                )
-                plugin.post_build(self.site)
+    def load(self, incremental: Optional[bool] = None) -> None:
+        """Load the site without rendering, for ``render_url``.
+
+        Runs the ``pre_build`` hooks and reads every page's front matter,
+        which takes a fraction of a full build; pages are then rendered
+        one at a time as they are requested.
+        """
+        with self._build_lock:
+            self._load(incremental)
+
+    def _load(self, incremental: Optional[bool]) -> None:
+        if incremental is None:
+            incremental = self.config.get("incremental", True)
+        self._dispatch = DispatchTable(self.plugins)
+        self._run_site_hooks("pre_build")
+        self._load_site(incremental)
+        logger.info("Loaded %d pages", len(self.site.pages))
+
+    def render_url(self, url: str) -> Optional[str]:
+        """Render the page served at a URL, without writing it.
+
+        The HTML is kept in memory under the page's build entry, which
+        hashes its content, templates, site data, plugins and config, so
+        it is rendered again only once one of them changed. A page whose
+        output from an earlier build is still fresh is read from disk.
+        Returns None when no page is served at the URL.
+        """
+        with self._build_lock:
+            if not self._build_hashes:
+                self._load(None)
+            source = self._get_url_index().get(url)
+            if source is None:
+                return None
+            page = self.site.pages[source]
+            with self._page_content(page):
+                entry = self._get_page_build_entry(page)
+                cached = self._rendered.get(source)
+                if cached is not None and cached[0] == entry:
+                    return cached[1]
+                output_path = Path(page.output_path)
+                if (self.manifest.is_fresh(source, entry)
+                        and output_path.is_file()):
+                    html = output_path.read_text(encoding="utf-8")
+                else:
+                    logger.info("Rendering %s on demand", source)
+                    html = self._render_html(page)
+                    if html is None:
+                        return None
+            self.dependencies.record(source, entry)
+            self._rendered[source] = (entry, html)
+            return html
+
+    def _get_url_index(self) -> Dict[str, str]:
+        """Map the path every page is served at to its source."""
+        if self._url_index is None:
+            self._url_index = {
+                self._output_url(page): source
+                for source, page in self.site.pages.items()
+                if page.output_path
+            }
+        return self._url_index
+
+    def rebuild_paths(self, paths: Iterable[Path],
+                      render: bool = True) -> Dict[str, Any]:
+        """Rebuild only what depends on the given changed files.
+
+        Changed content files are reloaded, or dropped with their output
+        when deleted, and rendered again together with the listing pages
+        whose templates read site-wide data; the ``post_build`` hooks
+        then refresh feeds and the sitemap. A changed template re-renders the
+        pages that use it and a static file goes through the asset
+        pipeline alone. Pages whose inputs did not really change are
+        skipped. A config file or directory change, or a call before the
+        first build, runs an incremental build instead.
+
+        Returns the rendered page sources and the paths they are served
+        at, the updated static files, the removed page sources and
+        whether a build ran.
+
+        With ``render`` off, for a site served through ``render_url``,
+        affected pages are only dropped from the on-demand cache, are
+        reported if they had been rendered and the fallback reloads the
+        site instead of building it.
+        """
+        with self._build_lock:
+            return self._rebuild_paths([Path(path) for path in paths], render)
+
+    def _rebuild_paths(self, paths: List[Path],
+                       render: bool) -> Dict[str, Any]:
+        result: Dict[str, Any] = {
+            "full": False, "pages": [], "urls": [], "assets": [],
+            "removed": [],
+        }
+        static_dir = Path(self.config.get("static_dir", "static"))
+        content, templates, static, configs = [], [], [], []
+        for path in paths:
+            template_rel = self._relative_to(path, self.site.template_dir)
+            source_rel = self._relative_to(path, self.site.source_dir)
+            static_rel = self._relative_to(path, static_dir)
+            if template_rel is not None:
+                templates.append(template_rel.as_posix())
+            elif source_rel is not None:
+                content.append(source_rel)
+            elif static_rel is not None:
+                static.append(static_rel.as_posix())
+            elif path.suffix == ".toml":
+                configs.append(path)
+
+        if (configs or not self._build_hashes or self.manifest is None
+                or any(path.is_dir() for path in paths)):
+            for path in configs:
+                if path.is_file():
+                    logger.info("Config changed, reloading %s", path)
+                    self.config.load(path)
+            if render:
+                self._build(True)
+            else:
+                self._load(True)
+            result["full"] = True
+            return result
 
+        self.dependencies.reset()
+        sources = set()
+        changed = []
+        scanner = ContentScanner(
+            self.site.source_dir, exclude=self.config.get("exclude", [])
+        )
+        for rel_path in content:
+            source = str(rel_path)
+            file_path = self.site.source_dir / rel_path
+            if file_path.is_file():
+                if scanner.accepts(rel_path.as_posix()):
+                    self.site.pages[source] = self.site.create_page(
+                        file_path, load_content=not self.is_streaming()
+                    )
+                    changed.append(source)
+                    self._url_index = None
+                continue
+            prefix = source + os.sep
+            for removed in list(self.site.pages):
+                if removed == source or removed.startswith(prefix):
+                    page = self.site.pages.pop(removed)
+                    self._rendered.pop(removed, None)
+                    self._url_index = None
+                    entry = self.manifest.remove(removed) or {}
+                    self.dependencies.forget(removed)
+                    self._remove_output(
+                        entry.get("output_path") or page.output_path
+                    )
+                    result["removed"].append(removed)
+                    changed.append(removed)
+
+        if changed:
+            # Titles, dates or tags may have changed for listing pages
+            self._site_hash = hash_data({
+                str(page.source_path): page.metadata
+                for page in self.site.get_all_pages()
+            })
+            sources.update(self.dependencies.get_data_dependents("site"))
+            sources.update(changed)
+        for template in templates:
+            sources.update(self.dependencies.get_template_dependents(template))
+
+        pages = [
+            self.site.pages[source] for source in sorted(sources)
+            if source in self.site.pages
+        ]
+        if render:
+            pages = [
+                page for page in pages if not self._check_page_fresh(page)
+            ]
+            with self._background_writes(pages):
+                for page in pages:
+                    with self._page_content(page):
+                        if self._process_page(page):
+                            result["pages"].append(str(page.source_path))
+                            result["urls"].append(self._output_url(page))
+        else:
+            for page in pages:
+                if self._rendered.pop(str(page.source_path), None):
+                    result["pages"].append(str(page.source_path))
+                    result["urls"].append(self._output_url(page))
+
+        if changed:
+            self._update_content_index()
+            if render:
+                # Feeds and the sitemap list every page
+                self._run_site_hooks("post_build")
+        if static:
+            result["assets"] = self._update_static_files(static_dir, static)
+
+        self.manifest.save()
+        if self.render_cache is not None:
+            self.render_cache.flush()
+        if self.output_digests is not None:
+            self.output_digests.save()
+        logger.info(
+            "Rebuilt %d pages and %d static files, removed %d pages",
+            len(result["pages"]),
+            len(result["assets"]),
+            len(result["removed"])
+        )
+        return result
+
+    def run_plugin_hook(self, plugin: Plugin, hook: str, value: Any) -> Any:
+        """Call a plugin hook, recording its cost in ``hook_stats``."""
+        return self.call_hook(
+            HookHandler(plugin, get_plugin_name(plugin), hook,
+                        getattr(plugin, hook)),
+            value
+        )
+
+    def call_hook(self, handler: HookHandler, value: Any) -> Any:
+        """Call one hook handler, recording its cost in ``hook_stats``."""
+        if self.profiler is None:
+            return self.hook_stats.call(
+                handler.name, handler.hook, handler.func, value
+            )
+        with self.profiler.span(f"{handler.name}.{handler.hook}", "plugin"):
+            return self.hook_stats.call(
+                handler.name, handler.hook, handler.func, value
+            )
+
+    def run_hooks(self, hook: str, value: Any) -> Any:
+        """Pass a value through every handler of a hook, in order."""
+        for handler in self.get_dispatch_table().get(hook):
+            value = self.call_hook(handler, value)
+        return value
+
+    def _profile(self, name: str, category: str = "phase", **args: Any):
+        """Time a block when the build is profiled, else do nothing."""
+        if self.profiler is None:
+            return nullcontext()
+        return self.profiler.span(name, category, **args)
+
+    def _get_manifest_path(self) -> Path:
+        """Get the path of the persistent build manifest."""
+        cache_dir = Path(self.config.get("cache_dir", ".cache"))
+        return cache_dir / "build_manifest.json"
+
+    def _load_manifest(self) -> None:
+        """Load the build manifest from disk once per engine."""
+        if self.manifest is None:
+            self.manifest = BuildManifest(self._get_manifest_path())
+            self.manifest.load()
+            self.dependencies = DependencyGraph.from_manifest(
+                self.manifest, self.site.template_dir
+            )
+
+    def get_output_digests(self) -> Optional[OutputDigests]:
+        """Get the digest map of generated files, loading it once.
+
+        With ``write_if_changed`` enabled (the default) outputs whose
+        bytes did not change are not rewritten, so their mtimes stay put
+        and deploys only upload what changed. The map is kept in
+        ``cache_dir/output_digests.json``.
+        """
+        if (self.output_digests is None
+                and self.config.get("write_if_changed", True)):
+            cache_dir = Path(self.config.get("cache_dir", ".cache"))
+            self.output_digests = OutputDigests(
+                cache_dir / "output_digests.json"
+            )
+            self.output_digests.load()
+        self.site.output_digests = self.output_digests
+        return self.output_digests
+
+    def get_content_index(self) -> Optional[ContentIndex]:
+        """Get the persistent content index, unless disabled in config."""
+        if self.content_index is None and self.config.get(
+                "content_index", True):
+            self.content_index = ContentIndex(
+                Path(self.config.get("cache_dir", ".cache"))
+                / "content_index.db"
+            )
+            self.site.content_index = self.content_index
+        return self.content_index
+
+    def _update_content_index(self) -> None:
+        """Refresh the content index from the pages loaded for this build."""
+        index = self.get_content_index()
+        if index is None or not self.site.source_dir:
+            return
         try:
-            from ..admin import AdminPanel
-            logger.debug("Copying admin static files")
-            admin = AdminPanel(self.config, self)
-            admin.copy_static_to_output()
+            index.update(self.site, self.site.get_all_pages())
         except Exception as e:
-            logger.error("Error copying admin static files: %s", e)
+            logger.error("Error updating content index: %s", e)
 
-        logger.debug("Copying static files")
-        self._copy_static_files()
-        logger.info("Site build completed")
+    def get_dependency_graph(self) -> DependencyGraph:
+        """Get the page dependency graph recorded by previous builds."""
+        self._load_manifest()
+        return self.dependencies
+
+    def get_dependents(self, path: Path) -> List[str]:
+        """Get the sources of the pages affected by a change to a file.
+
+        Templates map to the pages rendered with them, content files to
+        themselves plus the pages listing site-wide data, and the config
+        file to every page.
+        """
+        graph = self.get_dependency_graph()
+        path = Path(path)
+
+        template_rel = self._relative_to(path, self.site.template_dir)
+        if template_rel is not None:
+            return graph.get_template_dependents(template_rel.as_posix())
+
+        source_rel = self._relative_to(path, self.site.source_dir)
+        if source_rel is not None:
+            return graph.get_source_dependents(str(source_rel))
+
+        if path.suffix == ".toml":
+            return graph.get_all_pages()
+        return []
+
+    @staticmethod
+    def _relative_to(path: Path, base: Optional[Path]) -> Optional[Path]:
+        """Get a path relative to a directory, or None if it is outside."""
+        if not base:
+            return None
+        try:
+            return path.resolve().relative_to(Path(base).resolve())
+        except ValueError:
+            return None
+
+    def _output_url(self, page: Page) -> str:
+        """Get the path a page is served at, relative to the site root."""
+        rel_path = self._relative_to(
+            Path(page.output_path), self.site.output_dir
+        )
+        if rel_path is None:
+            return page.url
+        return "/" + rel_path.as_posix()
+
+    def _prepare_manifest(self, incremental: bool) -> None:
+        """Load the build manifest and hash the site-wide build inputs."""
+        from .. import __version__
+
+        self._load_manifest()
+        if not incremental:
+            self.manifest.clear()
+
+        self.dependencies = DependencyGraph.from_manifest(
+            self.manifest, self.site.template_dir
+        )
+        self._build_hashes = {
+            "plugin_hash": hash_data([
+                (plugin.__class__.__name__, getattr(plugin, "config", None))
+                for plugin in self.plugins
+            ]),
+            "config_hash": hash_data([__version__, {
+                key: value for key, value in self.config.config.items()
+                if key not in BUILD_MODE_KEYS
+            }]),
+        }
+        self._site_hash = hash_data({
+            str(page.source_path): page.metadata
+            for page in self.site.get_all_pages()
+        })
+
+    def _get_page_build_entry(self, page: Page) -> Dict[str, Any]:
+        """Get the manifest entry describing the inputs of a page."""
+        dependencies = self.dependencies.get_page_dependencies(page.template)
+        entry = {
+            "content_hash": hash_data([page.content, page.metadata]),
+            **self._build_hashes,
+            "templates": dependencies["templates"],
+            "template_hash": self.dependencies.hash_templates(
+                dependencies["templates"]
+            ),
+            "data": dependencies["data"],
+            "output_path": str(page.output_path),
+        }
+        if "site" in dependencies["data"]:
+            entry["site_hash"] = self._site_hash
+        return entry
+
+    def _is_page_fresh(self, page: Page) -> bool:
+        """Check whether a page output is up to date with its inputs."""
+        if self.manifest is None or not page.output_path:
+            return False
+        return self.manifest.is_fresh(
+            str(page.source_path), self._get_page_build_entry(page)
+        )
+
+    def _record_page(self, page: Page) -> None:
+        """Record a freshly rendered page in the build manifest."""
+        if self.manifest is None:
+            return
+        source = str(page.source_path)
+        previous = self.manifest.get(source)
+        if previous and previous.get("output_path") != str(page.output_path):
+            self._remove_output(previous.get("output_path"))
+        entry = self._get_page_build_entry(page)
+        self.manifest.update(source, entry)
+        self.dependencies.record(source, entry)
+
+    def _remove_stale_outputs(self) -> None:
+        """Delete outputs whose source pages no longer exist."""
+        if self.manifest is None:
+            return
+        for source in self.manifest.sources():
+            if self.site.get_page(source) is None:
+                entry = self.manifest.remove(source)
+                self.dependencies.forget(source)
+                logger.info("Source removed, deleting output: %s", source)
+                self._remove_output(entry.get("output_path"))
+
+    def _remove_output(self, output_path: Optional[str]) -> None:
+        """Delete a generated file if it lives inside the output dir."""
+        if not output_path or not self.site.output_dir:
+            return
+        path = Path(output_path)
+        try:
+            path.resolve().relative_to(self.site.output_dir.resolve())
+        except ValueError:
+            logger.warning("Refusing to delete file outside output: %s", path)
+            return
+        if path.is_file():
+            path.unlink()
+        if self.output_digests is not None:
+            self.output_digests.forget(path)
+
+    def is_streaming(self) -> bool:
+        """Check whether pages are built in bounded-memory streaming mode.
+
+        With the ``streaming`` config key set, only page metadata stays in
+        memory; each body is read from disk right before the page is
+        rendered and dropped, together with its HTML, once it is written.
+        Templates can still list other pages through ``site``, but cannot
+        read their bodies.
+        """
+        return bool(self.config.get("streaming", False))
+
+    @contextmanager
+    def _page_content(self, page: Page) -> Iterator[None]:
+        """Keep a page body in memory for the block in streaming mode."""
+        if not self.is_streaming():
+            yield
+            return
+        page.load_content()
+        try:
+            yield
+        finally:
+            page.release_content()
+
+    def _check_page_fresh(self, page: Page) -> bool:
+        """Check a page's freshness, loading its body if needed."""
+        with self._page_content(page):
+            return self._is_page_fresh(page)
 
     def _process_pages(self) -> None:
-        """Process all pages in the site."""
+        """Process all pages in the site that need rendering."""
         pages = self.site.get_all_pages()
-        logger.info("Processing %d pages", len(pages))
+        workers = get_worker_count(self.config.get("workers", 1))
+        if self.profiler is not None and workers > 1:
+            # Worker engines are not profiled; keep every page visible
+            logger.info("Profiling: rendering pages sequentially")
+            workers = 1
+        if self.is_streaming() and workers <= 1:
+            with self._background_writes(pages):
+                self._process_pages_streaming(pages)
+            return
+
+        stale_pages = [
+            page for page in pages if not self._check_page_fresh(page)
+        ]
+        logger.info(
+            "Processing %d pages (%d up to date)",
+            len(stale_pages),
+            len(pages) - len(stale_pages)
+        )
+        pages = stale_pages
+
+        if workers > 1 and len(pages) > 1:
+            results = render_pages_parallel(
+                self,
+                pages,
+                workers,
+                self.config.get("render_backend", "process")
+            )
+            if results is not None:
+                for page, success in zip(pages, results):
+                    if success:
+                        with self._page_content(page):
+                            self._record_page(page)
+                return
+
+        with self._background_writes(pages):
+            for page in pages:
+                logger.debug("Processing page: %s", page.url)
+                with self._page_content(page):
+                    self._process_page(page)
+
+    @contextmanager
+    def _background_writes(self, pages: List[Page]) -> Iterator[None]:
+        """Write pages rendered in the block on a pool of threads.
+
+        The ``write_workers`` config key sets the pool size (4 by
+        default, 0 writes on the render thread). Output directories are
+        created up front, and pages whose file could not be written are
+        dropped from the manifest so the next build renders them again.
+        """
+        writer = None
+        if pages:
+            writer = create_writer(
+                self.config.get("write_workers", 4),
+                self.site.output_digests
+            )
+        if writer is None:
+            yield
+            return
+
+        writer.make_dirs(
+            page.output_path for page in pages if page.output_path
+        )
+        self.site.writer = writer
+        try:
+            yield
+        finally:
+            self.site.writer = None
+            writer.close()
+            stats = writer.get_stats()
+            logger.info(
+                "Wrote %d files (%d unchanged, %d bytes, "
+                "max queue depth %d)",
+                stats["files_written"],
+                stats["files_skipped"],
+                stats["bytes_written"],
+                stats["max_queue_depth"]
+            )
+            failed = {str(path) for path, _ in writer.errors}
+            for page in pages:
+                if str(page.output_path) in failed and self.manifest:
+                    self.manifest.remove(str(page.source_path))
+                    self.dependencies.forget(str(page.source_path))
+
+    def _process_pages_streaming(self, pages: List[Page]) -> None:
+        """Check and render pages one at a time, reading each body once."""
+        rendered = 0
         for page in pages:
-            logger.debug("Processing page: %s", page.url)
-            self._process_page(page)
+            with self._page_content(page):
+                if self._is_page_fresh(page):
+                    continue
+                logger.debug("Processing page: %s", page.url)
+                self._process_page(page)
+                rendered += 1
+        logger.info(
+            "Processed %d pages (%d up to date)",
+            rendered,
+            len(pages) - rendered
+        )
+
+    def _get_render_cache(self) -> Optional[RenderCache]:
+        """Get the Markdown render cache, unless disabled in config."""
+        if self.render_cache is None and self.config.get("render_cache", True):
+            from .. import __version__
 
-    def _process_page(self, page: Page) -> None:
-        """Process a single page."""
+            self.render_cache = RenderCache(
+                Path(self.config.get("cache_dir", ".cache")) / "render",
+                {**self._markdown_options, 'version': __version__},
+                self.config.get("render_cache_memory_size", 512),
+                self.config.get("render_cache_max_size", DEFAULT_MAX_SIZE)
+            )
+        return self.render_cache
+
+    def convert_markdown(self, content: str) -> str:
+        """Convert Markdown to HTML, reusing cached conversions."""
+        render_cache = self._get_render_cache()
+        if render_cache is None:
+            return self.markdown.convert(content)
+        return render_cache.convert(content, self.markdown.convert)
+
+    def _process_page(self, page: Page) -> bool:
+        """Process a single page, returning whether it was written."""
+        with self._profile(str(page.source_path), "page"):
+            return self._render_and_save_page(page)
+
+    def _render_and_save_page(self, page: Page) -> bool:
+        """Convert, render and write a page through the plugins."""
+        output = self._render_html(page)
+        if output is None:
+            return False
         try:
-            content = self.markdown.convert(page.content)
+            with self._profile("write", "step"):
+                self.site.save_page(page, output)
+            self._record_page(page)
+            return True
+        except Exception as e:
+            logger.error("Error processing page %s: %s", page.url, e)
+        return False
 
-            for plugin in self.plugins:
-                if hasattr(plugin, 'process_content'):
-                    plugin_name = (
-                        plugin.metadata.name if hasattr(plugin, 'metadata') 
-                        else plugin.__class__.__name__
-                    )
-                    logger.debug(
-                        "Processing content with plugin: %s",
-                        plugin_name
-                    )
-                    content = plugin.process_content(content)
+    def _render_html(self, page: Page) -> Optional[str]:
+        """Convert and render a page through the plugins."""
+        try:
+            with self._profile("markdown", "step"):
+                content = self.convert_markdown(page.content)
+            content = self.run_hooks("process_content", content)
 
             context = {
                 'content': content,
@@ -192,33 +865,30 @@ class Engine:
                 ),
             }
 
-            for plugin in self.plugins:
-                if hasattr(plugin, 'on_post_page'):
-                    plugin_name = (
-                        plugin.metadata.name if hasattr(plugin, 'metadata') 
-                        else plugin.__class__.__name__
-                    )
-                    logger.debug(
-                        "Processing page context with plugin: %s",
-                        plugin_name
-                    )
-                    context = plugin.on_post_page(context)
+            context = self.run_hooks("on_post_page", context)
 
             template = self.site.get_template(page.template)
             if template:
                 logger.debug("Rendering page with template: %s", page.template)
-                output = template.render(**context)
-                self.site.save_page(page, output)
-            else:
-                logger.error(
-                    "Template not found for page: %s", page.url
-                )
+                with self._profile("template", "step"):
+                    return template.render(**context)
+            logger.error(
+                "Template not found for page: %s", page.url
+            )
 
         except Exception as e:
             logger.error("Error processing page %s: %s", page.url, e)
+        return None
+
+    def _copy_static_files(self, incremental: bool = True) -> None:
+        """Copy static files to output directory.
 
-    def _copy_static_files(self) -> None:
-        """Copy static files to output directory."""
+        Files go through the asset pipeline: unchanged files are skipped
+        using the asset manifest and the rest are processed on
+        ``asset_workers`` threads (4 by default). ``static_link_mode``
+        set to ``hardlink`` or ``reflink`` links files that no plugin
+        rewrites instead of copying them.
+        """
         if not self.site.source_dir or not self.site.output_dir:
             logger.error(
                 "Cannot copy static files: source_dir=%s, output_dir=%s",
@@ -232,85 +902,56 @@ class Engine:
             logger.error("Static directory does not exist: %s", static_dir)
             return
 
-        logger.info(
+        logger.debug(
             "Copying static files from %s to %s",
             static_dir,
             self.site.output_dir
         )
-
         try:
-            for file_path in static_dir.rglob("*"):
-                if file_path.is_file():
-                    rel_path = file_path.relative_to(static_dir)
-                    output_path = self.site.output_dir / "static" / rel_path
-                    output_path.parent.mkdir(parents=True, exist_ok=True)
-
-                    logger.info(
-                        "Processing static file: %s -> %s",
-                        file_path,
-                        output_path
-                    )
-
-                    context = {
-                        "file_path": str(file_path),
-                        "output_path": str(output_path),
-                        "relative_path": str(rel_path)
-                    }
-
-                    for plugin in self.plugins:
-                        if hasattr(plugin, 'on_pre_asset'):
-                            plugin_name = (
-                                plugin.metadata.name if hasattr(plugin, 'metadata')
-                                else plugin.__class__.__name__
-                            )
-                            logger.info(
-                                "Running on_pre_asset hook for plugin %s on file %s",
-                                plugin_name,
-                                file_path
-                            )
-                            context = plugin.on_pre_asset(context)
-                            if "content" in context:
-                                logger.info(
-                                    "Plugin %s modified content for file %s",
-                                    plugin_name,
-                                    file_path
-                                )
-
-                    if "content" in context:
-                        logger.info(
-                            "Writing modified content to %s",
-                            output_path
-                        )
-                        with open(output_path, 'w', encoding='utf-8') as f:
-                            f.write(context["content"])
-                    else:
-                        logger.info(
-                            "Copying file %s to %s",
-                            file_path,
-                            output_path
-                        )
-                        shutil.copy2(file_path, output_path)
-
-                    for plugin in self.plugins:
-                        if hasattr(plugin, 'on_post_asset'):
-                            plugin_name = (
-                                plugin.metadata.name if hasattr(plugin, 'metadata')
-                                else plugin.__class__.__name__
-                            )
-                            logger.info(
-                                "Running on_post_asset hook for plugin %s on file %s",
-                                plugin_name,
-                                file_path
-                            )
-                            context = plugin.on_post_asset(context)
+            self._get_asset_pipeline(static_dir).run(incremental)
         except Exception as e:
             logger.error("Error copying static files: %s", e, exc_info=True)
 
+    def _get_asset_pipeline(self, static_dir: Path) -> AssetPipeline:
+        if self.asset_manifest is None:
+            cache_dir = Path(self.config.get("cache_dir", ".cache"))
+            self.asset_manifest = BuildManifest(
+                cache_dir / "asset_manifest.json"
+            )
+            self.asset_manifest.load()
+        return AssetPipeline(
+            self,
+            static_dir,
+            self.site.output_dir,
+            self.asset_manifest,
+            get_worker_count(self.config.get("asset_workers", 4)),
+            get_link_mode(self.config.get("static_link_mode", "copy")),
+            self.get_dispatch_table()
+        )
+
+    def _update_static_files(self, static_dir: Path,
+                             rel_paths: List[str]) -> List[str]:
+        """Process the given static files, returning those updated."""
+        try:
+            return self._get_asset_pipeline(static_dir).update(rel_paths)
+        except Exception as e:
+            logger.error("Error updating static files: %s", e, exc_info=True)
+            return []
+
     def clean(self) -> None:
         """Clean the build artifacts."""
         if self.site.output_dir and self.site.output_dir.exists():
             shutil.rmtree(self.site.output_dir)
         self._cache.clear()
+        if self.manifest is not None:
+            self.manifest.clear()
+            self.manifest.save()
+        if self.asset_manifest is not None:
+            self.asset_manifest.clear()
+            self.asset_manifest.save()
+        if self.output_digests is not None:
+            self.output_digests.clear()
+            self.output_digests.save()
         self.site.clear()
 
         for plugin in self.plugins:
@@ -323,7 +964,11 @@ class Engine:
         """
         try:
             default_language = self.config.get_default_language()
-            page = Page.from_file(file_path, default_lang=default_language)
+            page = Page.from_file(
+                file_path,
+                default_lang=default_language,
+                load_content=False
+            )
 
             if self.site.source_dir:
                 try:
@@ -349,9 +994,9 @@ class Engine:
         if not template_path.exists():
             raise ValueError(f"Template not found: {template_path}")
 
-        content_html = self.markdown.convert(page.content)
-        for plugin in self.plugins:
-            content_html = plugin.process_content(content_html)
+        content_html = self.run_hooks(
+            "process_content", self.convert_markdown(page.content)
+        )
 
         head_content = []
         for plugin in self.plugins:
@@ -379,6 +1024,11 @@ class Engine:
         }
         page.translations = {}
 
+        if self.site.template_dir:
+            return self.site.get_template_engine().render(
+                template_filename, context
+            )
+
         from staticflow.templates.engine import TemplateEngine
         engine = TemplateEngine(template_dir)
         return engine.render(template_filename, context)
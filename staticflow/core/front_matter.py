@@ -0,0 +1,134 @@
+from collections import OrderedDict
+from pathlib import Path
+import os
+import threading
+from typing import Any, Dict, Optional, Tuple
+import yaml
+
+
+# The C loader is several times faster; fall back to pure Python.
+YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+DELIMITER = "---"
+
+
+def parse_front_matter(text: str) -> Dict[str, Any]:
+    """Parse a YAML front matter block into a metadata dict."""
+    metadata = yaml.load(text, Loader=YamlLoader)
+    return metadata if isinstance(metadata, dict) else {}
+
+
+def locate_front_matter(path: Path, chunk_size: int = 4096
+                        ) -> Tuple[Optional[str], Optional[int]]:
+    """Read only the front matter block of a document and find its body.
+
+    The file is read in chunks until the closing delimiter is found, so
+    the body is never loaded. Returns the block, or None if the document
+    has no front matter, and the offset in characters at which the body
+    starts: 0 without front matter, None if the block is not closed.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        buffer = f.read(len(DELIMITER))
+        if buffer != DELIMITER:
+            return None, 0
+        start = len(DELIMITER)
+        while True:
+            end = buffer.find(DELIMITER, start)
+            if end != -1:
+                return buffer[len(DELIMITER):end], end + len(DELIMITER)
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return None, None
+            # Search again from the tail, a delimiter may span two chunks
+            start = max(len(DELIMITER), len(buffer) - len(DELIMITER) + 1)
+            buffer += chunk
+
+
+def read_front_matter(path: Path, chunk_size: int = 4096) -> Optional[str]:
+    """Read only the front matter block of a document.
+
+    Returns None if the document has no front matter.
+    """
+    return locate_front_matter(path, chunk_size)[0]
+
+
+class FrontMatterScanner:
+    """Reads page metadata without loading page bodies.
+
+    Results are cached by path and invalidated when the file's mtime or
+    size changes, so listing a large content directory repeatedly only
+    parses the files that changed.
+    """
+
+    def __init__(self, max_entries: int = 20000):
+        self.max_entries = max_entries
+        # Path -> (mtime_ns, size, metadata, body offset)
+        self._cache: "OrderedDict[str, Tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def scan(self, path: Path,
+             stat_result: Optional[os.stat_result] = None
+             ) -> Dict[str, Any]:
+        """Get the metadata of a document.
+
+        Raises ValueError if the front matter is not valid YAML.
+        """
+        return self.scan_document(path, stat_result)[0]
+
+    def scan_document(self, path: Path,
+                      stat_result: Optional[os.stat_result] = None
+                      ) -> Tuple[Dict[str, Any], Optional[int]]:
+        """Get the metadata of a document and the offset of its body.
+
+        The offset is the one returned by ``locate_front_matter``.
+        Raises ValueError if the front matter is not valid YAML.
+        """
+        if stat_result is None:
+            stat_result = os.stat(path)
+        key = str(path)
+        with self._lock:
+            cached = self._cache.get(key)
+            if (cached and cached[0] == stat_result.st_mtime_ns
+                    and cached[1] == stat_result.st_size):
+                self._cache.move_to_end(key)
+                return dict(cached[2]), cached[3]
+
+        front_matter, body_offset = locate_front_matter(path)
+        metadata: Dict[str, Any] = {}
+        if front_matter is not None:
+            try:
+                metadata = parse_front_matter(front_matter)
+            except yaml.YAMLError as e:
+                raise ValueError(f"Invalid front matter in {path}: {e}")
+
+        with self._lock:
+            self._cache[key] = (
+                stat_result.st_mtime_ns, stat_result.st_size, metadata,
+                body_offset
+            )
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return dict(metadata), body_offset
+
+    def clear(self) -> None:
+        """Forget every cached result."""
+        with self._lock:
+            self._cache.clear()
+
+
+_default_scanner = FrontMatterScanner()
+
+
+def scan_front_matter(path: Path,
+                      stat_result: Optional[os.stat_result] = None
+                      ) -> Dict[str, Any]:
+    """Get the metadata of a document using the shared scanner."""
+    return _default_scanner.scan(path, stat_result)
+
+
+def scan_document(path: Path,
+                  stat_result: Optional[os.stat_result] = None
+                  ) -> Tuple[Dict[str, Any], Optional[int]]:
+    """Get the metadata and body offset using the shared scanner."""
+    return _default_scanner.scan_document(path, stat_result)
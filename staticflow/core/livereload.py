@@ -0,0 +1,159 @@
+import asyncio
+import json
+import re
+from typing import Any, Dict, Optional, Set
+from aiohttp import WSCloseCode, web
+from ..utils.logging import get_logger
+
+
+logger = get_logger("core.livereload")
+
+SOCKET_PATH = "/__staticflow/livereload"
+SCRIPT_PATH = "/__staticflow/livereload.js"
+SCRIPT_TAG = f'<script src="{SCRIPT_PATH}"></script>'
+
+CLIENT_SCRIPT = """(function () {
+  var scheme = location.protocol === "https:" ? "wss://" : "ws://";
+  var url = scheme + location.host + "%(socket_path)s";
+  var connected = false;
+
+  function normalize(path) {
+    path = path.replace(/index\\.html$/, "").replace(/\\.html$/, "");
+    return path.replace(/\\/$/, "") || "/";
+  }
+
+  function swapStylesheet(path) {
+    var links = document.querySelectorAll('link[rel="stylesheet"]');
+    Array.prototype.forEach.call(links, function (link) {
+      var href = new URL(link.href, location.href);
+      if (href.origin !== location.origin || href.pathname !== path) {
+        return;
+      }
+      href.searchParams.set("livereload", Date.now());
+      var clone = link.cloneNode();
+      clone.href = href.href;
+      clone.onload = function () { link.remove(); };
+      link.after(clone);
+    });
+  }
+
+  function connect() {
+    var socket = new WebSocket(url);
+    socket.onopen = function () {
+      // The server restarted while we were away
+      if (connected) { location.reload(); }
+      connected = true;
+    };
+    socket.onmessage = function (event) {
+      var message = JSON.parse(event.data);
+      var here = normalize(location.pathname);
+      var changed = message.pages.some(function (page) {
+        return normalize(page) === here;
+      });
+      if (message.reload || changed) {
+        location.reload();
+        return;
+      }
+      message.css.forEach(swapStylesheet);
+    };
+    socket.onclose = function () { setTimeout(connect, 1000); };
+  }
+
+  connect();
+})();
+""" % {"socket_path": SOCKET_PATH}
+
+_BODY_END = re.compile(r"</body\s*>", re.IGNORECASE)
+
+
+def inject_script(html: str) -> str:
+    """Add the live reload client script to an HTML document."""
+    matches = list(_BODY_END.finditer(html))
+    if not matches:
+        return html + SCRIPT_TAG
+    position = matches[-1].start()
+    return html[:position] + SCRIPT_TAG + html[position:]
+
+
+def build_message(result: Dict[str, Any],
+                  static_url: str = "/static") -> Optional[Dict[str, Any]]:
+    """Turn the result of ``Engine.rebuild_paths`` into a notification.
+
+    Browsers showing one of the re-rendered pages reload it, changed
+    stylesheets are swapped in place and any other static file or a
+    full build reloads every page. Returns None when nothing changed.
+    """
+    static_url = static_url.rstrip("/")
+    css = []
+    reload = bool(result.get("full"))
+    for asset in result.get("assets", []):
+        if asset.endswith(".css"):
+            css.append(f"{static_url}/{asset}")
+        else:
+            reload = True
+    pages = list(result.get("urls", []))
+    if not (reload or pages or css):
+        return None
+    return {"reload": reload, "pages": pages, "css": css}
+
+
+class LiveReload:
+    """WebSocket endpoint telling open browser tabs what was rebuilt."""
+
+    def __init__(self):
+        self.sockets: Set[web.WebSocketResponse] = set()
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def setup(self, app: web.Application) -> None:
+        """Register the socket and client script routes on an app."""
+        app.router.add_get(SOCKET_PATH, self.handle_socket)
+        app.router.add_get(SCRIPT_PATH, self.handle_script)
+        app.on_startup.append(self._on_startup)
+        app.on_shutdown.append(self._on_shutdown)
+
+    async def _on_startup(self, app: web.Application) -> None:
+        self.loop = asyncio.get_running_loop()
+
+    async def _on_shutdown(self, app: web.Application) -> None:
+        for socket in list(self.sockets):
+            await socket.close(code=WSCloseCode.GOING_AWAY,
+                               message=b"Server shutdown")
+        self.sockets.clear()
+
+    async def handle_script(self, request: web.Request) -> web.Response:
+        """Serve the client script."""
+        return web.Response(text=CLIENT_SCRIPT,
+                            content_type="application/javascript")
+
+    async def handle_socket(self, request: web.Request):
+        """Keep a browser connection open until it goes away."""
+        socket = web.WebSocketResponse(heartbeat=30)
+        await socket.prepare(request)
+        self.sockets.add(socket)
+        try:
+            async for _ in socket:
+                pass
+        finally:
+            self.sockets.discard(socket)
+        return socket
+
+    async def send(self, message: Dict[str, Any]) -> None:
+        """Send a notification to every connected browser."""
+        data = json.dumps(message)
+        for socket in list(self.sockets):
+            try:
+                await socket.send_str(data)
+            except ConnectionError:
+                self.sockets.discard(socket)
+
+    def notify(self, message: Optional[Dict[str, Any]]) -> None:
+        """Send a notification from another thread, without waiting."""
+        if message is None or self.loop is None or not self.sockets:
+            return
+        logger.info(
+            "Live reload: %d page(s), %d stylesheet(s)%s",
+            len(message["pages"]),
+            len(message["css"]),
+            ", full reload" if message["reload"] else ""
+        )
+        asyncio.run_coroutine_threadsafe(self.send(message), self.loop)
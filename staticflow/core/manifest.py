@@ -0,0 +1,103 @@
+from pathlib import Path
+import hashlib
+import json
+import os
+from typing import Any, Dict, Iterable, Optional
+from ..utils.logging import get_logger
+
+
+logger = get_logger("core.manifest")
+
+
+def hash_text(text: str) -> str:
+    """Return a stable hex digest for a piece of text."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def hash_data(data: Any) -> str:
+    """Return a stable hex digest for JSON-like data."""
+    return hash_text(json.dumps(data, sort_keys=True, default=str))
+
+
+class BuildManifest:
+    """Persistent record of the inputs every output page was built from.
+
+    Each entry maps a page source path to the hashes of its content,
+    templates and plugin configuration plus the output path it produced,
+    so that the engine can skip pages whose inputs did not change.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._dirty = False
+
+    def load(self) -> None:
+        """Load entries from disk, starting empty on any error."""
+        self.entries = {}
+        self._dirty = False
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, OSError) as e:
+            logger.warning("Ignoring unreadable build manifest %s: %s",
+                           self.path, e)
+            return
+        if data.get("version") != self.VERSION:
+            logger.info("Build manifest version changed, starting fresh")
+            return
+        self.entries = data.get("pages", {})
+
+    def save(self) -> None:
+        """Write entries to disk atomically if anything changed."""
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"version": self.VERSION, "pages": self.entries},
+                f,
+                sort_keys=True
+            )
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+
+    def get(self, source: str) -> Optional[Dict[str, Any]]:
+        """Get the recorded entry for a source path."""
+        return self.entries.get(source)
+
+    def is_fresh(self, source: str, entry: Dict[str, Any]) -> bool:
+        """Check whether a source was already built from the same inputs."""
+        recorded = self.entries.get(source)
+        if recorded != entry:
+            return False
+        output_path = recorded.get("output_path")
+        return bool(output_path) and Path(output_path).exists()
+
+    def update(self, source: str, entry: Dict[str, Any]) -> None:
+        """Record the inputs a source was just built from."""
+        if self.entries.get(source) != entry:
+            self.entries[source] = entry
+            self._dirty = True
+
+    def remove(self, source: str) -> Optional[Dict[str, Any]]:
+        """Forget a source, returning its last entry."""
+        entry = self.entries.pop(source, None)
+        if entry is not None:
+            self._dirty = True
+        return entry
+
+    def clear(self) -> None:
+        """Forget every source."""
+        if self.entries:
+            self.entries = {}
+            self._dirty = True
+
+    def sources(self) -> Iterable[str]:
+        """Get all recorded source paths."""
+        return list(self.entries.keys())
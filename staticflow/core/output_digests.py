@@ -0,0 +1,246 @@
+from pathlib import Path
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Dict, Optional, Set
+from ..utils.files import break_link, lock_file, materialize
+from ..utils.logging import get_logger
+
+
+logger = get_logger("core.output_digests")
+
+
+def hash_bytes(data: bytes) -> str:
+    """Return the hex digest of a byte string."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_file(path: Path, chunk_size: int = 1 << 20) -> str:
+    """Return the hex digest of a file's bytes."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class OutputDigests:
+    """Persistent map of the digest of every generated output file.
+
+    Outputs are only written when their bytes differ from what is
+    already on disk, so unchanged files keep their mtime and deploy
+    tools that compare mtimes or checksums only see what really changed.
+    Each entry also records the size and mtime the file had after it was
+    written; a file that was touched since is compared byte for byte.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.files_written = 0
+        self.files_skipped = 0
+        self._dirty: Set[str] = set()
+        self._removed: Set[str] = set()
+        self._cleared = False
+        self._lock = threading.Lock()
+
+    def _read(self) -> Dict[str, Dict[str, Any]]:
+        """Read the entries stored on disk, empty on any error."""
+        if not self.path.exists():
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, OSError) as e:
+            logger.warning("Ignoring unreadable output digests %s: %s",
+                           self.path, e)
+            return {}
+        if data.get("version") != self.VERSION:
+            return {}
+        return data.get("files", {})
+
+    def load(self) -> None:
+        """Load entries from disk."""
+        with self._lock:
+            self.entries = self._read()
+            self._dirty.clear()
+            self._removed.clear()
+            self._cleared = False
+
+    def save(self) -> None:
+        """Write changed entries to disk atomically.
+
+        Entries are merged into the file on disk under a file lock, so
+        parallel build workers sharing the file do not drop each other's
+        updates.
+        """
+        with self._lock:
+            if not (self._dirty or self._removed or self._cleared):
+                return
+            with lock_file(self.path):
+                entries = {} if self._cleared else self._read()
+                for key in self._removed:
+                    entries.pop(key, None)
+                for key in self._dirty:
+                    if key in self.entries:
+                        entries[key] = self.entries[key]
+                tmp_path = self.path.with_suffix(
+                    f"{self.path.suffix}.{os.getpid()}."
+                    f"{threading.get_ident()}.tmp"
+                )
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump({"version": self.VERSION, "files": entries}, f,
+                              sort_keys=True)
+                os.replace(tmp_path, self.path)
+            self.entries = entries
+            self._dirty.clear()
+            self._removed.clear()
+            self._cleared = False
+
+    def _record(self, key: str, digest: str, stat_result: os.stat_result,
+                source: Optional[list] = None) -> None:
+        entry = {
+            "digest": digest,
+            "size": stat_result.st_size,
+            "mtime_ns": stat_result.st_mtime_ns,
+        }
+        if source is not None:
+            entry["source"] = source
+        with self._lock:
+            if self.entries.get(key) != entry:
+                self.entries[key] = entry
+                self._dirty.add(key)
+                self._removed.discard(key)
+
+    def _is_unchanged(self, path: Path, digest: str, size: int,
+                      source: Optional[list] = None) -> bool:
+        """Check whether a file already holds bytes with this digest."""
+        try:
+            stat_result = os.stat(path)
+        except OSError:
+            return False
+        if stat_result.st_size != size:
+            return False
+        key = str(path)
+        with self._lock:
+            entry = self.entries.get(key)
+        if (entry and entry["digest"] == digest
+                and entry["mtime_ns"] == stat_result.st_mtime_ns):
+            if source is not None and entry.get("source") != source:
+                self._record(key, digest, stat_result, source)
+            return True
+        # Unknown or touched since it was written; compare the bytes
+        try:
+            if hash_file(path) != digest:
+                return False
+        except OSError:
+            return False
+        self._record(key, digest, stat_result, source)
+        return True
+
+    def _count(self, written: bool) -> bool:
+        with self._lock:
+            if written:
+                self.files_written += 1
+            else:
+                self.files_skipped += 1
+        return written
+
+    def write_bytes(self, path: Path, data: bytes) -> bool:
+        """Write a file unless it already holds these bytes.
+
+        Returns True if the file was written.
+        """
+        path = Path(path)
+        digest = hash_bytes(data)
+        if self._is_unchanged(path, digest, len(data)):
+            return self._count(False)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        break_link(path)
+        with open(path, "wb") as f:
+            f.write(data)
+        self._record(str(path), digest, os.stat(path))
+        return self._count(True)
+
+    def write_text(self, path: Path, text: str) -> bool:
+        """Write a UTF-8 text file unless its content is unchanged."""
+        return self.write_bytes(path, text.encode("utf-8"))
+
+    def copy_file(self, source: Path, path: Path,
+                  mode: str = "copy") -> bool:
+        """Copy a file unless the target already holds the same bytes.
+
+        ``mode`` is a link mode of ``materialize``. A source whose size
+        and mtime match the last copy is not read again. Returns True if
+        the file was copied.
+        """
+        source = Path(source)
+        path = Path(path)
+        source_stat = os.stat(source)
+        signature = [source_stat.st_mtime_ns, source_stat.st_size, mode]
+        key = str(path)
+        with self._lock:
+            entry = self.entries.get(key)
+        recorded_mode = mode
+        if entry and entry.get("source"):
+            recorded = entry["source"]
+            recorded_mode = recorded[2] if len(recorded) > 2 else "copy"
+        if entry and entry.get("source") == signature:
+            try:
+                stat_result = os.stat(path)
+            except OSError:
+                stat_result = None
+            if (stat_result is not None
+                    and stat_result.st_size == entry["size"]
+                    and stat_result.st_mtime_ns == entry["mtime_ns"]):
+                return self._count(False)
+
+        digest = hash_file(source)
+        # A file copied in another mode is materialized again
+        if recorded_mode == mode and self._is_unchanged(
+                path, digest, source_stat.st_size, signature):
+            return self._count(False)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        materialize(source, path, mode)
+        self._record(key, digest, os.stat(path), signature)
+        return self._count(True)
+
+    def forget(self, path: Path) -> None:
+        """Drop the entry of a deleted output."""
+        key = str(path)
+        with self._lock:
+            if self.entries.pop(key, None) is not None:
+                self._removed.add(key)
+            self._dirty.discard(key)
+
+    def clear(self) -> None:
+        """Forget every output."""
+        with self._lock:
+            self.entries = {}
+            self._dirty.clear()
+            self._removed.clear()
+            self._cleared = True
+
+    def reset_stats(self) -> None:
+        """Reset the written and skipped counters."""
+        with self._lock:
+            self.files_written = 0
+            self.files_skipped = 0
+
+    def add_stats(self, files_written: int, files_skipped: int) -> None:
+        """Add the counters of writes made elsewhere, e.g. by a worker."""
+        with self._lock:
+            self.files_written += files_written
+            self.files_skipped += files_skipped
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get write statistics."""
+        with self._lock:
+            return {
+                "files": len(self.entries),
+                "files_written": self.files_written,
+                "files_skipped": self.files_skipped,
+            }
@@ -1,36 +1,145 @@
 from pathlib import Path
-from typing import Any, Dict, Optional, List
+from typing import Any, Dict, Optional, List, Tuple
 from datetime import datetime
 import yaml
 import os
+import threading
+import time
 import jinja2
+from .front_matter import DELIMITER, parse_front_matter, scan_document
 
+# Markdown parser shared by the pages of each thread
+_local = threading.local()
 
-class Page:
-    """Represents a single page in the static site."""
 
-    def __init__(self, source_path: Path, content: str, 
+class Page:
+    """Represents a single page in the static site.
+
+    Pages are slotted to keep per-page overhead low on large sites.
+    Metadata is parsed when the page is created, while the body of a page
+    loaded from a file can be dropped with ``release_content`` and is read
+    back from disk on first access to ``content``.
+    """
+
+    __slots__ = (
+        "source_path",
+        "file_path",
+        "metadata",
+        "output_path",
+        "rendered_content",
+        "default_lang",
+        "language",
+        "modified",
+        "_content",
+        "_body_offset",
+        "_created",
+        "_modified",
+        "_translations",
+        "_markdown_parser",
+    )
+
+    def __init__(self, source_path: Path, content: Optional[str],
                  metadata: Optional[Dict[str, Any]] = None,
-                 default_lang: str = "en"):
+                 default_lang: str = "en",
+                 file_path: Optional[Path] = None):
         self.source_path = source_path
-        self.content = content
+        self.file_path = file_path
+        self._content = content
+        self._body_offset: Optional[int] = None
         self.metadata = metadata or {}
         self.output_path: Optional[Path] = None
         self.rendered_content: Optional[str] = None
-        self.created_at = datetime.now()
-        self.modified_at = datetime.now()
+        self.modified: Optional[float] = None
+        self._created = time.time()
+        self._modified = self._created
+        self._translations: Optional[Dict[str, str]] = None
         self._markdown_parser = None
 
-        self.translations: Dict[str, str] = {}
         self.default_lang = default_lang
         self.language = self._determine_language()
 
+    @property
+    def content(self) -> Optional[str]:
+        """Get the page body, reading it from the source file if needed."""
+        if self._content is None and self.file_path is not None:
+            self.load_content()
+        return self._content
+
+    @content.setter
+    def content(self, value: Optional[str]) -> None:
+        self._content = value
+
+    @property
+    def content_loaded(self) -> bool:
+        """Check whether the page body is held in memory."""
+        return self._content is not None
+
+    def load_content(self) -> None:
+        """Read the page body from its source file.
+
+        The body is cut at the offset found when the front matter was
+        read, unless the file has changed since.
+        """
+        if self._content is None and self.file_path is not None:
+            raw_content = self.file_path.read_text(encoding="utf-8")
+            offset = self._body_offset
+            if offset is not None and self._body_starts_at(raw_content,
+                                                           offset):
+                body = raw_content[offset:]
+                self._content = body.strip() if offset else body
+            else:
+                _, self._content, self._body_offset = (
+                    self._split_front_matter(raw_content)
+                )
+
+    def release_content(self) -> None:
+        """Drop the page body and rendered HTML, keeping its metadata."""
+        self._content = None
+        self.rendered_content = None
+
+    @property
+    def created_at(self) -> datetime:
+        """Get the time the page was created."""
+        return datetime.fromtimestamp(self._created)
+
+    @created_at.setter
+    def created_at(self, value: datetime) -> None:
+        self._created = value.timestamp()
+
+    @property
+    def modified_at(self) -> datetime:
+        """Get the time the page was last changed."""
+        return datetime.fromtimestamp(self._modified)
+
+    @modified_at.setter
+    def modified_at(self, value: datetime) -> None:
+        self._modified = value.timestamp()
+
+    @property
+    def translations(self) -> Dict[str, str]:
+        """Get the translations of the page, created on first use."""
+        if self._translations is None:
+            self._translations = {}
+        return self._translations
+
+    @translations.setter
+    def translations(self, value: Dict[str, str]) -> None:
+        self._translations = value
+
     @property
     def markdown_parser(self):
-        if self._markdown_parser is None:
+        """Get the page parser, shared per thread unless one was set."""
+        if self._markdown_parser is not None:
+            return self._markdown_parser
+        parser = getattr(_local, "markdown_parser", None)
+        if parser is None:
             from staticflow.parsers import MarkdownParser
-            self._markdown_parser = MarkdownParser()
-        return self._markdown_parser
+            parser = _local.markdown_parser = MarkdownParser()
+        return parser
+
+    @markdown_parser.setter
+    def markdown_parser(self, parser) -> None:
+        self._markdown_parser = parser
 
     def _determine_language(self) -> str:
         """Determine page language from metadata or directory."""
@@ -46,33 +155,65 @@ class Page:
 
         return self.default_lang
 
-    @classmethod
-    def from_file(cls, path: Path, default_lang: str = "en") -> "Page":
-        """Create a Page instance from a file."""
-        if not path.exists():
-            raise FileNotFoundError(f"Page source not found: {path}")
-
-        content = ""
-        metadata = {}
-
-        raw_content = path.read_text(encoding="utf-8")
-
-        if raw_content.startswith("---"):
-            parts = raw_content.split("---", 2)
+    @staticmethod
+    def _split_front_matter(
+        raw_content: str
+    ) -> Tuple[Optional[str], str, Optional[int]]:
+        """Split a document into its front matter text and body.
+
+        Also returns the offset at which the body starts, as found by
+        ``locate_front_matter``.
+        """
+        if raw_content.startswith(DELIMITER):
+            parts = raw_content.split(DELIMITER, 2)
             if len(parts) >= 3:
+                offset = len(parts[1]) + 2 * len(DELIMITER)
+                return parts[1], parts[2].strip(), offset
+            return None, "", None
+        return None, raw_content, 0
+
+    @staticmethod
+    def _body_starts_at(raw_content: str, offset: int) -> bool:
+        """Check that a document's body still starts at ``offset``."""
+        if not raw_content.startswith(DELIMITER):
+            return offset == 0
+        end = raw_content.find(DELIMITER, len(DELIMITER))
+        return end != -1 and end + len(DELIMITER) == offset
+
+    @classmethod
+    def from_file(cls, path: Path, default_lang: str = "en",
+                  load_content: bool = True,
+                  stat_result: Optional[os.stat_result] = None) -> "Page":
+        """Create a Page instance from a file.
+
+        With ``load_content=False`` only the metadata is kept; the body is
+        read when ``content`` is first accessed. A ``stat_result`` already
+        taken by the caller saves another stat call.
+        """
+        if stat_result is None:
+            try:
+                stat_result = path.stat()
+            except FileNotFoundError:
+                raise FileNotFoundError(f"Page source not found: {path}")
+        if load_content:
+            raw_content = path.read_text(encoding="utf-8")
+            front_matter, content, body_offset = cls._split_front_matter(
+                raw_content
+            )
+            metadata = {}
+            if front_matter is not None:
                 try:
-                    metadata = yaml.safe_load(parts[1])
-                    part = parts[2]
-                    if isinstance(part, Path):
-                        part = str(part)
-                    content = part.strip()
+                    metadata = parse_front_matter(front_matter)
                 except yaml.YAMLError as e:
                     raise ValueError(f"Invalid front matter in {path}: {e}")
         else:
-            content = raw_content
+            # Only the front matter block is read, results are cached
+            metadata, body_offset = scan_document(path, stat_result)
+            content = None
 
-        page = cls(path, content, metadata, default_lang)
-        page.modified = path.stat().st_mtime
+        page = cls(path, content, metadata, default_lang, file_path=path)
+        page._body_offset = body_offset
+        page.modified = stat_result.st_mtime
         return page
 
     @property
@@ -108,12 +249,12 @@ class Page:
     def set_rendered_content(self, content: str) -> None:
         """Set the rendered content of the page."""
         self.rendered_content = content
-        self.modified_at = datetime.now()
+        self._modified = time.time()
 
     def update_metadata(self, metadata: Dict[str, Any]) -> None:
         """Update page metadata."""
         self.metadata.update(metadata)
-        self.modified_at = datetime.now()
+        self._modified = time.time()
 
     def get_translation_path(self, lang: str) -> Optional[Path]:
         """Get path to translation file for given language."""
@@ -0,0 +1,221 @@
+from concurrent.futures import (
+    BrokenExecutor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from dataclasses import dataclass, field
+from pathlib import Path
+import copy
+import os
+import pickle
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+from .config import Config
+from .page import Page
+from ..utils.logging import get_logger
+
+
+logger = get_logger("core.parallel")
+
+BACKENDS = ("process", "thread")
+
+# Per-worker engine; thread-local so the thread backend gets one per thread.
+_worker_state = threading.local()
+
+
+@dataclass
+class EngineSpec:
+    """Picklable description of an engine, used to clone it in workers.
+
+    Plugins are described by their class, config and instance state, so
+    a worker's plugins start out as configured as the engine's. Pages
+    are carried without their bodies; workers read the bodies of the
+    pages they render only.
+    """
+
+    config: Dict[str, Any]
+    source_dir: Optional[Path]
+    output_dir: Optional[Path]
+    template_dir: Optional[Path]
+    plugins: List[Tuple[type, Optional[Dict[str, Any]], Dict[str, Any]]] = (
+        field(default_factory=list)
+    )
+    pages: List[Page] = field(default_factory=list)
+
+    @classmethod
+    def from_engine(cls, engine) -> "EngineSpec":
+        """Describe an engine by its config, directories, plugins and pages."""
+        site = engine.site
+        return cls(
+            config=dict(engine.config.config),
+            source_dir=site.source_dir,
+            output_dir=site.output_dir,
+            template_dir=site.template_dir,
+            plugins=[
+                (plugin.__class__, getattr(plugin, "config", None),
+                 _plugin_state(plugin))
+                for plugin in engine.plugins
+            ],
+            pages=[_page_metadata(page) for page in site.get_all_pages()],
+        )
+
+    def create_engine(self):
+        """Create an engine equivalent to the described one.
+
+        The engine's pages are not set; see ``_init_worker``.
+        """
+        from .engine import Engine
+
+        config = Config()
+        config.config.update(self.config)
+        engine = Engine(config)
+        engine.initialize(self.source_dir, self.output_dir, self.template_dir)
+        for plugin_class, plugin_config, state in self.plugins:
+            plugin = plugin_class()
+            engine.add_plugin(plugin, plugin_config)
+            plugin.__dict__.update(copy.deepcopy(state))
+        return engine
+
+
+def _plugin_state(plugin) -> Dict[str, Any]:
+    """Get a plugin's instance state, without its engine."""
+    return {
+        name: value for name, value in vars(plugin).items()
+        if name != "engine"
+    }
+
+
+def _page_metadata(page: Page) -> Page:
+    """Copy a page without its body, unless it has no file to reload from."""
+    page = copy.copy(page)
+    page.metadata = dict(page.metadata)
+    if page.file_path is not None:
+        page.release_content()
+    return page
+
+
+def get_worker_count(value: Any) -> int:
+    """Resolve the ``workers`` config value to a number of workers."""
+    if value in (None, "", False):
+        return 1
+    if value in ("auto", 0):
+        return os.cpu_count() or 1
+    try:
+        return max(1, int(value))
+    except (TypeError, ValueError):
+        logger.warning("Invalid workers value %r, rendering sequentially",
+                       value)
+        return 1
+
+
+def _init_worker(spec: EngineSpec) -> None:
+    """Build the engine and set up the site once per worker.
+
+    Like a build, the worker runs the plugins' pre_build hooks before
+    the pages are added to its site.
+    """
+    engine = spec.create_engine()
+    engine._run_site_hooks("pre_build")
+    engine.site.pages = {
+        str(page.source_path): page for page in spec.pages
+    }
+    engine.get_output_digests()
+    _worker_state.engine = engine
+
+
+def _render_shard(
+    sources: List[str]
+) -> Tuple[List[bool], Dict, Tuple[int, int]]:
+    """Render a shard of pages in a worker.
+
+    Returns the success of each page, the plugin hook timings of the
+    shard and the numbers of outputs it wrote and skipped.
+    """
+    engine = _worker_state.engine
+    engine.hook_stats.reset()
+    output_digests = engine.output_digests
+    if output_digests is not None:
+        output_digests.reset_stats()
+    results = []
+    for source in sources:
+        page = engine.site.get_page(source)
+        if page is None:
+            logger.error("Worker could not find page: %s", source)
+            results.append(False)
+            continue
+        page.load_content()
+        try:
+            results.append(engine._process_page(page))
+        finally:
+            if page.file_path is not None:
+                page.release_content()
+    if engine.render_cache is not None:
+        engine.render_cache.flush()
+    outputs = (0, 0)
+    if output_digests is not None:
+        output_digests.save()
+        outputs = (output_digests.files_written, output_digests.files_skipped)
+    return results, engine.hook_stats.snapshot(), outputs
+
+
+def _shard(items: List[str], workers: int) -> List[List[str]]:
+    """Split items into contiguous shards, a few per worker."""
+    size = max(1, -(-len(items) // (workers * 4)))
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def render_pages_parallel(
+    engine,
+    pages: List[Page],
+    workers: int,
+    backend: str = "process"
+) -> Optional[List[bool]]:
+    """Render pages across a pool of workers.
+
+    Each worker owns an engine clone with its own Markdown instance and
+    template environment. Results are returned in the order of ``pages``,
+    or ``None`` if the pool could not be used and the caller should render
+    sequentially instead.
+    """
+    if backend not in BACKENDS:
+        logger.warning("Unknown render backend %r, using 'process'", backend)
+        backend = "process"
+
+    spec = EngineSpec.from_engine(engine)
+    if backend == "process":
+        try:
+            pickle.dumps(spec)
+        except Exception as e:
+            logger.warning(
+                "Engine cannot be sent to worker processes (%s), "
+                "rendering sequentially", e
+            )
+            return None
+
+    sources = [str(page.source_path) for page in pages]
+    executor_class = (
+        ProcessPoolExecutor if backend == "process" else ThreadPoolExecutor
+    )
+    logger.info(
+        "Rendering %d pages with %d %s workers",
+        len(sources), workers, backend
+    )
+    try:
+        with executor_class(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(spec,)
+        ) as executor:
+            results: List[bool] = []
+            for shard_results, hook_timings, outputs in executor.map(
+                _render_shard, _shard(sources, workers)
+            ):
+                results.extend(shard_results)
+                engine.hook_stats.merge(hook_timings)
+                if engine.output_digests is not None:
+                    engine.output_digests.add_stats(*outputs)
+    except (BrokenExecutor, OSError, pickle.PicklingError) as e:
+        logger.warning("Parallel rendering failed (%s), "
+                       "rendering sequentially", e)
+        return None
+    return results
@@ -0,0 +1,135 @@
+from contextlib import contextmanager
+from pathlib import Path
+import json
+import os
+import sys
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional
+from ..utils.logging import get_logger
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+logger = get_logger("core.profiler")
+
+
+def get_peak_rss() -> Optional[int]:
+    """Get the peak resident set size of the process in KiB."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, Linux KiB
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+class BuildProfiler:
+    """Records wall time, CPU time and memory of build phases and pages.
+
+    The engine wraps each phase, page, plugin hook, template render and
+    write in a ``span``. Spans are kept as Chrome trace events, so the
+    file written by ``write_trace`` opens in chrome://tracing or
+    Perfetto, and ``summary`` aggregates them into the slowest phases,
+    pages and plugins. CPU time is process-wide and memory is the peak
+    RSS, so spans running on worker threads overlap.
+    """
+
+    def __init__(self):
+        self.events: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+        self._pid = os.getpid()
+
+    @contextmanager
+    def span(self, name: str, category: str = "phase",
+             **args: Any) -> Iterator[None]:
+        """Time the block as one event."""
+        start = time.perf_counter()
+        cpu_start = time.process_time()
+        rss_start = get_peak_rss()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            rss_end = get_peak_rss()
+            event = {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": round((start - self._origin) * 1e6, 1),
+                "dur": round((end - start) * 1e6, 1),
+                "pid": self._pid,
+                "tid": threading.get_ident(),
+                "args": {
+                    **args,
+                    "cpu_ms": round(
+                        (time.process_time() - cpu_start) * 1e3, 3
+                    ),
+                },
+            }
+            if rss_end is not None:
+                event["args"]["peak_rss_kb"] = rss_end
+                event["args"]["peak_rss_delta_kb"] = rss_end - rss_start
+            with self._lock:
+                self.events.append(event)
+
+    def totals(self, category: str) -> List[Dict[str, Any]]:
+        """Aggregate the events of a category by name, slowest first."""
+        totals: Dict[str, Dict[str, Any]] = {}
+        with self._lock:
+            events = [e for e in self.events if e["cat"] == category]
+        for event in events:
+            total = totals.setdefault(event["name"], {
+                "name": event["name"],
+                "calls": 0,
+                "wall_ms": 0.0,
+                "cpu_ms": 0.0,
+                "peak_rss_delta_kb": 0,
+            })
+            total["calls"] += 1
+            total["wall_ms"] += event["dur"] / 1e3
+            total["cpu_ms"] += event["args"]["cpu_ms"]
+            total["peak_rss_delta_kb"] += event["args"].get(
+                "peak_rss_delta_kb", 0
+            )
+        return sorted(
+            totals.values(), key=lambda total: total["wall_ms"], reverse=True
+        )
+
+    def summary(self, top: int = 10) -> Dict[str, Any]:
+        """Get the phases and the ``top`` slowest pages and plugins."""
+        with self._lock:
+            phases = [
+                {
+                    "name": e["name"],
+                    "wall_ms": e["dur"] / 1e3,
+                    "cpu_ms": e["args"]["cpu_ms"],
+                    "peak_rss_kb": e["args"].get("peak_rss_kb"),
+                }
+                for e in sorted(self.events, key=lambda e: e["ts"])
+                if e["cat"] == "phase"
+            ]
+        return {
+            "phases": phases,
+            "pages": self.totals("page")[:top],
+            "plugins": self.totals("plugin")[:top],
+            "steps": self.totals("step"),
+            "peak_rss_kb": get_peak_rss(),
+        }
+
+    def write_trace(self, path: Path, top: int = 10) -> None:
+        """Write the events as a Chrome trace with the summary attached."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            events = list(self.events)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({
+                "traceEvents": events,
+                "displayTimeUnit": "ms",
+                "summary": self.summary(top),
+            }, f, indent=1, default=str)
+        logger.info("Build profile written to %s", path)
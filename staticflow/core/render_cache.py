@@ -0,0 +1,79 @@
+from collections import OrderedDict
+from pathlib import Path
+import hashlib
+from typing import Any, Callable, Dict, Optional
+from ..parsers.cache import DEFAULT_MAX_SIZE, ParserCache
+from ..utils.logging import get_logger
+
+
+logger = get_logger("core.render_cache")
+
+
+class RenderCache:
+    """Content-addressed cache of Markdown to HTML conversions.
+
+    Entries are keyed on the Markdown source together with ``options``
+    (the extension list and configuration plus the StaticFlow version),
+    so any change to the converter invalidates them. A bounded LRU tier
+    in memory sits in front of a ParserCache on disk, which lets unchanged
+    pages skip conversion across builds and dev-server rebuilds.
+    """
+
+    def __init__(self, cache_dir: Path, options: Dict[str, Any],
+                 memory_size: int = 512,
+                 max_size: Optional[int] = DEFAULT_MAX_SIZE):
+        self.options = options
+        self.memory_size = memory_size
+        self.disk = ParserCache(str(cache_dir), max_size=max_size)
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _get_memory_key(self, source: str) -> str:
+        """Get the in-memory key of a source (options are per instance)."""
+        return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+    def get(self, source: str) -> Optional[str]:
+        """Get the cached HTML for a Markdown source."""
+        key = self._get_memory_key(source)
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return self._memory[key]
+
+        html = self.disk.get(source, self.options)
+        if html is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._remember(key, html)
+        return html
+
+    def set(self, source: str, html: str) -> None:
+        """Store the HTML converted from a Markdown source."""
+        self._remember(self._get_memory_key(source), html)
+        self.disk.set(source, self.options, html, ttl=None)
+
+    def _remember(self, key: str, html: str) -> None:
+        """Put an entry in the memory tier, evicting the oldest ones."""
+        self._memory[key] = html
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def convert(self, source: str, converter: Callable[[str], str]) -> str:
+        """Get the HTML for a source, converting and caching on a miss."""
+        html = self.get(source)
+        if html is None:
+            html = converter(source)
+            self.set(source, html)
+        return html
+
+    def flush(self) -> None:
+        """Write the disk tier's pending metadata."""
+        self.disk.flush()
+
+    def clear(self) -> None:
+        """Drop every cached conversion."""
+        self._memory.clear()
+        self.disk.invalidate()
@@ -0,0 +1,159 @@
+from dataclasses import dataclass
+from fnmatch import fnmatchcase
+from pathlib import Path
+import os
+from typing import Iterable, Iterator, List, Optional, Tuple
+from ..utils.logging import get_logger
+
+
+logger = get_logger("core.scanner")
+
+IGNORE_FILE = ".staticflowignore"
+
+CONTENT_EXTENSIONS = (".md", ".html")
+
+
+@dataclass
+class ContentFile:
+    """A content file found by the scanner, with its stat result."""
+
+    path: Path
+    rel_path: str
+    stat: os.stat_result
+
+    @property
+    def mtime_ns(self) -> int:
+        return self.stat.st_mtime_ns
+
+    @property
+    def size(self) -> int:
+        return self.stat.st_size
+
+
+def read_ignore_file(path: Path) -> List[str]:
+    """Read exclude patterns from an ignore file, skipping comments."""
+    try:
+        lines = path.read_text(encoding="utf-8").splitlines()
+    except OSError:
+        return []
+    return [
+        line.strip() for line in lines
+        if line.strip() and not line.strip().startswith("#")
+    ]
+
+
+class IgnoreRules:
+    """Glob exclude patterns in the style of .gitignore.
+
+    A pattern without a slash matches a file or directory name at any
+    depth, a pattern with a slash matches the path relative to the scan
+    root, and a trailing slash restricts a pattern to directories.
+    """
+
+    def __init__(self, patterns: Iterable[str] = ()):
+        self.rules: List[Tuple[str, bool, bool]] = []
+        for pattern in patterns:
+            self.add(pattern)
+
+    def add(self, pattern: str) -> None:
+        """Add one pattern."""
+        pattern = pattern.strip()
+        if not pattern or pattern.startswith("#"):
+            return
+        dir_only = pattern.endswith("/")
+        pattern = pattern.strip("/")
+        if pattern:
+            self.rules.append((pattern, "/" in pattern, dir_only))
+
+    def matches(self, rel_path: str, is_dir: bool = False) -> bool:
+        """Check whether a path relative to the root is excluded."""
+        name = rel_path.rsplit("/", 1)[-1]
+        for pattern, anchored, dir_only in self.rules:
+            if dir_only and not is_dir:
+                continue
+            if fnmatchcase(rel_path if anchored else name, pattern):
+                return True
+        return False
+
+    def __bool__(self) -> bool:
+        return bool(self.rules)
+
+
+class ContentScanner:
+    """Finds content files with os.scandir, one stat call per file.
+
+    Excluded directories are pruned without being listed. Exclude
+    patterns come from the ``exclude`` argument and from
+    ``.staticflowignore`` files in the scan root and the project root.
+    With ``extensions`` set to None every file is yielded.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        extensions: Optional[Tuple[str, ...]] = CONTENT_EXTENSIONS,
+        exclude: Optional[Iterable[str]] = None,
+        project_root: Optional[Path] = None
+    ):
+        self.root = Path(root)
+        self.extensions = (
+            tuple(extensions) if extensions is not None else None
+        )
+        self.ignore = IgnoreRules(exclude or ())
+        ignore_files = {self.root / IGNORE_FILE}
+        ignore_files.add(Path(project_root or Path.cwd()) / IGNORE_FILE)
+        for ignore_file in sorted(ignore_files):
+            for pattern in read_ignore_file(ignore_file):
+                self.ignore.add(pattern)
+
+    def accepts(self, rel_path: str) -> bool:
+        """Check whether ``scan`` would yield a file below the root."""
+        parts = rel_path.replace("\\", "/").strip("/").split("/")
+        if self.ignore:
+            for depth in range(1, len(parts)):
+                if self.ignore.matches("/".join(parts[:depth]), True):
+                    return False
+            if self.ignore.matches("/".join(parts)):
+                return False
+        return self.extensions is None or parts[-1].endswith(self.extensions)
+
+    def scan(self) -> Iterator[ContentFile]:
+        """Yield content files below the root as they are found."""
+        pending = [(self.root, "")]
+        while pending:
+            directory, prefix = pending.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    subdirs = []
+                    for entry in entries:
+                        rel_path = prefix + entry.name
+                        try:
+                            is_dir = entry.is_dir()
+                        except OSError:
+                            continue
+                        if self.ignore and self.ignore.matches(
+                                rel_path, is_dir):
+                            continue
+                        if is_dir:
+                            # Like os.walk, symlinked directories are not
+                            # followed; they may form cycles
+                            if not entry.is_symlink():
+                                subdirs.append(
+                                    (Path(entry.path), rel_path + "/")
+                                )
+                        elif (self.extensions is None
+                              or entry.name.endswith(self.extensions)):
+                            try:
+                                stat_result = entry.stat()
+                            except OSError as e:
+                                logger.warning("Cannot stat %s: %s",
+                                               entry.path, e)
+                                continue
+                            yield ContentFile(
+                                Path(entry.path), rel_path, stat_result
+                            )
+            except OSError as e:
+                logger.warning("Cannot scan %s: %s", directory, e)
+                continue
+            # Visit subdirectories in name order
+            pending.extend(sorted(subdirs, reverse=True))
@@ -1,3 +1,4 @@
+import asyncio
 from pathlib import Path
 from aiohttp import web
 import aiohttp_jinja2
@@ -5,6 +6,8 @@ import jinja2
 from rich.console import Console
 from rich.panel import Panel
 from ..core.engine import Engine
+from ..core.livereload import LiveReload, build_message, inject_script
+from ..core.watcher import SiteWatcher
 from ..admin import AdminPanel
 from ..plugins import initialize_plugins
 from ..utils.logging import get_logger
@@ -50,7 +53,7 @@ class Server:
     """StaticFlow server with optional development features."""
 
     def __init__(self, config, engine=None, host='localhost', port=8000, 
-                 dev_mode=False):
+                 dev_mode=False, watch=True, lazy=False):
         """
         Initialize the server.
 
@@ -60,11 +63,17 @@ class Server:
             host: Host to bind the server to
             port: Port to bind the server to
             dev_mode: Whether to enable development features
+            watch: Whether to rebuild on file changes in development mode
+            lazy: Whether to render pages when they are first requested
+                instead of serving a previous build (development mode)
         """
         self.config = config
         self.host = host
         self.port = port
         self.dev_mode = dev_mode
+        self.lazy = dev_mode and lazy
+        self.watcher = None
+        self.livereload = LiveReload() if dev_mode and watch else None
 
         if engine is None:
             self.engine = Engine(config)
@@ -123,6 +132,56 @@ class Server:
         self.setup_routes()
         self.setup_templates()
 
+        if dev_mode and watch:
+            self.setup_watcher()
+        if self.lazy:
+            self.app.on_startup.append(self._load_site)
+
+    def setup_watcher(self):
+        """Rebuild changed files while the development server runs."""
+        directories = [
+            self.engine.site.source_dir,
+            self.engine.site.template_dir,
+            Path(self.config.get('static_dir', 'static')),
+        ]
+        files = []
+        if self.config.config_path is not None:
+            files.append(self.config.config_path)
+        ignore = [Path(self.config.get('cache_dir', '.cache'))]
+        if self.engine.site.output_dir is not None:
+            ignore.append(self.engine.site.output_dir)
+
+        self.watcher = SiteWatcher(
+            directories,
+            self.rebuild,
+            files=files,
+            debounce=float(self.config.get('watch_debounce', 0.1)),
+            ignore=ignore
+        )
+        self.app.on_startup.append(self._start_watcher)
+        self.app.on_cleanup.append(self._stop_watcher)
+
+    def rebuild(self, paths):
+        """Rebuild changed files and tell open browser tabs about it."""
+        result = self.engine.rebuild_paths(paths, render=not self.lazy)
+        if self.livereload is not None:
+            static_url = '/' + str(
+                self.config.get('static_dir', 'static')
+            ).strip('/')
+            self.livereload.notify(build_message(result, static_url))
+        return result
+
+    async def _load_site(self, app):
+        await asyncio.get_running_loop().run_in_executor(
+            None, self.engine.load
+        )
+
+    async def _start_watcher(self, app):
+        self.watcher.start()
+
+    async def _stop_watcher(self, app):
+        self.watcher.stop()
+
     def setup_templates(self):
         """Setup Jinja2 templates."""
         template_dir = self.config.get('template_dir', 'templates')
@@ -183,6 +242,9 @@ class Server:
             
         self.app.router.add_static(media_dir, media_path)
 
+        if self.livereload is not None:
+            self.livereload.setup(self.app)
+
         # All other routes
         self.app.router.add_get('/{tail:.*}', self.handle_request)
 
@@ -210,6 +272,11 @@ class Server:
         if isinstance(path, Path):
             path = str(path)
 
+        if self.lazy:
+            html = await self.render_lazy(path)
+            if html is not None:
+                return self.html_response(html)
+
         file_path = output_path / path.lstrip('/')
 
         if not file_path.exists():
@@ -232,6 +299,9 @@ class Server:
         if not file_path.is_file():
             return web.Response(status=403, text="Forbidden")
 
+        if self.livereload is not None and file_path.suffix == ".html":
+            return self.html_response(file_path.read_text(encoding="utf-8"))
+
         content_type = "text/html"
         if str(file_path).endswith(".css"):
             content_type = "text/css"
@@ -243,6 +313,26 @@ class Server:
             headers={"Content-Type": content_type}
         )
 
+    async def render_lazy(self, path):
+        """Render the page served at a path, or its index page."""
+        loop = asyncio.get_running_loop()
+        candidates = [path]
+        if not path.endswith('.html'):
+            candidates.append(path.rstrip('/') + '/index.html')
+        for url in candidates:
+            html = await loop.run_in_executor(
+                None, self.engine.render_url, url
+            )
+            if html is not None:
+                return html
+        return None
+
+    def html_response(self, html):
+        """Build an HTML response, with live reload in development mode."""
+        if self.livereload is not None:
+            html = inject_script(html)
+        return web.Response(text=html, content_type="text/html")
+
     def run(self):
         """Run the server."""
         if self.dev_mode:
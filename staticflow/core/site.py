@@ -1,10 +1,14 @@
 from pathlib import Path
 import os
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional
 from .config import Config
+from .output_digests import OutputDigests
 from .page import Page
 from .router import Router
+from .scanner import ContentFile, ContentScanner
+from .writer import OutputWriter
 from ..plugins import initialize_plugins
+from ..templates.engine import TemplateEngine
 
 
 class Site:
@@ -17,6 +21,13 @@ class Site:
         self.output_dir: Optional[Path] = None
         self.template_dir: Optional[Path] = None
         self.pages: Dict[str, Page] = {}
+        self._template_engine: Optional[TemplateEngine] = None
+        # Set by the engine once the persistent content index is available
+        self.content_index = None
+        # Set by the engine while a build writes pages in the background
+        self.writer: Optional[OutputWriter] = None
+        # Set by the engine to skip writing outputs that did not change
+        self.output_digests: Optional[OutputDigests] = None
         self.languages = config.get_languages()
         self.default_language = config.get_default_language()
 
@@ -44,38 +55,74 @@ class Site:
         """Set directory paths for the site."""
         self.source_dir = source_dir
         self.output_dir = output_dir
+        if template_dir != self.template_dir:
+            self._template_engine = None
         self.template_dir = template_dir
 
-    def load_pages(self) -> None:
-        """Load all content pages from source directory."""
+    def load_pages(
+        self,
+        load_content: bool = True,
+        content_files: Optional[Iterable[ContentFile]] = None
+    ) -> None:
+        """Load all content pages from source directory.
+
+        With ``load_content=False`` only the metadata of each page is kept
+        in memory; bodies are read back from disk when they are used.
+        ``content_files`` are the results of an earlier ``scan_content``.
+        """
         if not self.source_dir:
             raise ValueError("Source directory not set")
 
         self.pages.clear()
 
-        for file_path in self._get_content_files():
-            self._load_page(file_path)
+        if content_files is None:
+            content_files = self.scan_content()
+        for content_file in content_files:
+            self._load_page(
+                content_file.path, load_content, content_file.stat
+            )
 
-    def _get_content_files(self) -> List[Path]:
-        """Get all content files from source directory."""
+    def scan_content(self) -> Iterator[ContentFile]:
+        """Yield content files with their stat results as they are found.
+
+        Paths matching the ``exclude`` config patterns or a
+        ``.staticflowignore`` file are skipped.
+        """
         if not self.source_dir:
-            return []
+            return iter(())
+        scanner = ContentScanner(
+            self.source_dir, exclude=self.config.get("exclude", [])
+        )
+        return scanner.scan()
+
+    def _iter_content_files(self) -> Iterator[Path]:
+        """Yield content files from source directory as they are found."""
+        for content_file in self.scan_content():
+            yield content_file.path
 
-        files = []
-        for root, _, filenames in os.walk(self.source_dir):
-            for filename in filenames:
-                if filename.endswith(('.md', '.html')):
-                    file_path = Path(root) / filename
-                    files.append(file_path)
-        return files
+    def _get_content_files(self) -> List[Path]:
+        """Get all content files from source directory."""
+        return list(self._iter_content_files())
 
-    def _load_page(self, file_path: Path) -> None:
+    def _load_page(self, file_path: Path, load_content: bool = True,
+                   stat_result: Optional[os.stat_result] = None) -> None:
         """Load a single page from file."""
+        page = self.create_page(file_path, load_content, stat_result)
+        self.pages[str(page.source_path)] = page
+
+    def create_page(self, file_path: Path, load_content: bool = True,
+                    stat_result: Optional[os.stat_result] = None) -> Page:
+        """Create a page for a content file without adding it to the site."""
         if not self.source_dir:
             raise ValueError("Source directory not set")
 
         rel_path = file_path.relative_to(self.source_dir)
-        page = Page.from_file(file_path, default_lang=self.default_language)
+        page = Page.from_file(
+            file_path,
+            default_lang=self.default_language,
+            load_content=load_content,
+            stat_result=stat_result
+        )
 
         if "language" not in page.metadata:
             if len(rel_path.parts) > 0:
@@ -97,7 +144,7 @@ class Site:
             output_path = self.generate_page_output_path(page)
             page.set_output_path(output_path)
 
-        self.pages[str(rel_path)] = page
+        return page
 
     def generate_page_output_path(self, page: Page) -> Path:
         """Generate output path for a page using router."""
@@ -241,6 +288,33 @@ class Site:
         path = path.lstrip("/")
         return f"{base_url}/{path}" if path else base_url
 
+    def get_template_engine(self) -> TemplateEngine:
+        """Get the template engine shared by every page of the site.
+
+        Compiled templates stay cached in memory for the lifetime of the
+        site; with ``template_bytecode_cache`` enabled (the default) their
+        bytecode is also kept under ``cache_dir`` between builds.
+        """
+        if not self.template_dir:
+            raise ValueError("Template directory not set")
+
+        if self._template_engine is None:
+            bytecode_cache_dir = None
+            if self.config.get("template_bytecode_cache", True):
+                bytecode_cache_dir = (
+                    Path(self.config.get("cache_dir", ".cache")) / "templates"
+                )
+            # Site templates have always been rendered without autoescaping
+            # or whitespace control; keep their output unchanged.
+            self._template_engine = TemplateEngine(
+                self.template_dir,
+                bytecode_cache_dir=bytecode_cache_dir,
+                autoescape=False,
+                trim_blocks=False,
+                lstrip_blocks=False
+            )
+        return self._template_engine
+
     def get_template(self, template_name: str):
         """Get a template by name."""
         if not self.template_dir:
@@ -251,11 +325,7 @@ class Site:
             return None
             
         try:
-            import jinja2
-            env = jinja2.Environment(
-                loader=jinja2.FileSystemLoader(str(self.template_dir))
-            )
-            return env.get_template(template_name)
+            return self.get_template_engine().get_template(template_name)
         except Exception as e:
             print(f"Error loading template {template_name}: {e}")
             return None
@@ -268,12 +338,19 @@ class Site:
         if not page.output_path:
             raise ValueError("Page output path not set")
             
-        # Создаем директории если их нет
-        page.output_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Сохраняем контент
-        with open(page.output_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+        if self.writer is not None:
+            # Запись выполняется в пуле потоков писателя
+            self.writer.write(page.output_path, content)
+        elif self.output_digests is not None:
+            # Неизмененный файл не перезаписывается
+            self.output_digests.write_text(page.output_path, content)
+        else:
+            # Создаем директории если их нет
+            page.output_path.parent.mkdir(parents=True, exist_ok=True)
+
+            # Сохраняем контент
+            with open(page.output_path, 'w', encoding='utf-8') as f:
+                f.write(content)
             
         # Устанавливаем отрендеренный контент
         page.set_rendered_content(content)
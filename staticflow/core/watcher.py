@@ -0,0 +1,165 @@
+from pathlib import Path
+import threading
+import time
+from typing import Callable, Iterable, List, Optional, Set
+from watchdog.events import FileSystemEventHandler
+from watchdog.observers import Observer
+from ..utils.logging import get_logger
+
+
+logger = get_logger("core.watcher")
+
+# Files written by editors while saving, never worth a rebuild
+IGNORED_SUFFIXES = (".swp", ".swx", ".swo", ".tmp", ".part", "~")
+IGNORED_NAMES = {"4913", ".DS_Store"}
+
+
+def is_ignored(path: Path) -> bool:
+    """Check whether a changed file is an editor or system temp file."""
+    name = path.name
+    return (
+        name in IGNORED_NAMES
+        or name.endswith(IGNORED_SUFFIXES)
+        or name.startswith(".#")
+    )
+
+
+class _EventHandler(FileSystemEventHandler):
+    """Forwards the paths of watchdog events to a watcher."""
+
+    def __init__(self, watcher: "SiteWatcher"):
+        super().__init__()
+        self.watcher = watcher
+
+    def on_any_event(self, event) -> None:
+        if event.event_type in ("opened", "closed_no_write"):
+            return
+        # A directory's mtime changes with every file saved in it
+        if event.is_directory and event.event_type == "modified":
+            return
+        paths = [event.src_path]
+        dest_path = getattr(event, "dest_path", None)
+        if dest_path:
+            paths.append(dest_path)
+        self.watcher.add_changes(Path(path) for path in paths)
+
+
+class SiteWatcher:
+    """Watches the site sources and reports debounced batches of changes.
+
+    Paths from filesystem events are collected until no new event has
+    arrived for ``debounce`` seconds (so a save that writes, renames and
+    touches a file counts once), then passed together to ``callback`` on
+    the watcher's own thread. A batch that arrives while the callback is
+    still running is delivered after it returns, never concurrently.
+    """
+
+    def __init__(
+        self,
+        directories: Iterable[Path],
+        callback: Callable[[List[Path]], None],
+        files: Iterable[Path] = (),
+        debounce: float = 0.1,
+        ignore: Iterable[Path] = ()
+    ):
+        self.directories = [Path(path) for path in directories]
+        self.files = [Path(path) for path in files]
+        self.callback = callback
+        self.debounce = debounce
+        self.ignore = [Path(path).resolve() for path in ignore]
+        self._roots = [path.resolve() for path in self.directories]
+        self._files = {path.resolve() for path in self.files}
+        self._pending: Set[Path] = set()
+        self._last_event = 0.0
+        self._condition = threading.Condition()
+        self._stopped = False
+        self._thread: Optional[threading.Thread] = None
+        self._observer = None
+
+    def _is_watched(self, path: Path) -> bool:
+        if is_ignored(path):
+            return False
+        resolved = path.resolve()
+        for ignored in self.ignore:
+            if resolved == ignored or ignored in resolved.parents:
+                return False
+        if resolved in self._files:
+            return True
+        return any(
+            resolved == root or root in resolved.parents
+            for root in self._roots
+        )
+
+    def add_changes(self, paths: Iterable[Path]) -> None:
+        """Queue changed paths; called from watchdog's thread."""
+        paths = {path for path in paths if self._is_watched(path)}
+        if not paths:
+            return
+        with self._condition:
+            self._pending.update(paths)
+            self._last_event = time.monotonic()
+            self._condition.notify()
+
+    def _next_batch(self) -> Optional[List[Path]]:
+        """Wait until changes have settled and take them."""
+        with self._condition:
+            while not self._stopped:
+                if not self._pending:
+                    self._condition.wait()
+                    continue
+                remaining = self._last_event + self.debounce - time.monotonic()
+                if remaining > 0:
+                    self._condition.wait(remaining)
+                    continue
+                batch = sorted(self._pending)
+                self._pending.clear()
+                return batch
+        return None
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            logger.info("Detected %d changed file(s)", len(batch))
+            try:
+                self.callback(batch)
+            except Exception as e:
+                logger.error("Error rebuilding after changes: %s", e,
+                             exc_info=True)
+
+    def start(self) -> None:
+        """Start watching in background threads."""
+        self._stopped = False
+        self._observer = Observer()
+        handler = _EventHandler(self)
+        for directory in self.directories:
+            if directory.is_dir():
+                self._observer.schedule(handler, str(directory),
+                                        recursive=True)
+        for parent in {file.parent for file in self.files}:
+            if parent.is_dir():
+                self._observer.schedule(handler, str(parent),
+                                        recursive=False)
+        self._observer.start()
+        self._thread = threading.Thread(
+            target=self._run, name="staticflow-watcher", daemon=True
+        )
+        self._thread.start()
+        logger.info(
+            "Watching %s for changes",
+            ", ".join(str(path) for path in self.directories + self.files)
+        )
+
+    def stop(self) -> None:
+        """Stop watching and wait for a running rebuild to finish."""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -0,0 +1,165 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from .output_digests import OutputDigests
+from ..utils.logging import get_logger
+
+
+logger = get_logger("core.writer")
+
+
+class OutputWriter:
+    """Writes output files on a bounded pool of threads.
+
+    Rendering hands finished pages to ``write`` and carries on while the
+    pool does the disk I/O. At most ``max_pending`` files wait in memory;
+    once that many are queued ``write`` blocks until one is done, so
+    memory stays bounded however fast pages are rendered. Directories are
+    created once, up front with ``make_dirs`` or on first use. With
+    ``digests`` set, files whose content did not change are left alone.
+    """
+
+    def __init__(self, workers: int = 4, max_pending: int = 64,
+                 digests: Optional[OutputDigests] = None):
+        self.workers = max(1, workers)
+        self.max_pending = max(1, max_pending)
+        self.digests = digests
+        self.files_written = 0
+        self.files_skipped = 0
+        self.bytes_written = 0
+        self.max_queue_depth = 0
+        self.errors: List[Tuple[Path, Exception]] = []
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.workers,
+            thread_name_prefix="staticflow-writer"
+        )
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._lock = threading.Lock()
+        self._created_dirs: Set[Path] = set()
+        self._pending: Dict[Path, Future] = {}
+
+    @property
+    def queue_depth(self) -> int:
+        """Get the number of files waiting to be written."""
+        with self._lock:
+            return len(self._pending)
+
+    def make_dirs(self, paths: Iterable[Path]) -> None:
+        """Create the parent directories of the given output files."""
+        for parent in sorted({Path(path).parent for path in paths}):
+            self._ensure_dir(parent)
+
+    def _ensure_dir(self, directory: Path) -> None:
+        if directory not in self._created_dirs:
+            directory.mkdir(parents=True, exist_ok=True)
+            self._created_dirs.add(directory)
+
+    def write(self, path: Path, content: str) -> None:
+        """Queue a file to be written, blocking while the queue is full."""
+        path = Path(path)
+        with self._lock:
+            previous = self._pending.get(path)
+        if previous is not None:
+            # Keep writes to the same file in order
+            previous.result()
+
+        self._slots.acquire()
+        try:
+            self._ensure_dir(path.parent)
+            future = self._executor.submit(self._write_file, path, content)
+        except BaseException:
+            self._slots.release()
+            raise
+        with self._lock:
+            self._pending[path] = future
+            self.max_queue_depth = max(
+                self.max_queue_depth, len(self._pending)
+            )
+        future.add_done_callback(
+            lambda done, path=path: self._on_done(path, done)
+        )
+
+    def _write_file(self, path: Path, content: str) -> Optional[int]:
+        """Write a file, returning its size or None if it was unchanged."""
+        if self.digests is not None:
+            if not self.digests.write_text(path, content):
+                return None
+            return len(content.encode('utf-8'))
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        return len(content.encode('utf-8'))
+
+    def _on_done(self, path: Path, future: Future) -> None:
+        with self._lock:
+            if self._pending.get(path) is future:
+                del self._pending[path]
+            error = future.exception()
+            if error is None:
+                size = future.result()
+                if size is None:
+                    self.files_skipped += 1
+                else:
+                    self.files_written += 1
+                    self.bytes_written += size
+            else:
+                logger.error("Error writing %s: %s", path, error)
+                self.errors.append((path, error))
+        self._slots.release()
+
+    def flush(self) -> None:
+        """Wait until every queued file is written."""
+        while True:
+            with self._lock:
+                futures = list(self._pending.values())
+            if not futures:
+                return
+            for future in futures:
+                try:
+                    future.result()
+                except Exception:
+                    # Recorded in errors by the done callback
+                    pass
+
+    def close(self) -> None:
+        """Write everything that is queued and stop the pool."""
+        self.flush()
+        self._executor.shutdown(wait=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get write statistics."""
+        with self._lock:
+            return {
+                'files_written': self.files_written,
+                'files_skipped': self.files_skipped,
+                'bytes_written': self.bytes_written,
+                'queue_depth': len(self._pending),
+                'max_queue_depth': self.max_queue_depth,
+                'errors': len(self.errors),
+            }
+
+    def __enter__(self) -> "OutputWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def create_writer(workers: Optional[int],
+                  digests: Optional[OutputDigests] = None
+                  ) -> Optional[OutputWriter]:
+    """Create a writer for the ``write_workers`` config value.
+
+    Returns None when writes should stay on the render thread.
+    """
+    try:
+        workers = int(workers if workers is not None else 4)
+    except (TypeError, ValueError):
+        logger.warning("Invalid write_workers value %r, writing "
+                       "synchronously", workers)
+        return None
+    if workers <= 0:
+        return None
+    return OutputWriter(
+        workers=workers, max_pending=workers * 16, digests=digests
+    )
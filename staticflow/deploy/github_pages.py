@@ -5,6 +5,7 @@ This module provides functionality to deploy StaticFlow sites to GitHub Pages.
 """
 
 import os
+import filecmp
 import json
 import shutil
 import subprocess
@@ -398,53 +399,19 @@ class GitHubPagesDeployer:
                     env=git_env
                 )
             
-            # Clean the working directory
-            logger.info("Cleaning working directory")
-            for item in temp_path.iterdir():
-                if item.name == ".git":
-                    continue
-                    
-                if item.is_dir():
-                    shutil.rmtree(item)
-                else:
-                    item.unlink()
-
-            logger.info(f"Copying site content from {self.site_path} to the repository")
+            logger.info(f"Applying site changes from {self.site_path} to the repository")
             repo_name = None
             if self.config.get("repo_url"):
                 repo_name = self.config["repo_url"].rstrip("/").split("/")[-1]
                 if repo_name.endswith('.git'):
                     repo_name = repo_name[:-4]
             output_items = list(self.site_path.iterdir())
-
-            def should_copy(item):
-                return item.name != "admin"
+            site_root = self.site_path
             if repo_name and len(output_items) == 1 and output_items[0].is_dir() and output_items[0].name == repo_name:
-                # Если output содержит только папку с именем репозитория, копируем её содержимое (кроме admin)
-                for item in output_items[0].iterdir():
-                    if not should_copy(item):
-                        continue
-                    if item.is_dir():
-                        shutil.copytree(
-                            item,
-                            temp_path / item.name,
-                            dirs_exist_ok=True
-                        )
-                    else:
-                        shutil.copy2(item, temp_path / item.name)
-            else:
-                for item in output_items:
-                    if not should_copy(item):
-                        continue
-                    if item.is_dir():
-                        shutil.copytree(
-                            item,
-                            temp_path / item.name,
-                            dirs_exist_ok=True
-                        )
-                    else:
-                        shutil.copy2(item, temp_path / item.name)
-            # --- END PATCH ---
+                # Если output содержит только папку с именем репозитория, публикуем её содержимое
+                site_root = output_items[0]
+            updated, removed = self._sync_site(site_root, temp_path)
+            logger.info(f"Site delta: {updated} files updated, {removed} removed")
             
             # Create CNAME file if specified
             if cname:
@@ -523,6 +490,49 @@ class GitHubPagesDeployer:
             logger.info("GitHub Pages deployment completed successfully")
             return True, "Successfully deployed to GitHub Pages"
     
+    def _sync_site(self, site_root: Path, repo_path: Path) -> Tuple[int, int]:
+        """
+        Apply the difference between the built site and the checked out branch
+
+        Only files whose content differs are copied and files that are no
+        longer in the site are deleted, so git works on the real delta
+        instead of every file of the site. The admin panel is not published.
+
+        Returns:
+            Tuple of (updated files, removed files)
+        """
+        expected = set()
+        updated = 0
+        for root, dirs, files in os.walk(site_root):
+            rel_root = Path(root).relative_to(site_root)
+            if rel_root == Path("."):
+                dirs[:] = [name for name in dirs if name != "admin"]
+            for name in files:
+                rel_path = rel_root / name
+                expected.add(rel_path)
+                source = site_root / rel_path
+                target = repo_path / rel_path
+                if target.is_file() and filecmp.cmp(source, target, shallow=False):
+                    continue
+                target.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copy2(source, target)
+                updated += 1
+
+        removed = 0
+        for root, dirs, files in os.walk(repo_path, topdown=False):
+            rel_root = Path(root).relative_to(repo_path)
+            if rel_root.parts and rel_root.parts[0] == ".git":
+                continue
+            for name in files:
+                if rel_root / name not in expected:
+                    os.unlink(Path(root) / name)
+                    removed += 1
+            for name in dirs:
+                directory = Path(root) / name
+                if name != ".git" and not any(directory.iterdir()):
+                    directory.rmdir()
+        return updated, removed
+
     def get_deployment_status(self) -> Dict[str, Any]:
         """
         Get the current deployment status
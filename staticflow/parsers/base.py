@@ -3,13 +3,13 @@ from typing import Any, Dict, Optional, List, Tuple
 import frontmatter
 from .validation import ContentValidator, ValidationLevel
 from .security import ContentSecurity
-from .cache import ParserCache
+from .cache import ParserCache, get_default_cache
 
 
 class ContentParser(ABC):
     """Базовый класс для парсеров контента."""
 
-    def __init__(self):
+    def __init__(self, cache: Optional[ParserCache] = None):
         self.options: Dict[str, Any] = {
             'syntax_highlight': True,
             'math_support': True,
@@ -30,7 +30,7 @@ class ContentParser(ABC):
         self.extensions: List[str] = []
         self.validator = ContentValidator()
         self.security = ContentSecurity()
-        self.cache = ParserCache()
+        self.cache = cache or get_default_cache()
 
     @abstractmethod
     def parse(self, content: str) -> str:
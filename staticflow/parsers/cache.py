@@ -1,40 +1,144 @@
 from typing import Any, Dict, Optional
+import atexit
 import hashlib
 import json
+import os
+import threading
 import time
+import weakref
 from pathlib import Path
 import pickle
+from ..utils.files import lock_file
+
+
+DEFAULT_CACHE_DIR = ".cache/parsers"
+
+# Максимальный размер кэша по умолчанию (байт)
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+
+_default_caches: Dict[str, "ParserCache"] = {}
+_live_caches: "weakref.WeakSet[ParserCache]" = weakref.WeakSet()
+_default_lock = threading.Lock()
 
 
 class ParserCache:
-    """Система кэширования для парсеров."""
+    """Система кэширования для парсеров.
 
-    def __init__(self, cache_dir: str = ".cache/parsers"):
+    Записи хранятся в отдельных файлах и пишутся атомарно (временный файл
+    и переименование). Метаданные держатся в памяти и сбрасываются на диск
+    вызовом flush() (раз за сборку, не чаще flush_interval секунд или при
+    выходе), а не при каждой записи. Размер кэша ограничен max_size байт:
+    при превышении удаляются давно не использованные записи. Счетчики
+    попаданий, промахов и объема ведутся на ходу, поэтому get_stats()
+    не обходит каталог.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = DEFAULT_CACHE_DIR,
+        max_size: Optional[int] = DEFAULT_MAX_SIZE,
+        flush_interval: Optional[float] = 30.0
+    ):
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         self.metadata_file = self.cache_dir / "metadata.json"
-        if not self.metadata_file.exists():
-            self.metadata_file.touch()
+        self.max_size = max_size
+        self.flush_interval = flush_interval
+        self.hits = 0
+        self.misses = 0
+        self.total_size = 0
+        self._lock = threading.RLock()
+        self._dirty_keys = set()
+        self._removed_keys = set()
+        self._cleared = False
+        self._last_flush = time.time()
         self.metadata = self._load_metadata()
+        with lock_file(self.metadata_file):
+            if not self.metadata_file.exists():
+                self._write_metadata()
+        _live_caches.add(self)
 
     def _load_metadata(self) -> Dict[str, Any]:
-        """Загружает метаданные кэша."""
+        """Загружает метаданные кэша в порядке последнего обращения."""
+        metadata = self._read_metadata()
+        ordered = dict(sorted(
+            metadata.items(),
+            key=lambda item: item[1].get(
+                'accessed', item[1].get('timestamp', 0)
+            )
+        ))
+        for key, data in ordered.items():
+            if 'size' not in data:
+                cache_path = self._get_cache_path(key)
+                data['size'] = (
+                    cache_path.stat().st_size if cache_path.exists() else 0
+                )
+        self.total_size = sum(data['size'] for data in ordered.values())
+        return ordered
+
+    def _read_metadata(self) -> Dict[str, Any]:
+        """Читает метаданные с диска."""
         if self.metadata_file.exists():
             try:
                 with open(self.metadata_file, 'r') as f:
-                    return json.load(f)
+                    data = json.load(f)
+                return data if isinstance(data, dict) else {}
             except (json.JSONDecodeError, IOError):
                 return {}
         return {}
 
-    def _save_metadata(self) -> None:
-        """Сохраняет метаданные кэша."""
-        with open(self.metadata_file, 'w') as f:
-            json.dump(self.metadata, f)
+    def _write_metadata(self) -> None:
+        """Атомарно записывает метаданные на диск."""
+        # Имя уникально для потока: рабочие потоки сборки сохраняют
+        # метаданные одновременно
+        tmp_path = self.metadata_file.with_name(
+            f"{self.metadata_file.name}.{os.getpid()}."
+            f"{threading.get_ident()}.tmp"
+        )
+        with open(tmp_path, 'w') as f:
+            json.dump(self.metadata, f, default=str)
+        os.replace(tmp_path, self.metadata_file)
+
+    def flush(self) -> None:
+        """Сбрасывает накопленные изменения метаданных на диск.
+
+        Изменения объединяются с текущим содержимым файла под файловой
+        блокировкой, поэтому несколько процессов могут использовать один
+        каталог кэша, не теряя записей друг друга.
+        """
+        with self._lock:
+            self._last_flush = time.time()
+            if not (self._dirty_keys or self._removed_keys or self._cleared):
+                return
+            with lock_file(self.metadata_file):
+                merged = {} if self._cleared else self._read_metadata()
+                for key in self._removed_keys:
+                    merged.pop(key, None)
+                for key in list(merged):
+                    if (key not in self.metadata
+                            and not self._get_cache_path(key).exists()):
+                        del merged[key]
+                for key in self._dirty_keys:
+                    if key in self.metadata:
+                        merged[key] = self.metadata[key]
+                for key, data in merged.items():
+                    if key not in self.metadata:
+                        self.metadata[key] = data
+                        self.total_size += data.get('size', 0)
+                self._dirty_keys.clear()
+                self._removed_keys.clear()
+                self._cleared = False
+                self._write_metadata()
+
+    def _maybe_flush(self) -> None:
+        """Сбрасывает метаданные, если прошло flush_interval секунд."""
+        if (self.flush_interval is not None
+                and time.time() - self._last_flush >= self.flush_interval):
+            self.flush()
 
     def _get_cache_key(self, content: str, options: Dict[str, Any]) -> str:
         """Генерирует ключ кэша на основе контента и опций."""
-        data = f"{content}{json.dumps(options, sort_keys=True)}"
+        data = f"{content}{json.dumps(options, sort_keys=True, default=str)}"
         return hashlib.md5(data.encode()).hexdigest()
 
     def _get_cache_path(self, key: str) -> Path:
@@ -44,84 +148,149 @@ class ParserCache:
     def get(self, content: str, options: Dict[str, Any]) -> Optional[Any]:
         """Получает данные из кэша."""
         key = self._get_cache_key(content, options)
-        cache_path = self._get_cache_path(key)
+        with self._lock:
+            data = self.metadata.get(key)
+            if data is None:
+                self.misses += 1
+                return None
 
-        if not cache_path.exists():
-            return None
+            # Проверка времени жизни кэша (ttl=None - бессрочно)
+            ttl = data['ttl']
+            if ttl is not None and time.time() - data['timestamp'] > ttl:
+                self._remove(key)
+                self.misses += 1
+                return None
 
-        if key not in self.metadata:
-            return None
-
-        # Проверка времени жизни кэша
-        cache_time = time.time() - self.metadata[key]['timestamp']
-        if cache_time > self.metadata[key]['ttl']:
-            self.invalidate(key)
-            return None
+            try:
+                with open(self._get_cache_path(key), 'rb') as f:
+                    value = pickle.load(f)
+            except (pickle.UnpicklingError, EOFError, IOError):
+                self._remove(key)
+                self.misses += 1
+                return None
 
-        try:
-            with open(cache_path, 'rb') as f:
-                return pickle.load(f)
-        except (pickle.UnpicklingError, IOError):
-            return None
+            # Перемещение записи в конец очереди LRU
+            del self.metadata[key]
+            data['accessed'] = time.time()
+            self.metadata[key] = data
+            self._dirty_keys.add(key)
+            self.hits += 1
+            return value
 
     def set(
         self,
         content: str,
         options: Dict[str, Any],
         value: Any,
-        ttl: int = 3600
+        ttl: Optional[int] = 3600
     ) -> None:
         """Сохраняет данные в кэш."""
         key = self._get_cache_key(content, options)
         cache_path = self._get_cache_path(key)
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
 
-        # Сохранение данных
-        with open(cache_path, 'wb') as f:
-            pickle.dump(value, f)
+        # Атомарная запись данных
+        tmp_path = cache_path.with_name(
+            f"{cache_path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        with open(tmp_path, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp_path, cache_path)
 
-        # Обновление метаданных
-        self.metadata[key] = {
-            'timestamp': time.time(),
-            'ttl': ttl,
-            'options': options
-        }
-        self._save_metadata()
+        with self._lock:
+            if key in self.metadata:
+                self.total_size -= self.metadata.pop(key).get('size', 0)
+            now = time.time()
+            self.metadata[key] = {
+                'timestamp': now,
+                'accessed': now,
+                'ttl': ttl,
+                'size': len(payload),
+                'options': options
+            }
+            self.total_size += len(payload)
+            self._dirty_keys.add(key)
+            self._removed_keys.discard(key)
+            self._evict()
+            self._maybe_flush()
+
+    def _evict(self) -> None:
+        """Удаляет давно не использованные записи сверх max_size."""
+        if self.max_size is None:
+            return
+        while self.total_size > self.max_size and len(self.metadata) > 1:
+            self._remove(next(iter(self.metadata)))
+
+    def _remove(self, key: str) -> None:
+        """Удаляет запись из кэша без записи метаданных."""
+        cache_path = self._get_cache_path(key)
+        if cache_path.exists():
+            cache_path.unlink()
+        data = self.metadata.pop(key, None)
+        if data is not None:
+            self.total_size -= data.get('size', 0)
+        self._dirty_keys.discard(key)
+        self._removed_keys.add(key)
 
     def invalidate(self, key: Optional[str] = None) -> None:
         """Инвалидирует кэш."""
-        if key:
-            # Инвалидация конкретного ключа
-            cache_path = self._get_cache_path(key)
-            if cache_path.exists():
-                cache_path.unlink()
-            if key in self.metadata:
-                del self.metadata[key]
-        else:
-            # Инвалидация всего кэша
-            for file in self.cache_dir.glob("*.pkl"):
-                file.unlink()
-            self.metadata.clear()
-        self._save_metadata()
+        with self._lock:
+            if key:
+                # Инвалидация конкретного ключа
+                self._remove(key)
+                self._maybe_flush()
+            else:
+                # Инвалидация всего кэша
+                for file in self.cache_dir.glob("*.pkl"):
+                    file.unlink()
+                self.metadata.clear()
+                self.total_size = 0
+                self._dirty_keys.clear()
+                self._removed_keys.clear()
+                self._cleared = True
+                self.flush()
 
     def cleanup(self) -> None:
         """Очищает устаревшие записи кэша."""
         current_time = time.time()
-        keys_to_remove = []
-
-        for key, data in self.metadata.items():
-            if current_time - data['timestamp'] > data['ttl']:
-                keys_to_remove.append(key)
-
-        for key in keys_to_remove:
-            self.invalidate(key)
+        with self._lock:
+            keys_to_remove = [
+                key for key, data in self.metadata.items()
+                if data['ttl'] is not None
+                and current_time - data['timestamp'] > data['ttl']
+            ]
+            for key in keys_to_remove:
+                self._remove(key)
+            self.flush()
 
     def get_stats(self) -> Dict[str, Any]:
         """Возвращает статистику кэша."""
-        total_size = sum(
-            f.stat().st_size for f in self.cache_dir.glob("*.pkl")
-        )
         return {
             'entries': len(self.metadata),
-            'total_size': total_size,
+            'total_size': self.total_size,
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
             'cache_dir': str(self.cache_dir)
-        } 
\ No newline at end of file
+        }
+
+
+def get_default_cache(cache_dir: str = DEFAULT_CACHE_DIR) -> ParserCache:
+    """Возвращает общий кэш парсеров для каталога."""
+    key = str(Path(cache_dir).resolve())
+    with _default_lock:
+        cache = _default_caches.get(key)
+        if cache is None:
+            cache = ParserCache(cache_dir)
+            _default_caches[key] = cache
+        return cache
+
+
+@atexit.register
+def _flush_all() -> None:
+    """Сбрасывает метаданные всех кэшей при завершении процесса."""
+    for cache in list(_live_caches):
+        try:
+            cache.flush()
+        except OSError:
+            pass
@@ -1,14 +1,16 @@
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from bs4 import BeautifulSoup
 from .base import ContentParser
+from .cache import ParserCache
 from staticflow.plugins.syntax_highlight import SyntaxHighlightPlugin
 
 
 class HTMLParser(ContentParser):
     """Парсер для HTML контента."""
 
-    def __init__(self, beautify: bool = True):
-        super().__init__()
+    def __init__(self, beautify: bool = True,
+                 cache: Optional[ParserCache] = None):
+        super().__init__(cache)
         self.beautify = beautify
         self.syntax_highlighter = SyntaxHighlightPlugin()
 
@@ -1,6 +1,7 @@
 from typing import Any, Dict, List, Optional, Union
 import markdown
 from .base import ContentParser
+from .cache import ParserCache
 from staticflow.plugins.syntax_highlight import SyntaxHighlightPlugin
 from .extensions.video import makeExtension as makeVideoExtension
 from .extensions.audio import makeExtension as makeAudioExtension
@@ -14,9 +15,10 @@ class MarkdownParser(ContentParser):
 
     def __init__(
         self,
-        extensions: Optional[List[Union[str, Any]]] = None
+        extensions: Optional[List[Union[str, Any]]] = None,
+        cache: Optional[ParserCache] = None
     ) -> None:
-        super().__init__()
+        super().__init__(cache)
         self.extensions: List[Union[str, Any]] = extensions or [
             'fenced_code',
             'tables',
@@ -1,10 +1,13 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 
 class Plugin(ABC):
     """Base class for all StaticFlow plugins."""
 
+    # Static file extensions passed to the asset hooks; None means all
+    asset_extensions: Optional[Tuple[str, ...]] = None
+
     def __init__(self, config: Optional[Dict[str, Any]] = None):
         self.config = config or {}
         self.engine = None
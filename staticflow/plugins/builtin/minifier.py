@@ -11,6 +11,8 @@ logger = logging.getLogger(__name__)
 
 class MinifierPlugin(Plugin):
     """Плагин для минификации контента."""
+
+    asset_extensions = (".css", ".js", ".mjs")
     
     @property
     def metadata(self) -> PluginMetadata:
@@ -62,7 +64,7 @@ class MinifierPlugin(Plugin):
                 new_size = len(content)
                 if new_size != original_size:
                     reduction = (1 - new_size / original_size) * 100
-                    logger.info(
+                    logger.debug(
                         "CSS file minified: %s (%d -> %d bytes, %.1f%% reduction)",
                         file_path,
                         original_size,
@@ -81,7 +83,7 @@ class MinifierPlugin(Plugin):
                 new_size = len(content)
                 if new_size != original_size:
                     reduction = (1 - new_size / original_size) * 100
-                    logger.info(
+                    logger.debug(
                         "JavaScript file minified: %s (%d -> %d bytes, %.1f%% "
                         "reduction)",
                         file_path,
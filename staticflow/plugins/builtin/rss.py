@@ -4,6 +4,9 @@ from typing import Dict, Any, List
 import xml.etree.ElementTree as ET
 from ..core.base import Plugin, PluginMetadata
 from ...core.page import Page
+from ...utils.logging import get_logger
+
+logger = get_logger("plugins.rss")
 
 
 class RSSPlugin(Plugin):
@@ -37,11 +40,28 @@ class RSSPlugin(Plugin):
     
     def post_build(self, site) -> None:
         """Генерирует RSS-ленту после сборки сайта."""
-        print("RSS Plugin: post_build called")
+        logger.debug("post_build called")
+        index = getattr(site, 'content_index', None)
+        if index is not None:
+            # Последние записи берем из индекса контента без перебора;
+            # записи незагруженных страниц пропускаются до отбора десяти
+            pages = []
+            for entry in index.iter_latest():
+                page = site.get_page(entry['path'])
+                if page is not None:
+                    pages.append(page)
+                    if len(pages) == 10:
+                        break
+            if pages:
+                rss = self._create_rss(pages, site)
+                self._save_rss(rss)
+                logger.info("Saved RSS feed from the content index")
+                return
+
         pages = site.get_all_pages()
-        print(f"RSS Plugin: found {len(pages)} pages")
+        logger.debug("Found %d pages", len(pages))
         if not pages:
-            print("RSS Plugin: no pages found")
+            logger.info("No pages found, RSS feed not written")
             return
             
         # Фильтруем только страницы с валидной датой публикации
@@ -49,7 +69,7 @@ class RSSPlugin(Plugin):
             p for p in pages 
             if 'date' in p.metadata and p.metadata['date'] is not None
         ]
-        print(f"RSS Plugin: {len(pages)} pages with valid date")
+        logger.debug("%d pages with a valid date", len(pages))
         
         # Сортируем по дате (новые первыми)
         pages.sort(
@@ -61,9 +81,9 @@ class RSSPlugin(Plugin):
         
         # Берем только 10 последних записей
         rss = self._create_rss(pages[:10], site)
-        print("RSS Plugin: created RSS structure")
+        logger.debug("Created RSS structure")
         self._save_rss(rss)
-        print("RSS Plugin: saved RSS feed")
+        logger.info("Saved RSS feed")
     
     def _create_rss(self, pages: List[Page], site) -> ET.Element:
         """Создает XML структуру RSS."""
@@ -88,11 +88,18 @@ class SEOPlugin(Plugin):
         
         for name, content in twitter_tags.items():
             if content:
-                meta = soup.new_tag('meta', name=name, content=content)
+                # name= совпадает с именем тега в new_tag, передаем через attrs
+                meta = soup.new_tag(
+                    'meta', attrs={'name': name, 'content': content}
+                )
                 head.append(meta)
     
     def _add_schema_markup(self, soup: BeautifulSoup, context: Dict[str, Any]) -> None:
         """Добавляет Schema.org разметку."""
+        head = soup.find('head')
+        if not head:
+            return
+
         schema = {
             "@context": "https://schema.org",
             "@type": "WebPage",
@@ -104,7 +111,7 @@ class SEOPlugin(Plugin):
         
         script = soup.new_tag('script', type='application/ld+json')
         script.string = str(schema)
-        soup.find('head').append(script)
+        head.append(script)
     
     def _optimize_headings(self, soup: BeautifulSoup) -> None:
         """Оптимизирует заголовки на странице."""
@@ -1,7 +1,7 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from enum import Enum, auto
-from typing import Any, Dict, List, Optional, Set, Type
+from typing import Any, Dict, List, Optional, Set, Tuple, Type
 import inspect
 
 
@@ -31,6 +31,9 @@ class PluginMetadata:
 
 class Plugin(ABC):
     """Базовый класс для плагинов."""
+
+    # Расширения статических файлов для хуков ресурсов; None - все файлы
+    asset_extensions: Optional[Tuple[str, ...]] = None
     
     def __init__(self):
         self.config: Dict[str, Any] = {}
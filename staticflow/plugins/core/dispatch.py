@@ -0,0 +1,72 @@
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List
+
+
+# Приоритет плагинов без метаданных, как у PluginMetadata по умолчанию
+DEFAULT_PRIORITY = 100
+
+# Хуки, которые вызывает движок при сборке
+HOOKS = (
+    "pre_build",
+    "process_content",
+    "on_post_page",
+    "on_pre_asset",
+    "on_post_asset",
+    "post_build",
+)
+
+
+def get_plugin_name(plugin: Any) -> str:
+    """Возвращает отображаемое имя плагина любого из базовых классов."""
+    if hasattr(plugin, 'metadata'):
+        return plugin.metadata.name
+    return plugin.__class__.__name__
+
+
+def get_plugin_priority(plugin: Any) -> int:
+    """Возвращает приоритет плагина (меньше = раньше)."""
+    if hasattr(plugin, 'metadata'):
+        return plugin.metadata.priority
+    return DEFAULT_PRIORITY
+
+
+@dataclass(frozen=True)
+class HookHandler:
+    """Обработчик хука: плагин и его связанный метод."""
+    plugin: Any
+    name: str
+    hook: str
+    func: Callable[[Any], Any]
+
+
+class DispatchTable:
+    """Упорядоченные списки обработчиков каждого хука.
+
+    Строится один раз на сборку для плагинов обеих базовых систем
+    (``plugins.base`` и ``plugins.core.base``): имена, приоритеты и
+    методы хуков определяются здесь, а не для каждой страницы.
+    Обработчики идут по ``PluginMetadata.priority``, при равном
+    приоритете - в порядке добавления плагинов. Отключенные плагины
+    (``enabled = False``) пропускаются.
+    """
+
+    def __init__(self, plugins: Iterable[Any]):
+        self.plugins: List[Any] = [
+            plugin for plugin in sorted(plugins, key=get_plugin_priority)
+            if getattr(plugin, 'enabled', True)
+        ]
+        self._handlers: Dict[str, List[HookHandler]] = {
+            hook: [] for hook in HOOKS
+        }
+        for plugin in self.plugins:
+            name = get_plugin_name(plugin)
+            for hook in HOOKS:
+                func = getattr(plugin, hook, None)
+                if callable(func):
+                    self._handlers[hook].append(
+                        HookHandler(plugin, name, hook, func)
+                    )
+
+    def get(self, hook: str) -> List[HookHandler]:
+        """Возвращает обработчики хука в порядке вызова."""
+        return self._handlers.get(hook, [])
@@ -1,8 +1,9 @@
 from pathlib import Path
-from typing import Dict, List, Optional, Type
+from typing import Any, Dict, List, Optional, Type
 import importlib.util
 import sys
 from .base import Plugin, PluginMetadata, HookType
+from .stats import HookStats
 
 
 class PluginManager:
@@ -12,6 +13,8 @@ class PluginManager:
         self.plugins: Dict[str, Plugin] = {}
         self.plugin_configs: Dict[str, dict] = {}
         self._load_order: List[str] = []
+        # Время и объем данных каждого хука каждого плагина
+        self.stats = HookStats()
     
     def load_plugin(self, plugin_class: Type[Plugin], config: Optional[dict] = None) -> None:
         """Загружает плагин из класса."""
@@ -91,8 +94,19 @@ class PluginManager:
         for name in self._load_order:
             plugin = self.plugins[name]
             if plugin.enabled and plugin.has_hook(hook_type):
-                context = plugin.execute_hook(hook_type, context)
+                context = self.stats.call(
+                    name,
+                    hook_type.name.lower(),
+                    lambda value, plugin=plugin: plugin.execute_hook(
+                        hook_type, value
+                    ),
+                    context
+                )
         return context
+
+    def get_hook_stats(self) -> List[Dict[str, Any]]:
+        """Возвращает статистику вызовов хуков, самые затратные первыми."""
+        return self.stats.summary()
     
     def get_plugin(self, name: str) -> Optional[Plugin]:
         """Получает плагин по имени."""
@@ -0,0 +1,156 @@
+from dataclasses import dataclass, field
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+
+# Число длительностей, хранимых на хук для оценки перцентилей
+MAX_SAMPLES = 1024
+
+
+def payload_size(value: Any) -> int:
+    """Возвращает размер в байтах контента на входе или выходе хука.
+
+    Строки измеряются напрямую, контексты - по ключу ``content``;
+    все остальное считается нулевым.
+    """
+    if isinstance(value, dict):
+        value = value.get("content")
+    if isinstance(value, str):
+        return len(value) if value.isascii() else len(value.encode("utf-8"))
+    if isinstance(value, bytes):
+        return len(value)
+    return 0
+
+
+@dataclass
+class HookTiming:
+    """Накопленная стоимость одного хука одного плагина."""
+
+    calls: int = 0
+    errors: int = 0
+    total: float = 0.0
+    max: float = 0.0
+    bytes_in: int = 0
+    bytes_out: int = 0
+    samples: List[float] = field(default_factory=list)
+
+    def add(self, seconds: float, bytes_in: int, bytes_out: int) -> None:
+        self.calls += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.bytes_in += bytes_in
+        self.bytes_out += bytes_out
+        # Reservoir sampling сохраняет равномерную выборку всех вызовов
+        if len(self.samples) < MAX_SAMPLES:
+            self.samples.append(seconds)
+        else:
+            index = random.randrange(self.calls)
+            if index < MAX_SAMPLES:
+                self.samples[index] = seconds
+
+    def merge(self, other: "HookTiming") -> None:
+        """Добавляет вызовы, записанные другим процессом или потоком."""
+        self.calls += other.calls
+        self.errors += other.errors
+        self.total += other.total
+        self.max = max(self.max, other.max)
+        self.bytes_in += other.bytes_in
+        self.bytes_out += other.bytes_out
+        self.samples.extend(other.samples)
+        if len(self.samples) > MAX_SAMPLES:
+            self.samples = random.sample(self.samples, MAX_SAMPLES)
+
+    def percentile(self, percent: float) -> float:
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, int(len(ordered) * percent / 100))
+        return ordered[index]
+
+
+class HookStats:
+    """Число вызовов, время и объем данных по плагинам и хукам.
+
+    ``call`` выполняет хук и записывает, сколько он длился и сколько
+    байт контента получил и вернул, чтобы по итогам сборки было видно,
+    какой плагин стоит отключить, если сборка идет медленно.
+    """
+
+    def __init__(self):
+        self._timings: Dict[Tuple[str, str], HookTiming] = {}
+        self._lock = threading.Lock()
+
+    def call(self, plugin: str, hook: str, func: Callable[[Any], Any],
+             value: Any) -> Any:
+        """Вызывает ``func(value)`` как хук ``hook`` плагина ``plugin``."""
+        bytes_in = payload_size(value)
+        start = time.perf_counter()
+        try:
+            result = func(value)
+        except Exception:
+            self.record(plugin, hook, time.perf_counter() - start,
+                        bytes_in, 0, error=True)
+            raise
+        self.record(plugin, hook, time.perf_counter() - start,
+                    bytes_in, payload_size(result))
+        return result
+
+    def record(self, plugin: str, hook: str, seconds: float,
+               bytes_in: int = 0, bytes_out: int = 0,
+               error: bool = False) -> None:
+        """Добавляет один вызов хука."""
+        with self._lock:
+            timing = self._timings.setdefault((plugin, hook), HookTiming())
+            timing.add(seconds, bytes_in, bytes_out)
+            if error:
+                timing.errors += 1
+
+    def snapshot(self) -> Dict[Tuple[str, str], HookTiming]:
+        """Возвращает копию замеров, например для передачи из воркера."""
+        with self._lock:
+            return {
+                key: HookTiming(
+                    timing.calls, timing.errors, timing.total, timing.max,
+                    timing.bytes_in, timing.bytes_out, list(timing.samples)
+                )
+                for key, timing in self._timings.items()
+            }
+
+    def merge(self, timings: Dict[Tuple[str, str], HookTiming]) -> None:
+        """Добавляет замеры, полученные из другого ``snapshot``."""
+        with self._lock:
+            for key, timing in timings.items():
+                self._timings.setdefault(key, HookTiming()).merge(timing)
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Возвращает статистику всех хуков, самые дорогие первыми."""
+        rows = []
+        with self._lock:
+            for (plugin, hook), timing in self._timings.items():
+                rows.append({
+                    "plugin": plugin,
+                    "hook": hook,
+                    "calls": timing.calls,
+                    "errors": timing.errors,
+                    "total_ms": timing.total * 1e3,
+                    "avg_ms": timing.total * 1e3 / timing.calls,
+                    "p95_ms": timing.percentile(95) * 1e3,
+                    "max_ms": timing.max * 1e3,
+                    "bytes_in": timing.bytes_in,
+                    "bytes_out": timing.bytes_out,
+                })
+        return sorted(rows, key=lambda row: row["total_ms"], reverse=True)
+
+    def get(self, plugin: str, hook: str) -> Dict[str, Any]:
+        """Возвращает статистику хука или {}, если хук не вызывался."""
+        for row in self.summary():
+            if row["plugin"] == plugin and row["hook"] == hook:
+                return row
+        return {}
+
+    def reset(self) -> None:
+        """Забывает все записанные вызовы."""
+        with self._lock:
+            self._timings.clear()
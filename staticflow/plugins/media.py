@@ -38,6 +38,12 @@ class MediaPlugin(Plugin):
     - Video thumbnail generation
     - Media metadata extraction
     """
+
+    asset_extensions = (
+        ".jpg", ".jpeg", ".png", ".gif", ".webp", ".bmp", ".tif", ".tiff",
+        ".mp4", ".webm", ".ogv", ".mov", ".avi", ".mkv",
+        ".mp3", ".ogg", ".oga", ".wav", ".flac", ".m4a", ".aac",
+    )
     
     @property
     def metadata(self) -> PluginMetadata:
@@ -144,7 +150,7 @@ class MediaPlugin(Plugin):
     def on_pre_asset(self, context: Dict[str, Any]) -> Dict[str, Any]:
         """Pre-asset hook: process media files before copying to output."""
         if "file_path" in context and self._is_media_file(context["file_path"]):
-            source_path = context["file_path"]
+            source_path = Path(context["file_path"])
             if self._is_image(source_path):
                 self._process_image(source_path)
             elif self._is_video(source_path) and self.config["process_videos"]:
@@ -529,8 +535,7 @@ class MediaPlugin(Plugin):
                             else:
                                 resized_img.save(output, format=output_format)
 
-                            with open(save_path, "wb") as f:
-                                f.write(output.getvalue())
+                            self._write_output(save_path, output.getvalue())
 
                         if rel_dir:
                             rel_path = (
@@ -561,7 +566,9 @@ class MediaPlugin(Plugin):
 
                     placeholder_filename = f"{base_name}-placeholder.webp"
                     placeholder_path = media_subdir / placeholder_filename
-                    placeholder.save(placeholder_path, format="WEBP", quality=30)
+                    with io.BytesIO() as output:
+                        placeholder.save(output, format="WEBP", quality=30)
+                        self._write_output(placeholder_path, output.getvalue())
 
                     if rel_dir:
                         placeholder_url = (
@@ -618,7 +625,7 @@ class MediaPlugin(Plugin):
 
             ext = source_path.suffix
             output_path = media_subdir / f"{base_name}{ext}"
-            shutil.copy2(source_path, output_path)
+            self._copy_output(source_path, output_path)
 
             if rel_dir:
                 rel_path = f"{base_url}/{self.config['output_dir']}/{rel_dir}/{base_name}{ext}"
@@ -657,7 +664,11 @@ class MediaPlugin(Plugin):
                                     (width, new_h), 
                                     Image.LANCZOS
                                 )
-                        thumbnail.save(thumbnail_path, format="WEBP", quality=85)
+                        with io.BytesIO() as output:
+                            thumbnail.save(output, format="WEBP", quality=85)
+                            self._write_output(
+                                thumbnail_path, output.getvalue()
+                            )
                         
                         # Add to result
                         if rel_dir:
@@ -722,7 +733,7 @@ class MediaPlugin(Plugin):
             # Copy audio to media directory
             ext = source_path.suffix
             output_path = media_subdir / f"{base_name}{ext}"
-            shutil.copy2(source_path, output_path)
+            self._copy_output(source_path, output_path)
             
             # Add to result
             if rel_dir:
@@ -739,6 +750,28 @@ class MediaPlugin(Plugin):
             print(f"Error processing audio {source_path}: {e}")
             return None
     
+    def _get_output_digests(self):
+        """Get the engine's digest map of generated files, if any."""
+        engine = getattr(self, "engine", None)
+        return getattr(engine, "output_digests", None)
+
+    def _write_output(self, path: Path, data: bytes) -> None:
+        """Write a media file unless it already holds the same bytes."""
+        digests = self._get_output_digests()
+        if digests is not None:
+            digests.write_bytes(path, data)
+        else:
+            with open(path, "wb") as f:
+                f.write(data)
+
+    def _copy_output(self, source_path: Path, output_path: Path) -> None:
+        """Copy a media file unless the copy is already up to date."""
+        digests = self._get_output_digests()
+        if digests is not None:
+            digests.copy_file(source_path, output_path)
+        else:
+            shutil.copy2(source_path, output_path)
+
     def _resize_and_crop(self, img: Image.Image, target_width: int, target_height: int) -> Image.Image:
         """Resize and crop an image to fit target dimensions while maintaining aspect ratio."""
         orig_width, orig_height = img.size
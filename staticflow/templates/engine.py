@@ -1,18 +1,40 @@
 from pathlib import Path
-from typing import Any, Dict
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from typing import Any, Dict, Optional
+from jinja2 import (
+    Environment,
+    FileSystemBytecodeCache,
+    FileSystemLoader,
+    select_autoescape,
+)
 
 
 class TemplateEngine:
-    """Движок шаблонизации на основе Jinja2."""
+    """Движок шаблонизации на основе Jinja2.
 
-    def __init__(self, templates_dir: Path):
+    Окружение живет столько же, сколько движок, поэтому скомпилированные
+    шаблоны кэшируются в памяти. Если задан ``bytecode_cache_dir``,
+    байткод шаблонов дополнительно сохраняется на диск и переживает
+    перезапуск сборки. ``env_options`` переопределяют параметры окружения.
+    """
+
+    def __init__(self, templates_dir: Path,
+                 bytecode_cache_dir: Optional[Path] = None,
+                 **env_options: Any):
         self.templates_dir = templates_dir
+        options: Dict[str, Any] = {
+            'autoescape': select_autoescape(['html', 'xml']),
+            'trim_blocks': True,
+            'lstrip_blocks': True,
+        }
+        options.update(env_options)
+        if bytecode_cache_dir:
+            Path(bytecode_cache_dir).mkdir(parents=True, exist_ok=True)
+            options['bytecode_cache'] = FileSystemBytecodeCache(
+                str(bytecode_cache_dir)
+            )
         self.env = Environment(
             loader=FileSystemLoader(str(templates_dir)),
-            autoescape=select_autoescape(['html', 'xml']),
-            trim_blocks=True,
-            lstrip_blocks=True
+            **options
         )
         self._setup_filters()
         self._setup_globals()
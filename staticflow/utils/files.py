@@ -0,0 +1,171 @@
+"""
+File materialization helpers for StaticFlow.
+
+Static files that no plugin changes can be placed in the output
+directory as hard links or copy-on-write reflinks instead of byte copies.
+Cache files that parallel build workers share are updated under a lock.
+"""
+
+from contextlib import contextmanager
+from pathlib import Path
+import errno
+import os
+import shutil
+from typing import Iterator, Tuple, Union
+from .logging import get_logger
+
+logger = get_logger("utils.files")
+
+# Ways of placing an unmodified file in the output directory
+LINK_MODES = ("copy", "hardlink", "reflink")
+
+# ioctl request number of FICLONE on Linux
+FICLONE = 0x40049409
+
+
+def get_link_mode(value) -> str:
+    """Validate the ``static_link_mode`` config value."""
+    mode = str(value or "copy").lower()
+    if mode not in LINK_MODES:
+        logger.warning("Unknown static_link_mode %r, copying files", value)
+        return "copy"
+    return mode
+
+
+def break_link(path: Union[str, Path]) -> None:
+    """Unlink a file that shares its data with another path.
+
+    Writing into a hard link would also change its source, so a linked
+    output is removed before it is replaced.
+    """
+    try:
+        if os.stat(path).st_nlink > 1:
+            os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+@contextmanager
+def lock_file(path: Union[str, Path]) -> Iterator[None]:
+    """Hold an exclusive lock on a file for the block.
+
+    The lock is taken on a ``.lock`` file next to ``path``, so the file
+    itself can be replaced while locked. It excludes other processes
+    and other open handles in this process. Where ``fcntl`` is not
+    available the block runs unlocked.
+    """
+    try:
+        import fcntl
+    except ImportError:
+        yield
+        return
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path.with_name(f"{path.name}.lock"), "a") as lock:
+        fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+
+
+def reflink(source: Union[str, Path], target: Union[str, Path]) -> None:
+    """Clone a file with a copy-on-write reflink.
+
+    Raises OSError if the file system or platform does not support it.
+    """
+    try:
+        import fcntl
+    except ImportError:
+        raise OSError(errno.EOPNOTSUPP, "Reflinks are not supported")
+    with open(source, "rb") as src:
+        with open(target, "wb") as dst:
+            try:
+                fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+            except OSError:
+                dst.close()
+                os.unlink(target)
+                raise
+    shutil.copystat(source, target)
+
+
+def materialize(source: Union[str, Path], target: Union[str, Path],
+                mode: str = "copy") -> str:
+    """Place a copy of a file at ``target``.
+
+    With ``hardlink`` or ``reflink`` the file is linked instead of
+    copied, falling back to a copy when the two paths are on different
+    devices or the file system cannot link. Returns the mode used.
+    """
+    if os.path.lexists(target):
+        os.unlink(target)
+    if mode == "hardlink":
+        try:
+            os.link(source, target)
+            return "hardlink"
+        except OSError as e:
+            logger.debug("Cannot hard link %s (%s), copying", source, e)
+    elif mode == "reflink":
+        try:
+            reflink(source, target)
+            return "reflink"
+        except OSError as e:
+            logger.debug("Cannot reflink %s (%s), copying", source, e)
+    shutil.copy2(source, target)
+    return "copy"
+
+
+def is_same_file(source: Union[str, Path], target: Union[str, Path]) -> bool:
+    """Check whether ``target`` is already an up-to-date copy of ``source``.
+
+    A hard link is always up to date; a copy or reflink is when its size
+    and mtime match, as ``materialize`` preserves the mtime.
+    """
+    try:
+        src = os.stat(source)
+        dst = os.stat(target)
+    except OSError:
+        return False
+    if (src.st_dev, src.st_ino) == (dst.st_dev, dst.st_ino):
+        return True
+    return (src.st_size == dst.st_size
+            and src.st_mtime_ns == dst.st_mtime_ns)
+
+
+def sync_tree(source_dir: Union[str, Path], target_dir: Union[str, Path],
+              mode: str = "copy") -> Tuple[int, int]:
+    """Make ``target_dir`` a copy of ``source_dir``.
+
+    Only files that are missing or differ are materialized and files
+    that no longer exist in the source are deleted, so an unchanged
+    tree costs one stat per file. Returns the number of updated and
+    removed files.
+    """
+    source_dir = Path(source_dir)
+    target_dir = Path(target_dir)
+    expected = set()
+    updated = 0
+    for root, _, files in os.walk(source_dir):
+        rel_root = Path(root).relative_to(source_dir)
+        (target_dir / rel_root).mkdir(parents=True, exist_ok=True)
+        for name in files:
+            rel_path = rel_root / name
+            expected.add(rel_path)
+            source = source_dir / rel_path
+            target = target_dir / rel_path
+            if not is_same_file(source, target):
+                materialize(source, target, mode)
+                updated += 1
+
+    removed = 0
+    for root, dirs, files in os.walk(target_dir, topdown=False):
+        rel_root = Path(root).relative_to(target_dir)
+        for name in files:
+            if rel_root / name not in expected:
+                os.unlink(Path(root) / name)
+                removed += 1
+        for name in dirs:
+            directory = Path(root) / name
+            if not any(directory.iterdir()):
+                directory.rmdir()
+    return updated, removed
@@ -0,0 +1,135 @@
+import asyncio
+import threading
+from pathlib import Path
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+from staticflow.admin import AdminPanel
+from staticflow.admin.builds import BuildQueue
+from staticflow.core.config import Config
+from staticflow.core.engine import Engine
+
+
+class BlockingBuild:
+    """Сборка, которая ждет разрешения на завершение."""
+
+    def __init__(self, fail=False):
+        self.calls = 0
+        self.paths = []
+        self.started = threading.Semaphore(0)
+        self.release = threading.Event()
+        self.fail = fail
+
+    def __call__(self, paths):
+        self.calls += 1
+        self.paths.append(paths)
+        self.started.release()
+        assert self.release.wait(5)
+        if self.fail:
+            raise RuntimeError("broken template")
+
+
+class TestBuildQueue:
+    """Тесты очереди сборок админки."""
+
+    def test_requests_during_build_are_coalesced(self):
+        """Сохранения во время сборки дают ровно одну следующую сборку."""
+        build = BlockingBuild()
+        queue = BuildQueue(build)
+        first = queue.request()
+        assert build.started.acquire(timeout=5)
+        second = queue.request()
+        third = queue.request()
+        assert second is third
+        assert second.requests == 2
+        assert queue.status()["running"]["id"] == first.id
+        assert queue.status()["pending"]["id"] == second.id
+
+        build.release.set()
+        assert second.future.result(5) is second
+        queue.shutdown()
+        assert build.calls == 2
+        assert first.status == second.status == "succeeded"
+        assert queue.status()["last"]["id"] == second.id
+
+    def test_paths_are_merged(self):
+        """Измененные файлы ожидающих запросов объединяются."""
+        build = BlockingBuild()
+        queue = BuildQueue(build)
+        queue.request(["content/a.md"])
+        assert build.started.acquire(timeout=5)
+        pending = queue.request(["content/b.md"])
+        queue.request(["content/c.md", "content/b.md"])
+        assert pending.paths == [
+            Path("content/b.md"), Path("content/c.md")
+        ]
+        assert queue.status()["pending"]["paths"] == [
+            "content/b.md", "content/c.md"
+        ]
+        queue.request()
+        assert pending.paths is None
+        build.release.set()
+        pending.future.result(5)
+        queue.shutdown()
+        assert build.paths == [[Path("content/a.md")], None]
+
+    def test_failed_build(self):
+        """Ошибка сборки сохраняется в ее статусе."""
+        build = BlockingBuild(fail=True)
+        build.release.set()
+        queue = BuildQueue(build)
+        result = queue.request().future.result(5)
+        queue.shutdown()
+        assert result.status == "failed"
+        assert result.error == "broken template"
+        assert queue.get(result.id) is result
+        assert queue.get(result.id + 1) is None
+
+
+class TestAdminBuilds:
+    """Тесты пересборки сайта из админки."""
+
+    @pytest.fixture
+    def admin(self, tmp_path, monkeypatch):
+        """Фикстура с админкой и проектом."""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "content").mkdir()
+        config_file = tmp_path / "config.toml"
+        config_file.write_text(
+            'site_name = "Test Site"\n'
+            'base_url = "http://example.com"\n'
+            'output_dir = "output"\n'
+        )
+        config = Config(config_file)
+        return AdminPanel(config, Engine(config))
+
+    def test_save_does_not_wait_for_build(self, admin):
+        """Сохранение отвечает сразу, статус сборки доступен через API."""
+        build = BlockingBuild()
+        admin.builds.build = build
+
+        async def scenario():
+            async with TestClient(TestServer(admin.app)) as client:
+                response = await client.post("/api/content", json={
+                    "path": "page.md",
+                    "content": "Body",
+                    "metadata": {"title": "Page"},
+                })
+                saved = await response.json()
+                status = await client.get(f"/api/builds/{saved['build_id']}")
+                running = (await status.json())["build"]["status"]
+                build.release.set()
+                await asyncio.wrap_future(
+                    admin.builds.get(saved["build_id"]).future
+                )
+                status = await client.get(f"/api/builds/{saved['build_id']}")
+                finished = (await status.json())["build"]["status"]
+                missing = await client.get("/api/builds/999")
+                return saved, running, finished, missing.status
+
+        saved, running, finished, missing = asyncio.run(scenario())
+        admin.builds.shutdown()
+        assert saved["success"]
+        assert running in ("queued", "running")
+        assert finished == "succeeded"
+        assert missing == 404
+        assert build.paths == [[Path("content/page.md")]]
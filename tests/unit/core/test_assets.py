@@ -0,0 +1,146 @@
+import os
+import threading
+import pytest
+from staticflow.core.assets import AssetPipeline
+from staticflow.core.manifest import BuildManifest
+
+
+class RecordingPlugin:
+    """Плагин, записывающий вызовы хуков ресурсов."""
+
+    asset_extensions = (".css",)
+
+    def __init__(self):
+        self.config = {"enabled": True}
+        self.calls = []
+        self.threads = set()
+
+    def on_pre_asset(self, context):
+        self.calls.append(context["relative_path"])
+        self.threads.add(threading.get_ident())
+        if context["relative_path"] == "broken.css":
+            raise RuntimeError("broken")
+        with open(context["file_path"], encoding="utf-8") as f:
+            context["content"] = f.read().replace(" ", "")
+        return context
+
+
+class FakeSite:
+    output_digests = None
+
+
+class FakeEngine:
+    """Минимальный движок для конвейера ресурсов."""
+
+    def __init__(self, plugins):
+        self.plugins = plugins
+        self.site = FakeSite()
+        self.removed = []
+
+    def run_plugin_hook(self, plugin, hook, value):
+        return getattr(plugin, hook)(value)
+
+    def call_hook(self, handler, value):
+        return handler.func(value)
+
+    def _remove_output(self, output_path):
+        self.removed.append(output_path)
+        os.remove(output_path)
+
+
+class TestAssetPipeline:
+    """Тесты для конвейера статических файлов."""
+
+    @pytest.fixture
+    def project(self, tmp_path):
+        static_dir = tmp_path / "static"
+        (static_dir / "css").mkdir(parents=True)
+        (static_dir / "css" / "main.css").write_text("body { color: red; }")
+        (static_dir / "app.js").write_text("var a = 1;")
+        (static_dir / "logo.txt").write_text("logo")
+        return tmp_path
+
+    def _pipeline(self, project, plugin, workers=1):
+        manifest = BuildManifest(project / ".cache" / "assets.json")
+        manifest.load()
+        return AssetPipeline(
+            FakeEngine([plugin]),
+            project / "static",
+            project / "output",
+            manifest,
+            workers
+        )
+
+    def test_dispatch_by_extension(self, project):
+        """Хуки вызываются только для объявленных расширений."""
+        plugin = RecordingPlugin()
+        stats = self._pipeline(project, plugin).run()
+        assert plugin.calls == ["css/main.css"]
+        output = project / "output" / "static"
+        assert (output / "css" / "main.css").read_text() == "body{color:red;}"
+        assert (output / "app.js").read_text() == "var a = 1;"
+        assert stats["processed"] == 3
+
+    def test_unchanged_assets_are_skipped(self, project):
+        """Неизмененные файлы не обрабатываются повторно."""
+        self._pipeline(project, RecordingPlugin()).run()
+        plugin = RecordingPlugin()
+        css = project / "static" / "css" / "main.css"
+        os.utime(css, ns=(1_000_000_000, 1_000_000_000))
+
+        stats = self._pipeline(project, plugin).run()
+        assert plugin.calls == []
+        assert stats["unchanged"] == 3
+
+        css.write_text("p { margin: 0; }")
+        stats = self._pipeline(project, plugin).run()
+        assert plugin.calls == ["css/main.css"]
+        assert stats["processed"] == 1
+
+    def test_full_build_processes_everything(self, project):
+        """Полная сборка игнорирует манифест ресурсов."""
+        self._pipeline(project, RecordingPlugin()).run()
+        plugin = RecordingPlugin()
+        self._pipeline(project, plugin).run(incremental=False)
+        assert plugin.calls == ["css/main.css"]
+
+    def test_removed_asset_deletes_output(self, project):
+        """Удаление исходного файла удаляет его копию."""
+        self._pipeline(project, RecordingPlugin()).run()
+        (project / "static" / "app.js").unlink()
+        stats = self._pipeline(project, RecordingPlugin()).run()
+        assert stats["removed"] == 1
+        assert not (project / "output" / "static" / "app.js").exists()
+
+    def test_errors_do_not_stop_pipeline(self, project):
+        """Ошибка в одном файле не прерывает обработку остальных."""
+        (project / "static" / "broken.css").write_text("a { }")
+        pipeline = self._pipeline(project, RecordingPlugin())
+        stats = pipeline.run()
+        assert stats["failed"] == 1
+        assert stats["processed"] == 3
+        assert pipeline.manifest.get("broken.css") is None
+
+    def test_parallel_workers(self, project):
+        """Файлы обрабатываются в пуле потоков."""
+        for i in range(20):
+            (project / "static" / f"style{i}.css").write_text(f"a {{ {i} }}")
+        plugin = RecordingPlugin()
+        stats = self._pipeline(project, plugin, workers=4).run()
+        assert stats["processed"] == 23
+        assert len(plugin.calls) == 21
+        assert threading.get_ident() not in plugin.threads
+        assert (project / "output" / "static" / "style7.css").read_text() == (
+            "a{7}"
+        )
+
+    def test_link_mode(self, project):
+        """Неизмененные плагинами файлы связываются жесткими ссылками."""
+        pipeline = self._pipeline(project, RecordingPlugin())
+        pipeline.link_mode = "hardlink"
+        pipeline.run()
+        output = project / "output" / "static"
+        assert os.path.samefile(project / "static" / "app.js",
+                                output / "app.js")
+        assert not os.path.samefile(project / "static" / "css" / "main.css",
+                                    output / "css" / "main.css")
@@ -104,4 +104,10 @@ class TestConfig:
         """Тест работы с путем к конфигурационному файлу."""
         assert config.config_path is None
         config.set("_config_path", Path("/test/path/config.toml"))
-        assert str(config.config_path).replace("\\", "/") == "/test/path/config.toml" 
\ No newline at end of file
+        assert str(config.config_path).replace("\\", "/") == "/test/path/config.toml" 
+
+    def test_load_records_path(self, temp_config_file):
+        """Загруженная конфигурация помнит путь к своему файлу."""
+        config = Config(temp_config_file)
+        assert config.config_path == temp_config_file
+        assert "_config_path" not in config.config
@@ -0,0 +1,123 @@
+import os
+import pytest
+from staticflow.core.config import Config
+from staticflow.core.content_index import ContentIndex
+from staticflow.core.site import Site
+
+
+class TestContentIndex:
+    """Тесты для индекса контента."""
+
+    @pytest.fixture
+    def site(self, tmp_path):
+        """Фикстура с сайтом из нескольких страниц."""
+        content = tmp_path / "content"
+        (content / "posts").mkdir(parents=True)
+        (content / "posts" / "old.md").write_text(
+            "---\ntitle: Old\ndate: 2024-01-01\ncategory: news\n"
+            "tags: [python, web]\n---\n\nOld post\n"
+        )
+        (content / "posts" / "new.md").write_text(
+            "---\ntitle: New\ndate: 2024-05-01\ncategory: news\n"
+            "tags: [python]\n---\n\nNew post\n"
+        )
+        (content / "about.md").write_text(
+            "---\ntitle: About\ncategory: info\n---\n\nAbout\n"
+        )
+        site = Site(Config())
+        site.set_directories(
+            content, tmp_path / "output", tmp_path / "templates"
+        )
+        return site
+
+    @pytest.fixture
+    def index(self, tmp_path):
+        """Фикстура для создания индекса."""
+        index = ContentIndex(tmp_path / ".cache" / "content_index.db")
+        yield index
+        index.close()
+
+    def test_update_indexes_pages(self, site, index):
+        """Все страницы попадают в индекс."""
+        assert index.update(site) == (3, 0)
+        entry = index.get(os.path.join("posts", "old.md"))
+        assert entry["title"] == "Old"
+        assert entry["date"] == "2024-01-01"
+        assert entry["tags"] == ["python", "web"]
+        assert entry["output_path"]
+        assert len(entry["hash"]) == 64
+
+    def test_queries(self, site, index):
+        """Запросы по дате, категории и тегу."""
+        index.update(site)
+        assert [e["title"] for e in index.latest(10)] == ["New", "Old"]
+        assert [e["title"] for e in index.latest(1)] == ["New"]
+        assert [e["title"] for e in index.by_category("info")] == ["About"]
+        assert sorted(e["title"] for e in index.by_tag("python")) == [
+            "New", "Old"
+        ]
+        assert [e["title"] for e in index.by_tag("web")] == ["Old"]
+
+    def test_latest_sorts_normalized_dates(self, site, index):
+        """Даты сравниваются как моменты времени, а не как строки."""
+        posts = site.source_dir / "posts"
+        (posts / "zoned.md").write_text(
+            '---\ntitle: Zoned\ndate: "2024-06-01 10:00:00+05:00"\n---\n'
+        )
+        (posts / "naive.md").write_text(
+            '---\ntitle: Naive\ndate: "2024-06-01T04:00:00"\n---\n'
+        )
+        (posts / "bad.md").write_text(
+            '---\ntitle: Bad\ndate: "June 2024"\n---\n'
+        )
+        index.update(site)
+        assert [e["title"] for e in index.latest(10)] == [
+            "Zoned", "Naive", "New", "Old"
+        ]
+
+    def test_iter_latest(self, site, index):
+        """Записи перебираются от новых к старым порциями."""
+        index.update(site)
+        assert [e["title"] for e in index.iter_latest(batch_size=1)] == [
+            "New", "Old"
+        ]
+
+    def test_old_schema_rebuilt(self, site, tmp_path):
+        """База старой схемы пересоздается."""
+        import sqlite3
+        db_path = tmp_path / "old.db"
+        conn = sqlite3.connect(str(db_path))
+        conn.execute("CREATE TABLE pages (path TEXT PRIMARY KEY)")
+        conn.close()
+        index = ContentIndex(db_path)
+        assert index.update(site) == (3, 0)
+        index.close()
+
+    def test_incremental_update(self, site, index):
+        """Повторное обновление перечитывает только измененные файлы."""
+        index.update(site)
+        assert index.update(site) == (0, 0)
+
+        about = site.source_dir / "about.md"
+        about.write_text("---\ntitle: About us\ncategory: info\n---\n\nMore\n")
+        stat = about.stat()
+        os.utime(about, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000))
+        (site.source_dir / "posts" / "old.md").unlink()
+
+        assert index.update(site) == (1, 1)
+        assert index.get("about.md")["title"] == "About us"
+        assert index.by_tag("web") == []
+
+    def test_persistent(self, site, index, tmp_path):
+        """Индекс сохраняется между запусками."""
+        index.update(site)
+        reopened = ContentIndex(tmp_path / ".cache" / "content_index.db")
+        assert reopened.update(site) == (0, 0)
+        assert len(reopened.all()) == 3
+        reopened.close()
+
+    def test_config_change_rebuilds(self, site, index):
+        """Изменение конфигурации перестраивает индекс."""
+        index.update(site)
+        site.config.set("base_url", "https://example.com")
+        assert index.update(site) == (3, 0)
@@ -0,0 +1,118 @@
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+import pytest
+from staticflow.core.cache import Cache
+
+
+def _write_entries(cache_dir, worker):
+    """Записать записи из отдельного процесса."""
+    cache = Cache(cache_dir)
+    with cache.batch():
+        for i in range(20):
+            cache.set(f"{worker}-{i}", i)
+    cache.close()
+    return worker
+
+
+class TestCache:
+    """Тесты для кэша на основе SQLite."""
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        """Фикстура для создания кэша."""
+        cache = Cache(tmp_path / "cache")
+        yield cache
+        cache.close()
+
+    def test_single_file_store(self, cache):
+        """Все записи хранятся в одном файле базы данных."""
+        cache.set("a", {"value": 1})
+        cache.set("b", [1, 2, 3])
+        assert cache.db_path.exists()
+        assert not list(cache.cache_dir.glob("*.pkl"))
+        assert cache.get("a") == {"value": 1}
+        assert cache.get("b") == [1, 2, 3]
+
+    def test_namespaces_and_delete(self, cache):
+        """Пространства имен изолированы, удаление работает."""
+        cache.set("key", "first", namespace="one")
+        cache.set("key", "second", namespace="two")
+        assert cache.get("key", namespace="one") == "first"
+        assert cache.get("key", namespace="two") == "second"
+        cache.delete("key", namespace="one")
+        assert cache.get("key", namespace="one") is None
+        assert cache.get("key", namespace="two") == "second"
+
+    def test_expiration(self, cache):
+        """Истекшие записи не возвращаются."""
+        cache.set("old", 1, expires=timedelta(seconds=-1))
+        cache.set("new", 2, expires=timedelta(hours=1))
+        assert cache.get("old") is None
+        assert cache.get("new") == 2
+
+    def test_clear_namespace(self, cache):
+        """Очистка пространства имен не затрагивает остальные."""
+        cache.set("a", 1, namespace="pages")
+        cache.set("b", 2, namespace="assets")
+        cache.clear("pages")
+        assert cache.get("a", namespace="pages") is None
+        assert cache.get("b", namespace="assets") == 2
+        cache.set("a", 3, namespace="pages")
+        assert cache.get("a", namespace="pages") == 3
+        cache.clear()
+        assert cache.get_stats()["entries"] == 0
+
+    def test_clear_namespace_visible_to_other_instance(self, cache):
+        """Очистка видна другим экземплярам того же кэша."""
+        cache.set("a", 1, namespace="pages")
+        other = Cache(cache.cache_dir)
+        cache.clear("pages")
+        assert other.get("a", namespace="pages") is None
+        other.close()
+
+    def test_batch_defers_writes(self, cache):
+        """Внутри batch записи буферизуются до выхода."""
+        other = Cache(cache.cache_dir)
+        with cache.batch():
+            cache.set("a", 1)
+            cache.set("b", 2)
+            assert cache.get("a") == 1
+            assert other.get("a") is None
+        assert other.get("a") == 1
+        assert other.get("b") == 2
+        other.close()
+
+    def test_lru_eviction(self, tmp_path):
+        """При превышении размера удаляются давно неиспользуемые записи."""
+        cache = Cache(tmp_path / "cache", max_size=2500)
+        cache.set("first", "x" * 1000)
+        cache.set("second", "x" * 1000)
+        assert cache.get("first") is not None
+        cache.set("third", "x" * 1000)
+        assert cache.get("second") is None
+        assert cache.get("first") is not None
+        assert cache.get("third") is not None
+        assert cache.get_stats()["total_size"] <= 2500
+        cache.close()
+
+    def test_stats(self, cache):
+        """Статистика учитывает записи, попадания и промахи."""
+        cache.set("a", 1)
+        cache.get("a")
+        cache.get("missing")
+        stats = cache.get_stats()
+        assert stats["entries"] == 1
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["total_size"] > 0
+
+    def test_concurrent_processes(self, tmp_path):
+        """Несколько процессов могут писать в один кэш."""
+        cache_dir = tmp_path / "cache"
+        Cache(cache_dir).close()
+        with ProcessPoolExecutor(max_workers=3) as executor:
+            list(executor.map(_write_entries, [cache_dir] * 3, range(3)))
+        cache = Cache(cache_dir)
+        assert cache.get_stats()["entries"] == 60
+        assert cache.get("2-19") == 19
+        cache.close()
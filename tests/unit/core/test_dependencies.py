@@ -0,0 +1,74 @@
+import pytest
+from staticflow.core.dependencies import DependencyGraph, ALL_TEMPLATES
+
+
+class TestDependencyGraph:
+    """Тесты для графа зависимостей страниц и шаблонов."""
+
+    @pytest.fixture
+    def template_dir(self, tmp_path):
+        """Фикстура с набором связанных шаблонов."""
+        templates = tmp_path / "templates"
+        templates.mkdir()
+        (templates / "base.html").write_text(
+            "{% include 'nav.html' %}{% block body %}{% endblock %}"
+        )
+        (templates / "nav.html").write_text("<nav></nav>")
+        (templates / "macros.html").write_text(
+            "{% macro item(x) %}{{ x }}{% endmacro %}"
+        )
+        (templates / "post.html").write_text(
+            "{% extends 'base.html' %}"
+            "{% from 'macros.html' import item %}"
+            "{% block body %}{{ page_content }}{% endblock %}"
+        )
+        (templates / "list.html").write_text(
+            "{% extends 'base.html' %}"
+            "{% block body %}{% for p in site.get_all_pages() %}"
+            "{{ p.title }}{% endfor %}{% endblock %}"
+        )
+        (templates / "dynamic.html").write_text(
+            "{% include page.partial %}"
+        )
+        return templates
+
+    @pytest.fixture
+    def graph(self, template_dir):
+        """Фикстура для создания графа."""
+        return DependencyGraph(template_dir)
+
+    def test_template_closure(self, graph):
+        """Шаблон зависит от extends, include и import."""
+        deps = graph.get_page_dependencies("post.html")
+        assert deps["templates"] == [
+            "base.html", "macros.html", "nav.html", "post.html"
+        ]
+        assert deps["data"] == []
+
+    def test_site_data_dependency(self, graph):
+        """Шаблон, читающий site, зависит от данных сайта."""
+        assert graph.get_page_dependencies("list.html")["data"] == ["site"]
+
+    def test_dynamic_include(self, graph):
+        """Динамический include зависит от всех шаблонов."""
+        deps = graph.get_page_dependencies("dynamic.html")
+        assert ALL_TEMPLATES in deps["templates"]
+
+    def test_dependents(self, graph):
+        """Тест поиска зависимых страниц."""
+        graph.record("a.md", graph.get_page_dependencies("post.html"))
+        graph.record("b.md", graph.get_page_dependencies("list.html"))
+        assert graph.get_template_dependents("base.html") == ["a.md", "b.md"]
+        assert graph.get_template_dependents("macros.html") == ["a.md"]
+        assert graph.get_source_dependents("c.md") == ["b.md", "c.md"]
+
+    def test_hash_templates_changes(self, graph, template_dir):
+        """Хеш меняется только при изменении зависимостей."""
+        names = graph.get_page_dependencies("post.html")["templates"]
+        before = graph.hash_templates(names)
+        (template_dir / "list.html").write_text("changed")
+        graph.reset()
+        assert graph.hash_templates(names) == before
+        (template_dir / "nav.html").write_text("changed")
+        graph.reset()
+        assert graph.hash_templates(names) != before
@@ -1,9 +1,11 @@
+import os
 import pytest
 from pathlib import Path
 from datetime import datetime
 from staticflow.core.engine import Engine
 from staticflow.core.config import Config
 from staticflow.core.page import Page
+from staticflow.core.profiler import BuildProfiler
 from staticflow.plugins.base import Plugin
 
 
@@ -30,6 +32,24 @@ class TestPlugin(Plugin):
         self.post_build_called = True
 
 
+class MarkerPlugin(Plugin):
+    """Плагин, помечающий страницы своей конфигурацией и состоянием."""
+
+    def initialize(self):
+        """Инициализация плагина."""
+        self.marker = ""
+        self.builds = 0
+
+    def process_content(self, content: str) -> str:
+        """Добавляет к контенту метку, значение из состояния и число сборок."""
+        return (f"{content}\n<!-- {self.config['label']} {self.marker} "
+                f"{self.builds} -->")
+
+    def pre_build(self, site):
+        """Считает запуски хука."""
+        self.builds += 1
+
+
 class TestEngine:
     """Тесты для класса Engine."""
 
@@ -184,4 +204,402 @@ This is a test page content.
         page = engine.load_page_from_file(page_file)
         assert isinstance(page, Page)
         assert page.metadata["title"] == "Test Page"
-        assert "Test Content" in page.content
\ No newline at end of file
+        assert "Test Content" in page.content
+
+
+class TestIncrementalBuild:
+    """Тесты инкрементальной сборки."""
+
+    @pytest.fixture
+    def site_engine(self, tmp_path, monkeypatch):
+        """Фикстура с минимальным проектом и движком."""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "content").mkdir()
+        (tmp_path / "templates").mkdir()
+        (tmp_path / "templates" / "page.html").write_text(
+            "<h1>{{ page.title }}</h1>{{ page_content }}"
+        )
+        for name in ("first", "second"):
+            (tmp_path / "content" / f"{name}.md").write_text(
+                f"---\ntitle: {name}\n---\n\n# {name}\n"
+            )
+        config_file = tmp_path / "config.toml"
+        config_file.write_text(
+            'site_name = "Test Site"\n'
+            'output_dir = "output"\n'
+            f'cache_dir = "{(tmp_path / ".cache").as_posix()}"\n'
+        )
+        engine = Engine(config_file)
+        engine.initialize(
+            tmp_path / "content", tmp_path / "output", tmp_path / "templates"
+        )
+        return engine
+
+    def _rendered(self, engine, monkeypatch):
+        rendered = []
+        original = engine._process_page
+
+        def spy(page):
+            rendered.append(str(page.source_path))
+            return original(page)
+
+        monkeypatch.setattr(engine, "_process_page", spy)
+        return rendered
+
+    def test_second_build_skips_unchanged_pages(self, site_engine,
+                                                monkeypatch):
+        """Повторная сборка не рендерит неизмененные страницы."""
+        site_engine.build()
+        assert (site_engine.site.output_dir / "first.html").exists()
+        rendered = self._rendered(site_engine, monkeypatch)
+        site_engine.build()
+        assert rendered == []
+
+    def test_changed_page_is_rebuilt(self, site_engine, monkeypatch):
+        """Измененная страница пересобирается."""
+        site_engine.build()
+        rendered = self._rendered(site_engine, monkeypatch)
+        source = site_engine.site.source_dir / "first.md"
+        source.write_text("---\ntitle: first\n---\n\nChanged\n")
+        site_engine.build()
+        assert rendered == ["first.md"]
+        output = (site_engine.site.output_dir / "first.html").read_text()
+        assert "Changed" in output
+
+    def test_template_change_rebuilds_all(self, site_engine, monkeypatch):
+        """Изменение шаблона пересобирает все страницы."""
+        site_engine.build()
+        rendered = self._rendered(site_engine, monkeypatch)
+        template = site_engine.site.template_dir / "page.html"
+        template.write_text("<h2>{{ page.title }}</h2>{{ page_content }}")
+        site_engine.build()
+        assert sorted(rendered) == ["first.md", "second.md"]
+
+    def test_unrelated_template_change_skips_pages(self, site_engine,
+                                                   monkeypatch):
+        """Изменение неиспользуемого шаблона не пересобирает страницы."""
+        site_engine.build()
+        rendered = self._rendered(site_engine, monkeypatch)
+        (site_engine.site.template_dir / "post.html").write_text("post")
+        site_engine.build()
+        assert rendered == []
+        assert site_engine.get_dependents(
+            site_engine.site.template_dir / "page.html"
+        ) == ["first.md", "second.md"]
+
+    def test_markdown_conversion_is_cached(self, site_engine, monkeypatch):
+        """Неизмененный Markdown не конвертируется повторно."""
+        site_engine.build()
+        calls = []
+        original = site_engine.markdown.convert
+
+        def spy(source):
+            calls.append(source)
+            return original(source)
+
+        monkeypatch.setattr(site_engine.markdown, "convert", spy)
+        site_engine.build(incremental=False)
+        assert calls == []
+
+    def test_removed_source_deletes_output(self, site_engine):
+        """Удаление исходника удаляет сгенерированный файл."""
+        site_engine.build()
+        (site_engine.site.source_dir / "second.md").unlink()
+        site_engine.build()
+        assert not (site_engine.site.output_dir / "second.html").exists()
+        assert (site_engine.site.output_dir / "first.html").exists()
+
+    def test_full_build_ignores_manifest(self, site_engine, monkeypatch):
+        """Полная сборка рендерит все страницы."""
+        site_engine.build()
+        rendered = self._rendered(site_engine, monkeypatch)
+        site_engine.build(incremental=False)
+        assert sorted(rendered) == ["first.md", "second.md"]
+
+    def test_profiled_build(self, site_engine):
+        """Профилирование записывает фазы, страницы и шаги."""
+        site_engine.profiler = BuildProfiler()
+        site_engine.build()
+        summary = site_engine.profiler.summary()
+        phases = [phase["name"] for phase in summary["phases"]]
+        assert phases[:5] == [
+            "pre_build hooks", "scan", "load", "manifest", "render"
+        ]
+        assert "static copy" in phases
+        assert sorted(page["name"] for page in summary["pages"]) == [
+            "first.md", "second.md"
+        ]
+        steps = {step["name"]: step["calls"] for step in summary["steps"]}
+        assert steps == {"markdown": 2, "template": 2, "write": 2}
+
+    def test_hook_stats(self, site_engine):
+        """Сборка учитывает вызовы хуков плагинов."""
+        site_engine.add_plugin(TestPlugin())
+        site_engine.build()
+        row = site_engine.hook_stats.get("TestPlugin", "process_content")
+        assert row["calls"] == 2
+        assert row["bytes_out"] > row["bytes_in"]
+
+    def test_unchanged_outputs_keep_mtime(self, site_engine):
+        """Полная сборка не перезаписывает неизмененные файлы."""
+        static_dir = site_engine.site.source_dir.parent / "static"
+        static_dir.mkdir()
+        (static_dir / "style.css").write_text("body {}")
+        site_engine.build()
+        outputs = [
+            site_engine.site.output_dir / "first.html",
+            site_engine.site.output_dir / "static" / "style.css",
+        ]
+        for output in outputs:
+            os.utime(output, ns=(1_000_000_000, 1_000_000_000))
+        site_engine.output_digests.clear()
+
+        site_engine.build(incremental=False)
+        for output in outputs:
+            assert output.stat().st_mtime_ns == 1_000_000_000
+        stats = site_engine.output_digests.get_stats()
+        assert stats["files_written"] == 0
+        assert stats["files_skipped"] >= 3
+
+    def test_rebuild_paths_changed_page(self, site_engine, monkeypatch):
+        """Пересборка по пути рендерит только измененную страницу."""
+        site_engine.build()
+        rendered = self._rendered(site_engine, monkeypatch)
+        source = site_engine.site.source_dir / "first.md"
+        source.write_text("---\ntitle: first\n---\n\nEdited\n")
+        result = site_engine.rebuild_paths([source])
+        assert rendered == ["first.md"]
+        assert not result["full"]
+        assert result["pages"] == ["first.md"]
+        output = (site_engine.site.output_dir / "first.html").read_text()
+        assert "Edited" in output
+
+    def test_rebuild_paths_template(self, site_engine, monkeypatch):
+        """Изменение шаблона пересобирает страницы, которые его используют."""
+        site_engine.build()
+        rendered = self._rendered(site_engine, monkeypatch)
+        template = site_engine.site.template_dir / "page.html"
+        template.write_text("<h2>{{ page.title }}</h2>{{ page_content }}")
+        site_engine.rebuild_paths([template])
+        assert sorted(rendered) == ["first.md", "second.md"]
+        output = (site_engine.site.output_dir / "first.html").read_text()
+        assert output.startswith("<h2>")
+
+    def test_rebuild_paths_removed_page(self, site_engine, monkeypatch):
+        """Удаленная страница удаляется из вывода без пересборки остальных."""
+        site_engine.build()
+        rendered = self._rendered(site_engine, monkeypatch)
+        source = site_engine.site.source_dir / "second.md"
+        source.unlink()
+        result = site_engine.rebuild_paths([source])
+        assert result["removed"] == ["second.md"]
+        assert rendered == []
+        assert not (site_engine.site.output_dir / "second.html").exists()
+        assert "second.md" not in site_engine.manifest.sources()
+
+    def test_rebuild_paths_static_file(self, site_engine, monkeypatch):
+        """Статический файл обновляется без рендеринга страниц."""
+        static_dir = site_engine.site.source_dir.parent / "static"
+        static_dir.mkdir()
+        style = static_dir / "style.css"
+        style.write_text("body {}")
+        site_engine.build()
+        rendered = self._rendered(site_engine, monkeypatch)
+        style.write_text("body { color: red; }")
+        result = site_engine.rebuild_paths([style])
+        assert rendered == []
+        assert result["assets"] == ["style.css"]
+        output = site_engine.site.output_dir / "static" / "style.css"
+        assert "red" in output.read_text()
+
+    def test_rebuild_paths_falls_back_to_build(self, site_engine):
+        """Без предыдущей сборки и при изменении конфига идет сборка."""
+        source = site_engine.site.source_dir / "first.md"
+        assert site_engine.rebuild_paths([source])["full"]
+        assert (site_engine.site.output_dir / "second.html").exists()
+        config_file = site_engine.site.source_dir.parent / "config.toml"
+        assert site_engine.rebuild_paths([config_file])["full"]
+
+    def test_rebuild_paths_refreshes_listings(self, site_engine):
+        """Изменение страницы обновляет списки, ленты и карту сайта."""
+        (site_engine.site.template_dir / "index.html").write_text(
+            "{% for item in site.get_all_pages() %}"
+            "{{ item.title }};{% endfor %}"
+        )
+        (site_engine.site.source_dir / "index.md").write_text(
+            "---\ntitle: index\ntemplate: index.html\n---\n"
+        )
+        calls = []
+
+        class ListingPlugin(TestPlugin):
+            def post_build(self, site):
+                calls.append(len(site.get_all_pages()))
+
+        site_engine.add_plugin(ListingPlugin())
+        site_engine.build()
+        source = site_engine.site.source_dir / "first.md"
+        source.write_text("---\ntitle: renamed\n---\n\n# first\n")
+        result = site_engine.rebuild_paths([source])
+        assert sorted(result["pages"]) == ["first.md", "index.md"]
+        index = (site_engine.site.output_dir / "index.html").read_text()
+        assert "renamed;" in index
+        assert calls == [3, 3]
+
+        template = site_engine.site.template_dir / "page.html"
+        template.write_text("<h2>{{ page.title }}</h2>{{ page_content }}")
+        site_engine.rebuild_paths([template])
+        assert calls == [3, 3]
+
+    def test_render_url_on_demand(self, site_engine, monkeypatch):
+        """Страница рендерится по запросу без записи на диск."""
+        rendered = []
+        original = site_engine._render_html
+
+        def spy(page):
+            rendered.append(str(page.source_path))
+            return original(page)
+
+        monkeypatch.setattr(site_engine, "_render_html", spy)
+        html = site_engine.render_url("/first.html")
+        assert "<h1>first</h1>" in html
+        assert site_engine.render_url("/first.html") == html
+        assert rendered == ["first.md"]
+        assert site_engine.render_url("/missing.html") is None
+        assert not (site_engine.site.output_dir / "first.html").exists()
+
+    def test_render_url_reads_fresh_output(self, site_engine, monkeypatch):
+        """Актуальный результат прошлой сборки читается с диска."""
+        site_engine.build()
+        monkeypatch.setattr(
+            site_engine, "_render_html", lambda page: pytest.fail(page)
+        )
+        output = site_engine.site.output_dir / "second.html"
+        assert site_engine.render_url("/second.html") == output.read_text()
+
+    def test_render_url_invalidated_by_change(self, site_engine):
+        """Изменение исходника сбрасывает отрендеренную страницу."""
+        site_engine.render_url("/first.html")
+        source = site_engine.site.source_dir / "first.md"
+        source.write_text("---\ntitle: first\n---\n\nEdited\n")
+        result = site_engine.rebuild_paths([source], render=False)
+        assert result["urls"] == ["/first.html"]
+        assert "Edited" in site_engine.render_url("/first.html")
+        assert not (site_engine.site.output_dir / "first.html").exists()
+
+
+class TestParallelBuild:
+    """Тесты параллельного рендеринга страниц."""
+
+    @pytest.fixture
+    def project(self, tmp_path, monkeypatch):
+        """Фикстура с проектом из нескольких страниц."""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "content").mkdir()
+        (tmp_path / "templates").mkdir()
+        (tmp_path / "templates" / "page.html").write_text(
+            "<h1>{{ page.title }}</h1>{{ page_content }}"
+        )
+        for i in range(6):
+            (tmp_path / "content" / f"page{i}.md").write_text(
+                f"---\ntitle: Page {i}\n---\n\n# Page {i}\n"
+            )
+        return tmp_path
+
+    def _build(self, project, workers, backend="process", streaming=False,
+               plugin=None):
+        name = f"{backend}_{workers}_{streaming}"
+        config = Config()
+        config.set("output_dir", "output")
+        config.set("cache_dir", str(project / ".cache" / name))
+        config.set("workers", workers)
+        config.set("render_backend", backend)
+        config.set("streaming", streaming)
+        engine = Engine(config)
+        output_dir = project / f"output_{name}"
+        engine.initialize(
+            project / "content", output_dir, project / "templates"
+        )
+        if plugin is not None:
+            engine.add_plugin(plugin, {"label": "configured"})
+            plugin.marker = "state"
+        engine.build()
+        return engine, {
+            path.name: path.read_text()
+            for path in output_dir.glob("*.html")
+        }
+
+    @pytest.mark.parametrize("backend", ["process", "thread"])
+    def test_parallel_matches_sequential(self, project, backend):
+        """Параллельная сборка дает тот же результат, что и обычная."""
+        _, sequential = self._build(project, 1)
+        engine, parallel = self._build(project, 3, backend)
+        assert len(sequential) == 6
+        assert parallel == sequential
+        # Счетчики записей воркеров попадают в статистику движка
+        assert engine.output_digests.get_stats()["files_written"] == 6
+        assert sorted(engine.manifest.sources()) == sorted(
+            f"page{i}.md" for i in range(6)
+        )
+
+    @pytest.mark.parametrize("backend", ["process", "thread"])
+    def test_workers_clone_plugins(self, project, backend):
+        """Воркеры получают конфигурацию и состояние плагинов и вызывают
+        их хуки pre_build."""
+        engine, parallel = self._build(
+            project, 3, backend, plugin=MarkerPlugin()
+        )
+        # Один запуск в движке и еще один в воркере
+        assert all("<!-- configured state 2 -->" in html
+                   for html in parallel.values())
+        assert engine.plugins[0].builds == 1
+
+    def test_workers_do_not_load_pages(self, project, monkeypatch):
+        """Воркеры берут страницы движка, а не загружают сайт заново."""
+        from staticflow.core.site import Site
+        loads = []
+        original = Site.load_pages
+
+        def spy(self, *args, **kwargs):
+            loads.append(self)
+            return original(self, *args, **kwargs)
+
+        monkeypatch.setattr(Site, "load_pages", spy)
+        engine, parallel = self._build(project, 3, "thread")
+        assert len(parallel) == 6
+        assert all(site is engine.site for site in loads)
+
+    @pytest.mark.parametrize("workers", [1, 3])
+    def test_streaming_matches_sequential(self, project, workers):
+        """Потоковая сборка дает тот же результат и не держит тела страниц."""
+        _, sequential = self._build(project, 1)
+        engine, streamed = self._build(project, workers, "thread", True)
+        assert streamed == sequential
+        for page in engine.site.get_all_pages():
+            assert not page.content_loaded
+            assert page.rendered_content is None
+            assert page.metadata["title"].startswith("Page")
+
+    def test_streaming_incremental(self, project, monkeypatch):
+        """Потоковая сборка пропускает неизмененные страницы."""
+        engine, _ = self._build(project, 1, streaming=True)
+        rendered = []
+        original = engine._process_page
+
+        def spy(page):
+            rendered.append(str(page.source_path))
+            return original(page)
+
+        monkeypatch.setattr(engine, "_process_page", spy)
+        (project / "content" / "page2.md").write_text(
+            "---\ntitle: Page 2\n---\n\nChanged\n"
+        )
+        engine.build()
+        assert rendered == ["page2.md"]
+
+    def test_worker_count(self):
+        """Тест разбора количества воркеров."""
+        from staticflow.core.parallel import get_worker_count
+        assert get_worker_count(None) == 1
+        assert get_worker_count(4) == 4
+        assert get_worker_count("auto") >= 1
+        assert get_worker_count("bad") == 1
@@ -0,0 +1,104 @@
+import os
+import pytest
+from datetime import date
+from staticflow.core import front_matter
+from staticflow.core.front_matter import (
+    FrontMatterScanner,
+    locate_front_matter,
+    read_front_matter,
+)
+
+
+class TestFrontMatter:
+    """Тесты для быстрого чтения front matter."""
+
+    @pytest.fixture
+    def scanner(self):
+        """Фикстура для создания сканера."""
+        return FrontMatterScanner()
+
+    def test_read_front_matter(self, tmp_path):
+        """Читается только блок front matter."""
+        path = tmp_path / "page.md"
+        path.write_text("---\ntitle: Test\n---\n\nBody --- text\n")
+        assert read_front_matter(path) == "\ntitle: Test\n"
+
+    def test_read_without_front_matter(self, tmp_path):
+        """Документ без front matter возвращает None."""
+        path = tmp_path / "page.md"
+        path.write_text("# Title\n")
+        assert read_front_matter(path) is None
+
+    def test_locate_body(self, tmp_path):
+        """Находится смещение, с которого начинается тело документа."""
+        path = tmp_path / "page.md"
+        text = "---\ntitle: Test\n---\n\nBody\n"
+        path.write_text(text)
+        front, offset = locate_front_matter(path)
+        assert front == "\ntitle: Test\n"
+        assert text[offset:] == "\n\nBody\n"
+        path.write_text("# Title\n")
+        assert locate_front_matter(path) == (None, 0)
+        path.write_text("---\ntitle: Test\n")
+        assert locate_front_matter(path) == (None, None)
+
+    def test_delimiter_across_chunks(self, tmp_path):
+        """Разделитель находится, даже если попал на границу блоков."""
+        path = tmp_path / "page.md"
+        path.write_text("---\ntitle: Test\n---\nBody\n")
+        for chunk_size in range(1, 8):
+            assert read_front_matter(path, chunk_size) == "\ntitle: Test\n"
+
+    def test_body_is_not_read(self, tmp_path):
+        """Тело документа не читается."""
+        path = tmp_path / "page.md"
+        path.write_bytes(
+            b"---\ntitle: Test\n---\n" + b"x" * 100000 + b"\xff\xfe"
+        )
+        with pytest.raises(UnicodeDecodeError):
+            path.read_text(encoding="utf-8")
+        assert read_front_matter(path) == "\ntitle: Test\n"
+
+    def test_scan_parses_metadata(self, scanner, tmp_path):
+        """Метаданные разбираются, даты преобразуются."""
+        path = tmp_path / "page.md"
+        path.write_text("---\ntitle: Test\ndate: 2024-03-20\n---\nBody\n")
+        metadata = scanner.scan(path)
+        assert metadata == {"title": "Test", "date": date(2024, 3, 20)}
+
+    def test_scan_is_cached(self, scanner, tmp_path, monkeypatch):
+        """Повторный вызов не читает неизмененный файл."""
+        path = tmp_path / "page.md"
+        path.write_text("---\ntitle: Test\n---\nBody\n")
+        scanner.scan(path)
+        calls = []
+        monkeypatch.setattr(
+            front_matter, "locate_front_matter",
+            lambda *args: calls.append(args)
+        )
+        assert scanner.scan(path)["title"] == "Test"
+        assert calls == []
+
+    def test_scan_detects_changes(self, scanner, tmp_path):
+        """Изменение файла инвалидирует кэш."""
+        path = tmp_path / "page.md"
+        path.write_text("---\ntitle: Old\n---\nBody\n")
+        scanner.scan(path)
+        path.write_text("---\ntitle: Newer\n---\nBody\n")
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000))
+        assert scanner.scan(path)["title"] == "Newer"
+
+    def test_scan_returns_copies(self, scanner, tmp_path):
+        """Изменение результата не портит кэш."""
+        path = tmp_path / "page.md"
+        path.write_text("---\ntitle: Test\n---\nBody\n")
+        scanner.scan(path)["title"] = "Changed"
+        assert scanner.scan(path)["title"] == "Test"
+
+    def test_invalid_yaml(self, scanner, tmp_path):
+        """Некорректный YAML вызывает ValueError."""
+        path = tmp_path / "page.md"
+        path.write_text("---\ntitle: [unclosed\n---\nBody\n")
+        with pytest.raises(ValueError):
+            scanner.scan(path)
@@ -0,0 +1,121 @@
+import asyncio
+import threading
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestClient, TestServer
+from staticflow.core.config import Config
+from staticflow.core.livereload import (
+    SCRIPT_PATH,
+    SCRIPT_TAG,
+    SOCKET_PATH,
+    LiveReload,
+    build_message,
+    inject_script,
+)
+from staticflow.core.server import Server
+
+
+class TestLiveReloadMessages:
+    """Тесты подготовки уведомлений о пересборке."""
+
+    def test_inject_before_body_end(self):
+        """Скрипт вставляется перед закрывающим тегом body."""
+        html = "<html><body><p>Text</p></BODY></html>"
+        assert inject_script(html) == (
+            f"<html><body><p>Text</p>{SCRIPT_TAG}</BODY></html>"
+        )
+        assert inject_script("<p>Text</p>") == f"<p>Text</p>{SCRIPT_TAG}"
+
+    def test_pages_and_stylesheets(self):
+        """Страницы перезагружаются, а стили подменяются."""
+        message = build_message({
+            "full": False,
+            "urls": ["/en/about.html"],
+            "assets": ["css/style.css"],
+        })
+        assert message == {
+            "reload": False,
+            "pages": ["/en/about.html"],
+            "css": ["/static/css/style.css"],
+        }
+
+    def test_full_reload(self):
+        """Полная сборка и прочая статика перезагружают все страницы."""
+        assert build_message({"full": True})["reload"]
+        assert build_message({"assets": ["js/app.js"]})["reload"]
+
+    def test_nothing_changed(self):
+        """Без изменений уведомление не отправляется."""
+        assert build_message({"full": False, "urls": [], "assets": []}) is None
+
+
+class TestLiveReloadSocket:
+    """Тесты WebSocket-канала живой перезагрузки."""
+
+    def test_notify_from_other_thread(self):
+        """Уведомление из потока сборки доходит до браузера."""
+        async def scenario():
+            livereload = LiveReload()
+            app = web.Application()
+            livereload.setup(app)
+            async with TestClient(TestServer(app)) as client:
+                script = await client.get(SCRIPT_PATH)
+                assert SOCKET_PATH in await script.text()
+                socket = await client.ws_connect(SOCKET_PATH)
+                while not livereload.sockets:
+                    await asyncio.sleep(0.01)
+                message = build_message({"urls": ["/index.html"]})
+                thread = threading.Thread(
+                    target=livereload.notify, args=(message,)
+                )
+                thread.start()
+                received = await asyncio.wait_for(socket.receive_json(), 5)
+                thread.join()
+                await socket.close()
+                return received
+
+        assert asyncio.run(scenario()) == {
+            "reload": False, "pages": ["/index.html"], "css": []
+        }
+
+
+class TestServerLiveReload:
+    """Тесты живой перезагрузки в сервере разработки."""
+
+    @pytest.fixture
+    def project(self, tmp_path, monkeypatch):
+        """Фикстура с проектом для сервера."""
+        monkeypatch.chdir(tmp_path)
+        for name in ("content", "templates", "static"):
+            (tmp_path / name).mkdir()
+        (tmp_path / "templates" / "page.html").write_text(
+            "<html><body>{{ page_content }}</body></html>"
+        )
+        (tmp_path / "content" / "index.md").write_text(
+            "---\ntitle: Home\n---\n\n# Home\n"
+        )
+        config_file = tmp_path / "config.toml"
+        config_file.write_text(
+            'site_name = "Test Site"\n'
+            'base_url = "http://example.com"\n'
+            'output_dir = "output"\n'
+        )
+        return config_file
+
+    def test_pages_include_client_script(self, project):
+        """В режиме разработки в страницы добавляется клиентский скрипт."""
+        server = Server(Config(project), dev_mode=True)
+        server.engine.build()
+
+        async def scenario():
+            async with TestClient(TestServer(server.app)) as client:
+                response = await client.get("/index.html")
+                return await response.text()
+
+        assert SCRIPT_TAG in asyncio.run(scenario())
+
+    def test_without_watch(self, project):
+        """Без наблюдения за файлами скрипт не добавляется."""
+        server = Server(Config(project), dev_mode=True, watch=False)
+        assert server.livereload is None
+        assert server.watcher is None
@@ -0,0 +1,43 @@
+import pytest
+from staticflow.core.manifest import BuildManifest, hash_data
+
+
+class TestBuildManifest:
+    """Тесты для манифеста сборки."""
+
+    @pytest.fixture
+    def manifest(self, tmp_path):
+        """Фикстура для создания манифеста."""
+        return BuildManifest(tmp_path / "cache" / "manifest.json")
+
+    def test_roundtrip(self, manifest, tmp_path):
+        """Тест сохранения и загрузки манифеста."""
+        manifest.update("index.md", {"content_hash": "abc"})
+        manifest.save()
+
+        loaded = BuildManifest(manifest.path)
+        loaded.load()
+        assert loaded.get("index.md") == {"content_hash": "abc"}
+
+    def test_is_fresh_requires_output(self, manifest, tmp_path):
+        """Запись устарела, если выходной файл отсутствует."""
+        output = tmp_path / "index.html"
+        entry = {"content_hash": "abc", "output_path": str(output)}
+        manifest.update("index.md", entry)
+        assert not manifest.is_fresh("index.md", entry)
+        output.write_text("html")
+        assert manifest.is_fresh("index.md", entry)
+        assert not manifest.is_fresh(
+            "index.md", {**entry, "content_hash": "def"}
+        )
+
+    def test_corrupted_file_is_ignored(self, manifest):
+        """Поврежденный манифест загружается пустым."""
+        manifest.path.parent.mkdir(parents=True)
+        manifest.path.write_text("{not json")
+        manifest.load()
+        assert manifest.sources() == []
+
+    def test_hash_helpers(self):
+        """Тест вспомогательных функций хеширования."""
+        assert hash_data({"a": 1, "b": 2}) == hash_data({"b": 2, "a": 1})
@@ -0,0 +1,73 @@
+import json
+import os
+from staticflow.core.output_digests import OutputDigests
+
+
+class TestOutputDigests:
+    """Тесты для записи только измененных файлов."""
+
+    def test_unchanged_file_is_not_rewritten(self, tmp_path):
+        """Файл с тем же содержимым не перезаписывается."""
+        digests = OutputDigests(tmp_path / "digests.json")
+        target = tmp_path / "out" / "index.html"
+        assert digests.write_text(target, "<p>a</p>")
+        os.utime(target, ns=(1_000_000_000, 1_000_000_000))
+        digests.forget(target)
+
+        assert not digests.write_text(target, "<p>a</p>")
+        assert target.stat().st_mtime_ns == 1_000_000_000
+        assert digests.write_text(target, "<p>b</p>")
+        assert target.read_text() == "<p>b</p>"
+        assert digests.get_stats()["files_skipped"] == 1
+
+    def test_touched_file_is_compared(self, tmp_path):
+        """Измененный извне файл перезаписывается."""
+        digests = OutputDigests(tmp_path / "digests.json")
+        target = tmp_path / "index.html"
+        digests.write_text(target, "<p>a</p>")
+        target.write_text("<p>x</p>")
+        assert digests.write_text(target, "<p>a</p>")
+        assert target.read_text() == "<p>a</p>"
+
+    def test_copy_file(self, tmp_path):
+        """Копия обновляется только при изменении исходника."""
+        digests = OutputDigests(tmp_path / "digests.json")
+        source = tmp_path / "style.css"
+        source.write_text("body {}")
+        target = tmp_path / "out" / "style.css"
+        assert digests.copy_file(source, target)
+        assert not digests.copy_file(source, target)
+
+        source.write_text("body {}")
+        assert not digests.copy_file(source, target)
+        source.write_text("p {}")
+        assert digests.copy_file(source, target)
+        assert target.read_text() == "p {}"
+
+    def test_save_merges_entries(self, tmp_path):
+        """Записи нескольких экземпляров объединяются при сохранении."""
+        path = tmp_path / "digests.json"
+        first = OutputDigests(path)
+        second = OutputDigests(path)
+        first.write_text(tmp_path / "a.html", "a")
+        second.write_text(tmp_path / "b.html", "b")
+        first.save()
+        second.save()
+
+        files = json.loads(path.read_text())["files"]
+        assert sorted(files) == [
+            str(tmp_path / "a.html"), str(tmp_path / "b.html")
+        ]
+        restored = OutputDigests(path)
+        restored.load()
+        assert not restored.write_text(tmp_path / "a.html", "a")
+
+    def test_clear(self, tmp_path):
+        """Очистка удаляет все записи."""
+        path = tmp_path / "digests.json"
+        digests = OutputDigests(path)
+        digests.write_text(tmp_path / "a.html", "a")
+        digests.save()
+        digests.clear()
+        digests.save()
+        assert json.loads(path.read_text())["files"] == {}
@@ -1,6 +1,7 @@
 import pytest
 from pathlib import Path
 import tempfile
+import threading
 from datetime import datetime, date
 from staticflow.core.page import Page
 from staticflow.core.config import Config
@@ -182,4 +183,86 @@ Test content
         page.metadata = {}
         rendered = page.render()
         assert "Test Content" in rendered
-        assert "<!DOCTYPE html>" not in rendered 
\ No newline at end of file
+        assert "<!DOCTYPE html>" not in rendered 
+
+    def test_lazy_content(self, tmp_path):
+        """Тело страницы читается с диска при первом обращении."""
+        file_path = tmp_path / "lazy.md"
+        file_path.write_text("---\ntitle: Lazy\n---\n\nLazy body\n")
+        page = Page.from_file(file_path, load_content=False)
+        assert page.metadata["title"] == "Lazy"
+        assert not page.content_loaded
+        assert page.content == "Lazy body"
+        assert page.content_loaded
+        page.release_content()
+        assert not page.content_loaded
+        assert page.content == "Lazy body"
+
+    def test_slots(self, page):
+        """Страница не хранит атрибуты в __dict__."""
+        assert not hasattr(page, "__dict__")
+        with pytest.raises(AttributeError):
+            page.unknown_attribute = True
+
+    @pytest.fixture
+    def parser_class(self, monkeypatch):
+        """Фикстура, подменяющая класс парсера Markdown."""
+        import staticflow.parsers
+        from staticflow.core import page as page_module
+        monkeypatch.setattr(staticflow.parsers, "MarkdownParser", object)
+        monkeypatch.setattr(page_module, "_local", threading.local())
+
+    def test_shared_markdown_parser(self, page, parser_class):
+        """Страницы одного потока используют общий парсер Markdown."""
+        other = Page(Path("content/other.md"), "Other")
+        shared = page.markdown_parser
+        assert other.markdown_parser is shared
+        own = object()
+        other.markdown_parser = own
+        assert other.markdown_parser is own
+        assert page.markdown_parser is shared
+
+    def test_markdown_parser_per_thread(self, page, parser_class):
+        """В другом потоке страницы получают свой парсер."""
+        parsers = []
+        thread = threading.Thread(
+            target=lambda: parsers.append(page.markdown_parser)
+        )
+        thread.start()
+        thread.join()
+        assert parsers[0] is not page.markdown_parser
+
+    def test_set_times(self, page):
+        """Время создания и изменения можно задать."""
+        created = datetime(2024, 3, 20, 12, 0)
+        modified = datetime(2024, 3, 21, 8, 30)
+        page.created_at = created
+        page.modified_at = modified
+        assert page.created_at == created
+        assert page.modified_at == modified
+
+    @pytest.mark.parametrize("load_content", [True, False])
+    def test_reload_uses_body_offset(self, tmp_path, monkeypatch,
+                                     load_content):
+        """При повторном чтении тело не отделяется от front matter заново."""
+        file_path = tmp_path / "offset.md"
+        file_path.write_text("---\ntitle: Offset\n---\n\nBody --- text\n")
+        page = Page.from_file(file_path, load_content=load_content)
+        page.release_content()
+
+        def fail(raw_content):
+            raise AssertionError("front matter split again")
+
+        monkeypatch.setattr(Page, "_split_front_matter", staticmethod(fail))
+        assert page.content == "Body --- text"
+
+    def test_reload_changed_file(self, tmp_path):
+        """Если файл изменился, тело отделяется заново."""
+        file_path = tmp_path / "changed.md"
+        file_path.write_text("---\ntitle: Old\n---\nOld body\n")
+        page = Page.from_file(file_path, load_content=False)
+        file_path.write_text("---\ntitle: A longer title\n---\nNew body\n")
+        assert page.content == "New body"
+        file_path.write_text("No front matter\n")
+        page.release_content()
+        assert page.content == "No front matter\n"
@@ -0,0 +1,57 @@
+import json
+import time
+from staticflow.core.profiler import BuildProfiler
+
+
+class TestBuildProfiler:
+    """Тесты для профилировщика сборки."""
+
+    def test_span_records_event(self):
+        """Интервал сохраняется как событие Chrome trace."""
+        profiler = BuildProfiler()
+        with profiler.span("render", pages=2):
+            time.sleep(0.01)
+        event, = profiler.events
+        assert event["name"] == "render"
+        assert event["cat"] == "phase"
+        assert event["ph"] == "X"
+        assert event["dur"] >= 10000
+        assert event["args"]["pages"] == 2
+        assert "cpu_ms" in event["args"]
+
+    def test_span_records_failed_block(self):
+        """Интервал записывается и при исключении."""
+        profiler = BuildProfiler()
+        try:
+            with profiler.span("broken"):
+                raise RuntimeError("broken")
+        except RuntimeError:
+            pass
+        assert profiler.events[0]["name"] == "broken"
+
+    def test_summary(self):
+        """Сводка агрегирует страницы и плагины по имени."""
+        profiler = BuildProfiler()
+        with profiler.span("render"):
+            for name in ("a.md", "b.md", "c.md"):
+                with profiler.span(name, "page"):
+                    with profiler.span("toc.process_content", "plugin"):
+                        time.sleep(0.002 if name == "b.md" else 0)
+        summary = profiler.summary(top=2)
+        assert [phase["name"] for phase in summary["phases"]] == ["render"]
+        assert len(summary["pages"]) == 2
+        assert summary["pages"][0]["name"] == "b.md"
+        plugin, = summary["plugins"]
+        assert plugin["name"] == "toc.process_content"
+        assert plugin["calls"] == 3
+
+    def test_write_trace(self, tmp_path):
+        """Файл трассировки содержит события и сводку."""
+        profiler = BuildProfiler()
+        with profiler.span("scan"):
+            pass
+        path = tmp_path / "profile" / "trace.json"
+        profiler.write_trace(path)
+        data = json.loads(path.read_text())
+        assert data["traceEvents"][0]["name"] == "scan"
+        assert data["summary"]["phases"][0]["name"] == "scan"
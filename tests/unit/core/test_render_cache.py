@@ -0,0 +1,50 @@
+import pytest
+from staticflow.core.render_cache import RenderCache
+
+
+class TestRenderCache:
+    """Тесты для кэша рендеринга Markdown."""
+
+    @pytest.fixture
+    def options(self):
+        """Фикстура с опциями конвертера."""
+        return {"extensions": ["tables"], "version": "1.0"}
+
+    @pytest.fixture
+    def cache(self, tmp_path, options):
+        """Фикстура для создания кэша."""
+        return RenderCache(tmp_path / "render", options, memory_size=2)
+
+    def test_convert_caches_result(self, cache):
+        """Повторная конвертация берется из кэша."""
+        calls = []
+
+        def converter(source):
+            calls.append(source)
+            return f"<p>{source}</p>"
+
+        assert cache.convert("text", converter) == "<p>text</p>"
+        assert cache.convert("text", converter) == "<p>text</p>"
+        assert calls == ["text"]
+        assert cache.hits == 1
+        assert cache.misses == 1
+
+    def test_disk_tier_survives_restart(self, cache, tmp_path, options):
+        """Записи на диске доступны новому экземпляру кэша."""
+        cache.set("text", "<p>text</p>")
+        cache.flush()
+        restarted = RenderCache(tmp_path / "render", options)
+        assert restarted.get("text") == "<p>text</p>"
+
+    def test_options_change_invalidates(self, cache, tmp_path, options):
+        """Изменение расширений или версии инвалидирует кэш."""
+        cache.set("text", "<p>text</p>")
+        other = RenderCache(tmp_path / "render", {**options, "version": "2"})
+        assert other.get("text") is None
+
+    def test_memory_tier_is_bounded(self, cache):
+        """Память ограничена, старые записи вытесняются."""
+        for i in range(5):
+            cache.set(f"text{i}", f"<p>{i}</p>")
+        assert len(cache._memory) == 2
+        assert cache.get("text0") == "<p>0</p>"
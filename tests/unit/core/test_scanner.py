@@ -0,0 +1,137 @@
+import pytest
+from staticflow.core.config import Config
+from staticflow.core.scanner import ContentScanner, IgnoreRules
+from staticflow.core.site import Site
+
+
+class TestContentScanner:
+    """Тесты для сканера контента."""
+
+    @pytest.fixture
+    def content(self, tmp_path):
+        """Фикстура с деревом контента."""
+        content = tmp_path / "content"
+        for rel_path in (
+            "index.md",
+            "about.html",
+            "notes.txt",
+            "posts/first.md",
+            "posts/draft-second.md",
+            "drafts/third.md",
+            "node_modules/pkg/readme.md",
+            "en/posts/fourth.md",
+        ):
+            path = content / rel_path
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(f"---\ntitle: {path.stem}\n---\n\nBody\n")
+        return content
+
+    def _scan(self, content, **kwargs):
+        kwargs.setdefault("project_root", content.parent)
+        return sorted(
+            item.rel_path for item in ContentScanner(content, **kwargs).scan()
+        )
+
+    def test_scan_finds_content_files(self, content):
+        """Находятся только файлы с расширениями контента."""
+        assert self._scan(content) == [
+            "about.html",
+            "drafts/third.md",
+            "en/posts/fourth.md",
+            "index.md",
+            "node_modules/pkg/readme.md",
+            "posts/draft-second.md",
+            "posts/first.md",
+        ]
+
+    def test_scan_all_extensions(self, content):
+        """Без списка расширений находятся все файлы."""
+        assert "notes.txt" in self._scan(content, extensions=None)
+
+    def test_scan_reuses_stat(self, content):
+        """Результат stat передается вместе с файлом."""
+        item = next(iter(ContentScanner(content).scan()))
+        stat = item.path.stat()
+        assert item.size == stat.st_size
+        assert item.mtime_ns == stat.st_mtime_ns
+
+    def test_symlink_cycle(self, content):
+        """Ссылки на каталоги не обходятся, цикл не зацикливает сканер."""
+        (content / "posts" / "loop").symlink_to(content, True)
+        (content / "en" / "posts.md").symlink_to(content / "posts", True)
+        (content / "linked.md").symlink_to(content / "index.md")
+        assert self._scan(content) == [
+            "about.html",
+            "drafts/third.md",
+            "en/posts/fourth.md",
+            "index.md",
+            "linked.md",
+            "node_modules/pkg/readme.md",
+            "posts/draft-second.md",
+            "posts/first.md",
+        ]
+
+    def test_exclude_patterns(self, content):
+        """Шаблоны исключения отбрасывают файлы и каталоги."""
+        assert self._scan(
+            content, exclude=["node_modules/", "drafts/", "draft-*"]
+        ) == [
+            "about.html",
+            "en/posts/fourth.md",
+            "index.md",
+            "posts/first.md",
+        ]
+
+    def test_ignore_file(self, content):
+        """Шаблоны читаются из .staticflowignore."""
+        (content / ".staticflowignore").write_text(
+            "# comment\nnode_modules/\nen/posts/*.md\n"
+        )
+        result = self._scan(content)
+        assert "node_modules/pkg/readme.md" not in result
+        assert "en/posts/fourth.md" not in result
+        assert "drafts/third.md" in result
+
+    def test_excluded_dirs_are_not_listed(self, content, monkeypatch):
+        """Исключенные каталоги не обходятся."""
+        import os
+        scanned = []
+        real_scandir = os.scandir
+
+        def tracking_scandir(path):
+            scanned.append(str(path))
+            return real_scandir(path)
+
+        monkeypatch.setattr(
+            "staticflow.core.scanner.os.scandir", tracking_scandir
+        )
+        self._scan(content, exclude=["node_modules/"])
+        assert not any("node_modules" in path for path in scanned)
+
+    def test_dir_only_rule(self):
+        """Шаблон с косой чертой в конце применяется только к каталогам."""
+        rules = IgnoreRules(["build/"])
+        assert rules.matches("build", is_dir=True)
+        assert not rules.matches("build", is_dir=False)
+
+    def test_site_uses_exclude_config(self, content, tmp_path):
+        """Сайт не загружает исключенные страницы."""
+        config = Config()
+        config.set("exclude", ["drafts/", "node_modules/", "draft-*"])
+        site = Site(config)
+        site.set_directories(content, tmp_path / "output", None)
+        site.load_pages()
+        assert sorted(site.pages) == sorted([
+            "about.html",
+            "en/posts/fourth.md",
+            "index.md",
+            "posts/first.md",
+        ])
+
+    def test_accepts_matches_scan(self, content):
+        """Проверка отдельного файла совпадает с результатом обхода."""
+        scanner = ContentScanner(content, exclude=["drafts/", "draft-*"])
+        assert scanner.accepts("posts/first.md")
+        assert not scanner.accepts("posts/draft-second.md")
+        assert not scanner.accepts("drafts/third.md")
+        assert not scanner.accepts("notes.txt")
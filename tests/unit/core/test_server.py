@@ -0,0 +1,58 @@
+import asyncio
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+from staticflow.core.config import Config
+from staticflow.core.server import Server
+
+
+class TestLazyServer:
+    """Тесты сервера разработки с рендерингом по запросу."""
+
+    @pytest.fixture
+    def project(self, tmp_path, monkeypatch):
+        """Фикстура с проектом без сборки."""
+        monkeypatch.chdir(tmp_path)
+        for name in ("content", "templates", "static"):
+            (tmp_path / name).mkdir()
+        (tmp_path / "templates" / "page.html").write_text(
+            "<html><body>{{ page_content }}</body></html>"
+        )
+        (tmp_path / "content" / "index.md").write_text(
+            "---\ntitle: Home\n---\n\n# Home\n"
+        )
+        (tmp_path / "content" / "docs").mkdir()
+        (tmp_path / "content" / "docs" / "guide.md").write_text(
+            "---\ntitle: Guide\n---\n\n# Guide\n"
+        )
+        config_file = tmp_path / "config.toml"
+        config_file.write_text(
+            'site_name = "Test Site"\n'
+            'base_url = "http://example.com"\n'
+            'output_dir = "output"\n'
+        )
+        return tmp_path
+
+    def _get(self, server, *paths):
+        async def scenario():
+            async with TestClient(TestServer(server.app)) as client:
+                responses = []
+                for path in paths:
+                    response = await client.get(path)
+                    responses.append((response.status, await response.text()))
+                return responses
+
+        return asyncio.run(scenario())
+
+    def test_renders_without_build(self, project):
+        """Страницы отдаются без предварительной сборки."""
+        server = Server(Config(project / "config.toml"), dev_mode=True,
+                        watch=False, lazy=True)
+        (home_status, home), (guide_status, guide), (missing, _) = self._get(
+            server, "/", "/docs/guide/", "/missing.html"
+        )
+        assert home_status == 200
+        assert "<h1>Home</h1>" in home
+        assert guide_status == 200
+        assert "<h1>Guide</h1>" in guide
+        assert missing == 404
+        assert not (project / "output" / "index.html").exists()
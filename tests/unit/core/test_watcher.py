@@ -0,0 +1,102 @@
+import threading
+import time
+from pathlib import Path
+from staticflow.core.watcher import SiteWatcher, is_ignored
+
+
+def wait_for(condition, timeout=5.0):
+    """Ждет выполнения условия не дольше timeout секунд."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class TestSiteWatcher:
+    """Тесты наблюдателя за файлами сайта."""
+
+    def _watcher(self, tmp_path, callback, **kwargs):
+        for name in ("content", "output"):
+            (tmp_path / name).mkdir(exist_ok=True)
+        kwargs.setdefault("debounce", 0.05)
+        return SiteWatcher(
+            [tmp_path / "content"],
+            callback,
+            files=[tmp_path / "config.toml"],
+            ignore=[tmp_path / "output"],
+            **kwargs
+        )
+
+    def test_is_ignored(self):
+        """Временные файлы редакторов не считаются изменениями."""
+        assert is_ignored(Path("content/.page.md.swp"))
+        assert is_ignored(Path("content/page.md~"))
+        assert is_ignored(Path("content/.#page.md"))
+        assert not is_ignored(Path("content/page.md"))
+
+    def test_changes_are_batched(self, tmp_path):
+        """События за время задержки передаются одной пачкой."""
+        batches = []
+        watcher = self._watcher(tmp_path, batches.append)
+        watcher._thread = threading.Thread(target=watcher._run, daemon=True)
+        watcher._thread.start()
+        content = tmp_path / "content"
+        watcher.add_changes([content / "a.md"])
+        watcher.add_changes([content / "b.md", content / "a.md"])
+        assert wait_for(lambda: batches)
+        watcher.stop()
+        assert batches == [[content / "a.md", content / "b.md"]]
+
+    def test_filters_paths(self, tmp_path):
+        """Учитываются только отслеживаемые файлы и каталоги."""
+        batches = []
+        watcher = self._watcher(tmp_path, batches.append)
+        watcher.add_changes([
+            tmp_path / "output" / "page.html",
+            tmp_path / "other.toml",
+            tmp_path / "content" / ".page.md.swp",
+        ])
+        assert watcher._pending == set()
+        watcher.add_changes([tmp_path / "config.toml"])
+        assert watcher._pending == {tmp_path / "config.toml"}
+
+    def test_callbacks_do_not_overlap(self, tmp_path):
+        """Новая пачка ждет завершения предыдущей пересборки."""
+        active = []
+        overlaps = []
+        batches = []
+
+        def callback(batch):
+            if active:
+                overlaps.append(batch)
+            active.append(batch)
+            time.sleep(0.2)
+            batches.append(batch)
+            active.pop()
+
+        watcher = self._watcher(tmp_path, callback, debounce=0.01)
+        watcher._thread = threading.Thread(target=watcher._run, daemon=True)
+        watcher._thread.start()
+        content = tmp_path / "content"
+        watcher.add_changes([content / "a.md"])
+        assert wait_for(lambda: active)
+        watcher.add_changes([content / "b.md"])
+        assert wait_for(lambda: len(batches) == 2)
+        watcher.stop()
+        assert overlaps == []
+        assert batches == [[content / "a.md"], [content / "b.md"]]
+
+    def test_detects_file_changes(self, tmp_path):
+        """Изменение файла на диске приводит к вызову обработчика."""
+        batches = []
+        watcher = self._watcher(tmp_path, batches.append)
+        watcher.start()
+        try:
+            page = tmp_path / "content" / "page.md"
+            page.write_text("# Page")
+            assert wait_for(lambda: batches)
+        finally:
+            watcher.stop()
+        assert page in batches[0]
@@ -0,0 +1,90 @@
+import threading
+from staticflow.core.output_digests import OutputDigests
+from staticflow.core.writer import OutputWriter, create_writer
+
+
+class TestOutputWriter:
+    """Тесты для фоновой записи файлов."""
+
+    def test_writes_files(self, tmp_path):
+        """Файлы записываются, каталоги создаются."""
+        with OutputWriter(workers=2) as writer:
+            writer.make_dirs([tmp_path / "a" / "index.html"])
+            assert (tmp_path / "a").is_dir()
+            writer.write(tmp_path / "a" / "index.html", "<p>a</p>")
+            writer.write(tmp_path / "b" / "c" / "page.html", "<p>ё</p>")
+        assert (tmp_path / "a" / "index.html").read_text() == "<p>a</p>"
+        assert (tmp_path / "b" / "c" / "page.html").read_text(
+            encoding="utf-8"
+        ) == "<p>ё</p>"
+        stats = writer.get_stats()
+        assert stats["files_written"] == 2
+        assert stats["bytes_written"] == len("<p>a</p>") + len(
+            "<p>ё</p>".encode("utf-8")
+        )
+        assert stats["queue_depth"] == 0
+
+    def test_back_pressure(self, tmp_path, monkeypatch):
+        """При заполненной очереди write блокируется."""
+        release = threading.Event()
+        original = OutputWriter._write_file
+
+        def slow_write(self, path, content):
+            release.wait(5)
+            return original(self, path, content)
+
+        monkeypatch.setattr(OutputWriter, "_write_file", slow_write)
+        writer = OutputWriter(workers=1, max_pending=2)
+        writer.write(tmp_path / "1.html", "1")
+        writer.write(tmp_path / "2.html", "2")
+
+        blocked = threading.Thread(
+            target=writer.write, args=(tmp_path / "3.html", "3")
+        )
+        blocked.start()
+        blocked.join(0.2)
+        assert blocked.is_alive()
+        assert writer.queue_depth == 2
+
+        release.set()
+        blocked.join(5)
+        writer.close()
+        assert writer.get_stats()["files_written"] == 3
+        assert writer.get_stats()["max_queue_depth"] == 2
+
+    def test_same_path_keeps_order(self, tmp_path):
+        """Повторная запись в тот же файл выполняется по порядку."""
+        path = tmp_path / "page.html"
+        with OutputWriter(workers=4) as writer:
+            for i in range(20):
+                writer.write(path, str(i))
+        assert path.read_text() == "19"
+
+    def test_errors_are_collected(self, tmp_path):
+        """Ошибки записи сохраняются, а не теряются."""
+        (tmp_path / "file").write_text("")
+        with OutputWriter() as writer:
+            writer._created_dirs.add(tmp_path / "file")
+            writer.write(tmp_path / "file" / "page.html", "x")
+        assert len(writer.errors) == 1
+        assert writer.get_stats()["errors"] == 1
+
+    def test_unchanged_files_are_skipped(self, tmp_path):
+        """С картой дайджестов неизмененные файлы не перезаписываются."""
+        digests = OutputDigests(tmp_path / "digests.json")
+        path = tmp_path / "page.html"
+        with OutputWriter(digests=digests) as writer:
+            writer.write(path, "a")
+        with OutputWriter(digests=digests) as writer:
+            writer.write(path, "a")
+        stats = writer.get_stats()
+        assert stats["files_written"] == 0
+        assert stats["files_skipped"] == 1
+
+    def test_create_writer(self):
+        """Значение write_workers 0 отключает фоновую запись."""
+        assert create_writer(0) is None
+        assert create_writer("bad") is None
+        writer = create_writer(None)
+        assert writer.workers == 4
+        writer.close()
@@ -1,3 +1,4 @@
+import os
 import pytest
 from pathlib import Path
 from staticflow.deploy.github_pages import GitHubPagesDeployer
@@ -5,8 +6,13 @@ from staticflow.core.config import Config
 
 
 @pytest.fixture
-def config(tmp_path):
-    """Создает временную конфигурацию для тестов."""
+def config(tmp_path, monkeypatch):
+    """Создает временную конфигурацию для тестов.
+
+    Деплоер хранит настройки в deploy/ текущего каталога, поэтому
+    тесты выполняются во временном каталоге.
+    """
+    monkeypatch.chdir(tmp_path)
     config = Config()
     config.set('source_dir', str(tmp_path / "source"))
     config.set('output_dir', str(tmp_path / "output"))
@@ -58,4 +64,36 @@ class TestGitHubPagesDeployer:
         is_valid, errors, warnings = deployer.validate_config()
         assert is_valid
         assert not errors
-        assert not warnings
\ No newline at end of file
+        assert not warnings
+
+    def test_sync_site_applies_delta(self, config, tmp_path):
+        """В репозиторий копируются только изменения сайта."""
+        site_path = tmp_path / "output"
+        for rel_path, text in (
+            ("index.html", "home"),
+            ("posts/first.html", "changed"),
+            ("admin/static/admin.js", "admin"),
+        ):
+            path = site_path / rel_path
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(text)
+        repo_path = tmp_path / "repo"
+        for rel_path, text in (
+            (".git/HEAD", "ref"),
+            ("index.html", "home"),
+            ("posts/first.html", "old"),
+            ("old/removed.html", "gone"),
+        ):
+            path = repo_path / rel_path
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(text)
+        unchanged = repo_path / "index.html"
+        os.utime(unchanged, ns=(1_000_000_000, 1_000_000_000))
+
+        deployer = GitHubPagesDeployer(str(site_path))
+        assert deployer._sync_site(site_path, repo_path) == (1, 1)
+        assert (repo_path / "posts" / "first.html").read_text() == "changed"
+        assert unchanged.stat().st_mtime_ns == 1_000_000_000
+        assert not (repo_path / "old").exists()
+        assert not (repo_path / "admin").exists()
+        assert (repo_path / ".git" / "HEAD").exists()
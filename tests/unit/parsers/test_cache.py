@@ -1,4 +1,5 @@
 import pytest
+import threading
 import time
 from staticflow.parsers.cache import ParserCache
 
@@ -75,3 +76,73 @@ class TestParserCache:
         assert stats["entries"] == 1
         assert stats["total_size"] > 0
         assert str(cache.cache_dir) in stats["cache_dir"]
+
+    def test_metadata_written_on_flush(self, cache):
+        """Метаданные записываются на диск только при flush."""
+        cache.flush_interval = None
+        cache.set("first", {}, "value")
+        cache.set("second", {}, "value")
+        assert ParserCache(str(cache.cache_dir)).metadata == {}
+        cache.flush()
+        assert len(ParserCache(str(cache.cache_dir)).metadata) == 2
+
+    def test_flush_merges_other_instances(self, cache):
+        """Flush объединяет записи нескольких экземпляров."""
+        other = ParserCache(str(cache.cache_dir))
+        cache.set("first", {}, "one")
+        other.set("second", {}, "two")
+        cache.flush()
+        other.flush()
+        restarted = ParserCache(str(cache.cache_dir))
+        assert restarted.get("first", {}) == "one"
+        assert restarted.get("second", {}) == "two"
+
+    def test_concurrent_flushes_keep_entries(self, cache):
+        """Одновременные flush разных экземпляров не теряют записей."""
+        caches = [ParserCache(str(cache.cache_dir)) for _ in range(8)]
+
+        def fill(index, instance):
+            for i in range(5):
+                instance.set(f"{index}-{i}", {}, "value")
+                instance.flush()
+
+        threads = [
+            threading.Thread(target=fill, args=(index, instance))
+            for index, instance in enumerate(caches)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(ParserCache(str(cache.cache_dir)).metadata) == 40
+
+    def test_entries_written_atomically(self, cache):
+        """После записи не остается временных файлов."""
+        cache.set("content", {}, "value")
+        assert len(list(cache.cache_dir.glob("*.pkl"))) == 1
+        assert not list(cache.cache_dir.glob("*.tmp"))
+
+    def test_lru_eviction(self, tmp_path):
+        """При превышении max_size удаляются давно неиспользуемые записи."""
+        cache = ParserCache(str(tmp_path / "cache"), max_size=2500)
+        cache.set("first", {}, "x" * 1000)
+        cache.set("second", {}, "x" * 1000)
+        assert cache.get("first", {}) is not None
+        cache.set("third", {}, "x" * 1000)
+        assert cache.get("second", {}) is None
+        assert cache.get("first", {}) is not None
+        assert cache.get_stats()["total_size"] <= 2500
+        assert len(list(cache.cache_dir.glob("*.pkl"))) == 2
+
+    def test_running_counters(self, cache):
+        """Статистика попаданий и промахов ведется без обхода каталога."""
+        cache.set("content", {}, "value")
+        cache.get("content", {})
+        cache.get("missing", {})
+        stats = cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["total_size"] == (
+            cache._get_cache_path(cache._get_cache_key("content", {}))
+            .stat().st_size
+        )
@@ -0,0 +1,219 @@
+import json
+import os
+import pytest
+from pathlib import Path
+from click.testing import CliRunner
+from staticflow.cli.benchmark import benchmark
+from staticflow.core.benchmark import (
+    RESULTS_VERSION,
+    SiteBenchmark,
+    SiteSpec,
+    compare_results,
+    generate_site,
+    load_results,
+    save_results,
+)
+
+# Размер сайта и сравнение с эталоном настраиваются через окружение:
+# STATICFLOW_BENCHMARK_PAGES=2000 STATICFLOW_BENCHMARK_BASELINE=base.json
+BENCHMARK_PAGES = int(os.environ.get("STATICFLOW_BENCHMARK_PAGES", "12"))
+BENCHMARK_REPEAT = int(os.environ.get("STATICFLOW_BENCHMARK_REPEAT", "1"))
+BENCHMARK_RESULTS = os.environ.get("STATICFLOW_BENCHMARK_RESULTS")
+BENCHMARK_BASELINE = os.environ.get("STATICFLOW_BENCHMARK_BASELINE")
+BENCHMARK_TOLERANCE = float(
+    os.environ.get("STATICFLOW_BENCHMARK_TOLERANCE", "0.2")
+)
+
+STAGES = ("markdown", "syntax_highlight", "minify", "seo", "sitemap",
+          "router")
+
+
+def make_results(spec=None, **metrics):
+    """Создает результаты замеров с заданными метриками."""
+    return {
+        "version": RESULTS_VERSION,
+        "spec": spec or {"pages": 10},
+        "metrics": metrics,
+    }
+
+
+@pytest.fixture(scope="module")
+def spec():
+    """Параметры синтетического сайта."""
+    return SiteSpec(
+        pages=BENCHMARK_PAGES,
+        code_blocks=2,
+        images=2,
+        languages=2,
+        category_depth=2
+    )
+
+
+@pytest.fixture(scope="module")
+def results(spec, tmp_path_factory):
+    """Результаты одного прогона бенчмарка на весь модуль."""
+    root = tmp_path_factory.mktemp("benchmark_site")
+    results = SiteBenchmark(root, spec, repeat=BENCHMARK_REPEAT).run()
+    if BENCHMARK_RESULTS:
+        save_results(results, Path(BENCHMARK_RESULTS))
+    return results
+
+
+class TestSiteGenerator:
+    """Тесты генератора синтетических сайтов."""
+
+    def test_generates_project(self, tmp_path):
+        """Генерируется проект со страницами, шаблоном и статикой."""
+        spec = SiteSpec(pages=6, images=3, languages=2, category_depth=3)
+        config_path = generate_site(tmp_path, spec)
+        assert config_path == tmp_path / "config.toml"
+        assert (tmp_path / "templates" / "page.html").exists()
+        pages = list((tmp_path / "content").rglob("*.md"))
+        assert len(pages) == 6
+        assert len(list((tmp_path / "content" / "ru").rglob("*.md"))) == 3
+        images = list((tmp_path / "static" / "images").glob("*.png"))
+        assert len(images) == 3
+        assert images[0].read_bytes().startswith(b"\x89PNG")
+        for page in pages:
+            depth = len(page.relative_to(tmp_path / "content").parts) - 1
+            assert depth <= 4
+
+    def test_code_blocks_and_images(self, tmp_path):
+        """Страница содержит заданное число блоков кода и изображений."""
+        generate_site(tmp_path, SiteSpec(pages=1, code_blocks=3, images=1,
+                                         category_depth=0))
+        text = (tmp_path / "content" / "page-0.md").read_text()
+        assert text.count("```") == 6
+        assert "/static/images/image-0.png" in text
+        assert "language: en" in text
+
+    def test_is_reproducible(self, tmp_path):
+        """Одинаковые параметры дают одинаковые файлы."""
+        spec = SiteSpec(pages=5, languages=2)
+        contents = []
+        for name in ("first", "second"):
+            generate_site(tmp_path / name, spec)
+            root = tmp_path / name / "content"
+            contents.append({
+                str(path.relative_to(root)): path.read_text()
+                for path in root.rglob("*.md")
+            })
+        assert contents[0] == contents[1]
+
+
+class TestBenchmark:
+    """Замеры производительности сборки."""
+
+    def test_full_build(self, results, spec):
+        """Сборка всех страниц измеряется в страницах в секунду."""
+        metrics = results["metrics"]
+        assert results["pages"] == spec.pages
+        assert metrics["build.pages_per_sec"] > 0
+        assert metrics["build.cold_seconds"] > 0
+        assert metrics["build.warm_seconds"] > 0
+        assert metrics["phase.render_seconds"] > 0
+
+    def test_stages(self, results):
+        """Каждый этап сборки замеряется отдельно."""
+        for stage in STAGES:
+            assert results["metrics"][f"stage.{stage}_seconds"] > 0
+
+    def test_records_environment(self, results, spec):
+        """В результатах сохраняются параметры сайта и окружение."""
+        assert results["spec"]["pages"] == spec.pages
+        assert results["python"]
+        assert results["staticflow"]
+        if os.name == "posix":
+            assert results["metrics"]["peak_rss_kb"] > 0
+
+    def test_against_baseline(self, results):
+        """Сборка не медленнее сохраненного эталона."""
+        if not BENCHMARK_BASELINE:
+            pytest.skip("STATICFLOW_BENCHMARK_BASELINE is not set")
+        baseline = load_results(Path(BENCHMARK_BASELINE))
+        regressions = compare_results(
+            results, baseline, BENCHMARK_TOLERANCE
+        )
+        assert regressions == []
+
+
+class TestResults:
+    """Тесты сохранения и сравнения результатов."""
+
+    def test_save_and_load(self, tmp_path):
+        """Результаты сохраняются в JSON и читаются обратно."""
+        results = make_results(**{"build.cold_seconds": 1.5})
+        path = tmp_path / "results" / "bench.json"
+        save_results(results, path)
+        assert json.loads(path.read_text())["metrics"] == {
+            "build.cold_seconds": 1.5
+        }
+        assert load_results(path) == results
+
+    def test_load_unknown_version(self, tmp_path):
+        """Результаты другой версии формата не читаются."""
+        path = tmp_path / "bench.json"
+        path.write_text(json.dumps({"version": 0}))
+        with pytest.raises(ValueError):
+            load_results(path)
+
+    def test_slower_timing_is_regression(self):
+        """Рост времени выше допуска считается регрессией."""
+        baseline = make_results(**{"stage.seo_seconds": 1.0})
+        current = make_results(**{"stage.seo_seconds": 1.5})
+        regression, = compare_results(current, baseline, 0.2)
+        assert regression["metric"] == "stage.seo_seconds"
+        assert regression["change"] == pytest.approx(0.5)
+
+    def test_lower_throughput_is_regression(self):
+        """Падение числа страниц в секунду считается регрессией."""
+        baseline = make_results(**{"build.pages_per_sec": 100.0})
+        current = make_results(**{"build.pages_per_sec": 50.0})
+        regression, = compare_results(current, baseline, 0.2)
+        assert regression["change"] == pytest.approx(0.5)
+        faster = make_results(**{"build.pages_per_sec": 200.0})
+        assert compare_results(faster, baseline, 0.2) == []
+
+    def test_within_tolerance(self):
+        """Колебания в пределах допуска не считаются регрессией."""
+        baseline = make_results(**{"build.cold_seconds": 1.0,
+                                   "peak_rss_kb": 1000})
+        current = make_results(**{"build.cold_seconds": 1.1,
+                                  "peak_rss_kb": 1100})
+        assert compare_results(current, baseline, 0.2) == []
+
+    def test_tiny_timings_are_ignored(self):
+        """Слишком короткие замеры не сравниваются."""
+        baseline = make_results(**{"stage.router_seconds": 0.001})
+        current = make_results(**{"stage.router_seconds": 0.005})
+        assert compare_results(current, baseline, 0.2) == []
+
+    def test_different_sites(self):
+        """Результаты разных сайтов несравнимы."""
+        with pytest.raises(ValueError):
+            compare_results(make_results({"pages": 10}),
+                            make_results({"pages": 20}))
+
+
+class TestBenchmarkCommand:
+    """Тесты команды benchmark."""
+
+    def test_writes_results_and_compares(self, tmp_path):
+        """Команда сохраняет результаты и сравнивает их с эталоном."""
+        runner = CliRunner()
+        output = tmp_path / "results.json"
+        args = ["--pages", "3", "--repeat", "1", "--site-dir",
+                str(tmp_path / "site"), "--output", str(output)]
+        result = runner.invoke(benchmark, args)
+        assert result.exit_code == 0, result.output
+        assert load_results(output)["pages"] == 3
+
+        baseline = load_results(output)
+        baseline["metrics"]["build.pages_per_sec"] *= 1000
+        baseline_path = tmp_path / "baseline.json"
+        save_results(baseline, baseline_path)
+        result = runner.invoke(
+            benchmark, args + ["--baseline", str(baseline_path)]
+        )
+        assert result.exit_code == 1
+        assert "build.pages_per_sec" in result.output
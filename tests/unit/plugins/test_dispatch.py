@@ -0,0 +1,112 @@
+import pytest
+from staticflow.core.engine import Engine
+from staticflow.plugins.base import Plugin as LegacyPlugin
+from staticflow.plugins.core.base import Plugin, PluginMetadata
+from staticflow.plugins.core.dispatch import (
+    DEFAULT_PRIORITY,
+    DispatchTable,
+    get_plugin_priority,
+)
+
+
+class PriorityPlugin(Plugin):
+    """Плагин на core.base с заданным приоритетом."""
+
+    def __init__(self, name, priority):
+        super().__init__()
+        self._name = name
+        self._priority = priority
+
+    @property
+    def metadata(self) -> PluginMetadata:
+        return PluginMetadata(
+            name=self._name,
+            version="1.0.0",
+            description="Priority plugin",
+            author="Test Author",
+            priority=self._priority
+        )
+
+    def process_content(self, content: str) -> str:
+        return f"{content}[{self._name}]"
+
+    def on_post_page(self, context):
+        context["order"] = context.get("order", []) + [self._name]
+        return context
+
+
+class LegacyTagPlugin(LegacyPlugin):
+    """Плагин на plugins.base без метаданных."""
+
+    def process_content(self, content: str) -> str:
+        return f"{content}[legacy]"
+
+    def pre_build(self, site):
+        self.site = site
+
+
+class TestDispatchTable:
+    """Тесты таблицы обработчиков хуков."""
+
+    def test_orders_by_priority(self):
+        """Обработчики идут по приоритету, затем в порядке добавления."""
+        plugins = [
+            PriorityPlugin("late", 200),
+            LegacyTagPlugin(),
+            PriorityPlugin("early", 10),
+            PriorityPlugin("default", DEFAULT_PRIORITY),
+        ]
+        table = DispatchTable(plugins)
+        names = [handler.name for handler in table.get("process_content")]
+        assert names == ["early", "LegacyTagPlugin", "default", "late"]
+
+    def test_collects_hooks_of_both_bases(self):
+        """Хуки собираются у плагинов обеих базовых систем."""
+        legacy = LegacyTagPlugin()
+        core = PriorityPlugin("core", 100)
+        table = DispatchTable([legacy, core])
+        assert [h.plugin for h in table.get("pre_build")] == [legacy]
+        assert [h.plugin for h in table.get("on_post_page")] == [core]
+        assert table.get("on_pre_asset") == []
+        assert table.get("unknown") == []
+
+    def test_skips_disabled_plugins(self):
+        """Отключенные плагины не вызываются."""
+        disabled = PriorityPlugin("disabled", 100)
+        disabled.enabled = False
+        table = DispatchTable([disabled, PriorityPlugin("enabled", 100)])
+        assert [h.name for h in table.get("process_content")] == ["enabled"]
+
+    def test_default_priority(self):
+        """Плагин без метаданных получает приоритет по умолчанию."""
+        assert get_plugin_priority(LegacyTagPlugin()) == DEFAULT_PRIORITY
+        assert get_plugin_priority(PriorityPlugin("p", 5)) == 5
+
+
+class TestEngineDispatch:
+    """Тесты вызова хуков движком через таблицу."""
+
+    @pytest.fixture
+    def engine(self, tmp_path):
+        """Фикстура для создания движка."""
+        config_file = tmp_path / "config.toml"
+        config_file.write_text(
+            'site_name = "Test Site"\nbase_url = "http://example.com"\n'
+        )
+        return Engine(config_file)
+
+    def test_run_hooks_in_priority_order(self, engine):
+        """Движок вызывает хуки в порядке приоритета."""
+        engine.add_plugin(PriorityPlugin("second", 100))
+        engine.add_plugin(PriorityPlugin("first", 10))
+        assert engine.run_hooks("process_content", "x") == "x[first][second]"
+        context = engine.run_hooks("on_post_page", {})
+        assert context["order"] == ["first", "second"]
+        assert engine.hook_stats.get("first", "process_content")["calls"] == 1
+
+    def test_add_plugin_rebuilds_table(self, engine):
+        """Добавленный плагин попадает в таблицу."""
+        engine.add_plugin(PriorityPlugin("first", 10))
+        assert engine.run_hooks("process_content", "") == "[first]"
+        engine.add_plugin(LegacyTagPlugin())
+        assert engine.run_hooks("process_content", "") == "[first][legacy]"
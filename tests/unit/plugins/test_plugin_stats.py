@@ -0,0 +1,63 @@
+import pytest
+from staticflow.plugins.core.stats import MAX_SAMPLES, HookStats
+
+
+class TestHookStats:
+    """Тесты для статистики хуков плагинов."""
+
+    def test_call_records_sizes(self):
+        """Записываются вызовы и объем данных на входе и выходе."""
+        stats = HookStats()
+        result = stats.call("minifier", "process_content",
+                            lambda html: html.replace(" ", ""), "<p> a </p>")
+        assert result == "<p>a</p>"
+        row = stats.get("minifier", "process_content")
+        assert row["calls"] == 1
+        assert row["bytes_in"] == 10
+        assert row["bytes_out"] == 8
+        assert stats.get("seo", "process_content") == {}
+
+    def test_errors_are_counted(self):
+        """Ошибка хука учитывается и пробрасывается дальше."""
+        stats = HookStats()
+
+        def broken(context):
+            raise ValueError("broken")
+
+        with pytest.raises(ValueError):
+            stats.call("seo", "on_post_page", broken, {"content": "x"})
+        row = stats.get("seo", "on_post_page")
+        assert row["errors"] == 1
+        assert row["bytes_in"] == 1
+
+    def test_summary_order_and_percentile(self):
+        """Сводка отсортирована по общему времени, p95 по выборке."""
+        stats = HookStats()
+        for i in range(100):
+            stats.record("media", "process_content", i / 1000)
+        stats.record("seo", "process_content", 1.0)
+        rows = stats.summary()
+        assert [row["plugin"] for row in rows] == ["media", "seo"]
+        assert rows[0]["p95_ms"] == pytest.approx(95.0)
+        assert rows[0]["avg_ms"] == pytest.approx(49.5)
+
+    def test_samples_are_bounded(self):
+        """Число хранимых замеров ограничено."""
+        stats = HookStats()
+        for _ in range(MAX_SAMPLES * 2):
+            stats.record("media", "process_content", 0.001)
+        timing = stats.snapshot()[("media", "process_content")]
+        assert len(timing.samples) == MAX_SAMPLES
+        assert timing.calls == MAX_SAMPLES * 2
+
+    def test_merge(self):
+        """Статистика рабочих процессов объединяется."""
+        stats = HookStats()
+        worker = HookStats()
+        stats.record("seo", "process_content", 0.002, 10, 20)
+        worker.record("seo", "process_content", 0.004, 5, 5)
+        stats.merge(worker.snapshot())
+        row = stats.get("seo", "process_content")
+        assert row["calls"] == 2
+        assert row["bytes_in"] == 15
+        assert row["max_ms"] == pytest.approx(4.0)
@@ -174,4 +174,18 @@ def test_plugin_manager_cleanup(plugin_manager, test_plugin):
     plugin_manager.cleanup()
     assert len(plugin_manager.plugins) == 0
     assert len(plugin_manager.plugin_configs) == 0
-    assert len(plugin_manager._load_order) == 0 
\ No newline at end of file
+    assert len(plugin_manager._load_order) == 0 
+
+def test_plugin_manager_hook_stats(plugin_manager, hook_plugin):
+    """Тест статистики вызовов хуков."""
+    plugin_manager.load_plugin(hook_plugin.__class__)
+    for _ in range(3):
+        plugin_manager.execute_hook(
+            HookType.PRE_TEMPLATE, {"content": "<p>ё</p>"}
+        )
+    stats, = plugin_manager.get_hook_stats()
+    assert stats["plugin"] == "hook_plugin"
+    assert stats["hook"] == "pre_template"
+    assert stats["calls"] == 3
+    assert stats["bytes_in"] == 3 * len("<p>ё</p>".encode("utf-8"))
+    assert stats["p95_ms"] <= stats["max_ms"]
@@ -0,0 +1,43 @@
+import xml.etree.ElementTree as ET
+from staticflow.core.config import Config
+from staticflow.core.content_index import ContentIndex
+from staticflow.core.site import Site
+from staticflow.plugins.builtin.rss import RSSPlugin
+
+
+class TestRSSPlugin:
+    """Тесты для RSS-ленты."""
+
+    def test_feed_skips_pages_not_loaded(self, tmp_path):
+        """Записи незагруженных страниц не уменьшают ленту."""
+        content = tmp_path / "content"
+        content.mkdir()
+        for day in range(1, 13):
+            (content / f"post{day}.md").write_text(
+                f"---\ntitle: Post {day}\ndate: 2024-05-{day:02d}\n---\n"
+            )
+        site = Site(Config())
+        site.set_directories(
+            content, tmp_path / "output", tmp_path / "templates"
+        )
+        site.load_pages()
+        index = ContentIndex(tmp_path / "content_index.db")
+        index.update(site)
+        site.content_index = index
+        del site.pages["post12.md"]
+        del site.pages["post11.md"]
+
+        plugin = RSSPlugin()
+        plugin.config = {
+            "site_name": "Site",
+            "site_description": "Posts",
+            "base_url": "https://example.com",
+            "output_path": str(tmp_path / "output"),
+            "language": "en",
+        }
+        plugin.post_build(site)
+        index.close()
+
+        feed = ET.parse(tmp_path / "output" / "feed.xml")
+        titles = [item.text for item in feed.iter("title")][1:]
+        assert titles == [f"Post {day}" for day in range(10, 0, -1)]
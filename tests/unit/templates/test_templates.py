@@ -87,4 +87,48 @@ class TestTemplateLoader:
     def test_load_default_template(self):
         """Тест загрузки шаблона по умолчанию."""
         with pytest.raises(FileNotFoundError):
-            load_default_template("missing.html") 
\ No newline at end of file
+            load_default_template("missing.html") 
+
+
+class TestSiteTemplateEngine:
+    """Тесты общего окружения шаблонов сайта."""
+
+    @pytest.fixture
+    def site(self, template_dir, tmp_path):
+        """Фикстура сайта с общим окружением шаблонов."""
+        from staticflow.core.config import Config
+        from staticflow.core.site import Site
+        config = Config()
+        config.set("cache_dir", str(tmp_path / ".cache"))
+        site = Site(config)
+        site.set_directories(tmp_path / "content", tmp_path / "output",
+                             template_dir)
+        return site
+
+    def test_environment_is_shared(self, site):
+        """Шаблон компилируется один раз и переиспользуется."""
+        first = site.get_template("page.html")
+        second = site.get_template("page.html")
+        assert first is second
+        assert site.get_template("missing.html") is None
+
+    def test_bytecode_cache_on_disk(self, site, tmp_path):
+        """Байткод шаблонов сохраняется на диск."""
+        site.get_template("page.html")
+        cache_dir = tmp_path / ".cache" / "templates"
+        assert any(cache_dir.iterdir())
+
+    def test_output_is_not_autoescaped(self, site):
+        """Вывод шаблонов сайта не экранируется."""
+        result = site.get_template("page.html").render(
+            title="T", content="<b>bold</b>"
+        )
+        assert "<b>bold</b>" in result
+
+    def test_engine_reset_on_template_dir_change(self, site, tmp_path):
+        """Смена директории шаблонов создает новое окружение."""
+        engine = site.get_template_engine()
+        other = tmp_path / "other"
+        other.mkdir()
+        site.set_directories(site.source_dir, site.output_dir, other)
+        assert site.get_template_engine() is not engine
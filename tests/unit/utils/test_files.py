@@ -0,0 +1,123 @@
+import os
+import threading
+from staticflow.core.output_digests import OutputDigests
+from staticflow.utils.files import (
+    break_link, get_link_mode, lock_file, materialize, sync_tree
+)
+
+
+class TestMaterialize:
+    """Тесты для копирования файлов ссылками."""
+
+    def test_hardlink(self, tmp_path):
+        """В режиме hardlink файл становится жесткой ссылкой."""
+        source = tmp_path / "logo.png"
+        source.write_bytes(b"png")
+        target = tmp_path / "out.png"
+        target.write_bytes(b"old")
+        assert materialize(source, target, "hardlink") == "hardlink"
+        assert os.path.samefile(source, target)
+
+    def test_reflink_falls_back_to_copy(self, tmp_path):
+        """Без поддержки reflink файл копируется."""
+        source = tmp_path / "app.js"
+        source.write_text("var a;")
+        target = tmp_path / "out.js"
+        assert materialize(source, target, "reflink") in ("reflink", "copy")
+        assert target.read_text() == "var a;"
+        assert target.stat().st_mtime_ns == source.stat().st_mtime_ns
+
+    def test_break_link_protects_source(self, tmp_path):
+        """Запись в выходной файл не меняет исходник."""
+        source = tmp_path / "style.css"
+        source.write_text("body {}")
+        target = tmp_path / "out.css"
+        materialize(source, target, "hardlink")
+        break_link(target)
+        target.write_text("p {}")
+        assert source.read_text() == "body {}"
+
+    def test_digests_write_into_link(self, tmp_path):
+        """Карта дайджестов не пишет в исходник через ссылку."""
+        digests = OutputDigests(tmp_path / "digests.json")
+        source = tmp_path / "style.css"
+        source.write_text("body {}")
+        target = tmp_path / "out" / "style.css"
+        assert digests.copy_file(source, target, "hardlink")
+        assert os.path.samefile(source, target)
+        assert not digests.copy_file(source, target, "hardlink")
+        digests.write_text(target, "p {}")
+        assert source.read_text() == "body {}"
+
+    def test_get_link_mode(self):
+        """Неизвестный режим заменяется копированием."""
+        assert get_link_mode("HardLink") == "hardlink"
+        assert get_link_mode(None) == "copy"
+        assert get_link_mode("symlink") == "copy"
+
+
+class TestSyncTree:
+    """Тесты для синхронизации каталогов."""
+
+    def test_sync_tree(self, tmp_path):
+        """Копируются только новые и измененные файлы."""
+        source = tmp_path / "src"
+        (source / "css").mkdir(parents=True)
+        (source / "css" / "admin.css").write_text("a {}")
+        (source / "admin.js").write_text("var a;")
+        target = tmp_path / "dst"
+
+        assert sync_tree(source, target) == (2, 0)
+        assert (target / "css" / "admin.css").read_text() == "a {}"
+        assert sync_tree(source, target) == (0, 0)
+
+        (source / "admin.js").unlink()
+        (source / "css" / "admin.css").write_text("b {}")
+        assert sync_tree(source, target) == (1, 1)
+        assert not (target / "admin.js").exists()
+        assert (target / "css" / "admin.css").read_text() == "b {}"
+
+    def test_sync_tree_hardlinks(self, tmp_path):
+        """В режиме hardlink файлы связываются с исходными."""
+        source = tmp_path / "src"
+        source.mkdir()
+        (source / "admin.js").write_text("var a;")
+        target = tmp_path / "dst"
+        sync_tree(source, target, "hardlink")
+        assert os.path.samefile(source / "admin.js", target / "admin.js")
+
+
+class TestLockFile:
+    """Тесты для блокировки общих файлов."""
+
+    def test_lock_excludes_other_handles(self, tmp_path):
+        """Второй владелец ждет, пока первый не снимет блокировку."""
+        path = tmp_path / "cache" / "digests.json"
+        events = []
+
+        def worker():
+            with lock_file(path):
+                events.append("worker")
+
+        with lock_file(path):
+            thread = threading.Thread(target=worker)
+            thread.start()
+            thread.join(0.2)
+            events.append("main")
+        thread.join()
+        assert events == ["main", "worker"]
+        assert (tmp_path / "cache" / "digests.json.lock").exists()
+
+    def test_digests_merge_saves(self, tmp_path):
+        """Сохранения двух экземпляров не теряют записи друг друга."""
+        path = tmp_path / "digests.json"
+        first, second = OutputDigests(path), OutputDigests(path)
+        first.write_text(tmp_path / "a.html", "a")
+        second.write_text(tmp_path / "b.html", "b")
+        first.save()
+        second.save()
+        merged = OutputDigests(path)
+        merged.load()
+        assert sorted(merged.entries) == [
+            str(tmp_path / "a.html"), str(tmp_path / "b.html")
+        ]